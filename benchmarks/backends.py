@@ -0,0 +1,69 @@
+"""
+Compares the solver backends on random diet, production planning and knapsack instances.
+
+Run from the repository root:
+    python -m benchmarks.backends --sizes 4 16 64 256 --repeat 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+import solver_backends
+
+
+def make_instance(problem, n, rng):
+    """Returns the positional arguments of a random instance with n variables."""
+    if problem == "diet":
+        return (2000, 60, 30, rng.integers(50, 400, n).tolist(), rng.integers(0, 30, n).tolist(),
+                rng.integers(0, 20, n).tolist(), rng.uniform(1, 5, n).round(2).tolist())
+    if problem == "production_planning":
+        products = [{'name': f"P{i}", 'labor': int(rng.integers(1, 10)), 'materials': int(rng.integers(1, 10)),
+                     'profit': int(rng.integers(1, 20)), 'min_production': int(rng.integers(0, 2))} for i in range(n)]
+        return (10 * n, 10 * n, products)
+    values = rng.integers(10, 100, n)
+    weights = values + rng.integers(-5, 6, n)
+    return (float(weights.sum() // 2), values.tolist(), weights.tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64, 256])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=solver_backends.available_backends() + ["auto"])
+    args = parser.parse_args()
+    if "gurobi" in args.backends:
+        import gurobipy
+
+        gurobipy.setParam("OutputFlag", 0)
+
+    print(f"{'problem':<22}{'n':>6}" + "".join(f"{name + ' ms':>12}" for name in args.backends))
+    for problem in solver_backends.PROBLEMS:
+        for n in args.sizes:
+            rng = np.random.default_rng(n)
+            instances = [make_instance(problem, n, rng) for _ in range(args.repeat)]
+            row = f"{problem:<22}{n:>6}"
+            objectives = {}
+            for name in args.backends:
+                # Load the backend (and its imports) outside the measurement
+                if name != "auto":
+                    solver_backends.get_backend(name)
+                start = time.perf_counter()
+                results = [solver_backends.solve(problem, *instance, backend=name) for instance in instances]
+                row += f"{1000 * (time.perf_counter() - start) / len(instances):>12.3f}"
+                objectives[name] = [_objective(problem, r) for r in results]
+            print(row)
+            reference = next(iter(objectives.values()))
+            for name, values in objectives.items():
+                if not np.allclose(values, reference, rtol=1e-6):
+                    print(f"  warning: {name} objectives differ from {args.backends[0]}")
+
+
+def _objective(problem, result):
+    if problem == "production_planning":
+        return np.nan if result is None else result['total_profit']
+    return result[1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Seeded instance generators for the three problem families.
+
+Every generator returns the keyword arguments of the matching optimization_solver
+function, and the same (size, seed) always gives the same instance. Sizes from 10 to
+10^6 are supported; arrays are returned as NumPy arrays so large instances stay cheap
+to build.
+"""
+import numpy as np
+
+# Range of the knapsack weights (R in the classic Martello-Pisinger-Toth families).
+KNAPSACK_RANGE = 1000
+
+
+def knapsack_uncorrelated(n, seed=0):
+    """Values and weights drawn independently from [1, R]."""
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, KNAPSACK_RANGE + 1, n)
+    values = rng.integers(1, KNAPSACK_RANGE + 1, n)
+    return {'capacity': float(weights.sum() // 2), 'values': values, 'weights': weights}
+
+
+def knapsack_strongly_correlated(n, seed=0):
+    """Weights drawn from [1, R] and values = weights + R / 10 (hard for bound-based searches)."""
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, KNAPSACK_RANGE + 1, n)
+    return {'capacity': float(weights.sum() // 2), 'values': weights + KNAPSACK_RANGE // 10, 'weights': weights}
+
+
+def knapsack_subset_sum(n, seed=0):
+    """Values equal to the weights: the best packing is the one closest to the capacity."""
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, KNAPSACK_RANGE + 1, n)
+    return {'capacity': float(weights.sum() // 2), 'values': weights.copy(), 'weights': weights}
+
+
+def diet(n, seed=0):
+    """Random nutrient table of n foods, with requirements met by a handful of them."""
+    rng = np.random.default_rng(seed)
+    return {
+        'calories_needed': 2000, 'protein_needed': 60, 'fat_needed': 30,
+        'food_calories': rng.integers(50, 400, n),
+        'food_protein': rng.integers(0, 30, n),
+        'food_fat': rng.integers(0, 20, n),
+        'food_cost': rng.uniform(1, 5, n).round(2),
+    }
+
+
+def production_planning(n, seed=0, tightness=0.5):
+    """
+    n products whose resources allow a fraction tightness of producing one unit of each.
+
+    About 1% of the products must be produced at least once, which always fits.
+    """
+    rng = np.random.default_rng(seed)
+    labor = rng.integers(1, 10, n)
+    materials = rng.integers(1, 10, n)
+    profit = rng.integers(1, 20, n)
+    min_production = (rng.random(n) < 0.01).astype(int)
+    products = [
+        {'name': f"P{i}", 'labor': int(l), 'materials': int(mt), 'profit': int(p), 'min_production': int(mp)}
+        for i, (l, mt, p, mp) in enumerate(zip(labor, materials, profit, min_production))
+    ]
+    return {
+        'labor_avail': float(max(tightness * labor.sum(), labor @ min_production)),
+        'materials_avail': float(max(tightness * materials.sum(), materials @ min_production)),
+        'products': products,
+    }
+
+
+def production_planning_tight(n, seed=0):
+    """Resources for 5% of one unit of every product: most products are left out."""
+    return production_planning(n, seed, tightness=0.05)
+
+
+def production_planning_loose(n, seed=0):
+    """Resources for several units of every product."""
+    return production_planning(n, seed, tightness=5.0)
+
+
+# family name -> (problem, generator)
+FAMILIES = {
+    "knapsack_uncorrelated": ("knapsack", knapsack_uncorrelated),
+    "knapsack_strongly_correlated": ("knapsack", knapsack_strongly_correlated),
+    "knapsack_subset_sum": ("knapsack", knapsack_subset_sum),
+    "diet": ("diet", diet),
+    "production_planning_tight": ("production_planning", production_planning_tight),
+    "production_planning_loose": ("production_planning", production_planning_loose),
+}
+
+
+def generate(family, n, seed=0):
+    """Returns (problem, kwargs) for an instance of the named family."""
+    problem, generator = FAMILIES[family]
+    return problem, generator(n, seed)
@@ -0,0 +1,105 @@
+"""
+Measures the cold start of the GUI and the time to render a large result.
+
+Cold start is timed in fresh processes: importing ihm and showing the window, next to
+importing the solver module the window used to load at startup. Rendering compares
+filling the results table (a ResultTableModel in a QTableView) with --rows rows against
+building the former one-line-per-row text and setting it in a QTextEdit; both include
+painting the first screen and scrolling to the last row.
+
+Run from the repository root (QT_QPA_PLATFORM=offscreen works without a display):
+    python -m benchmarks.gui --rows 100000
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+COLD_START = """
+import sys, time
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+import ihm
+app = QApplication(sys.argv)
+window = ihm.OptimizationApp()
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+"""
+
+SOLVER_IMPORT = """
+import time
+start = time.perf_counter()
+import optimization_solver
+print(time.perf_counter() - start)
+"""
+
+
+def fresh_process_time(code, repeats):
+    """Returns the median time printed by code over repeats fresh interpreters."""
+    samples = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.split()[-1]))
+    return statistics.median(samples)
+
+
+def render_times(rows):
+    """Returns the table and text rendering times (in seconds) of a knapsack result with rows items."""
+    from PyQt5.QtWidgets import QApplication, QTableView, QTextEdit
+
+    from result_table import ResultTableModel
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    selected = np.arange(rows)
+    values = np.random.default_rng(0).uniform(1, 1000, rows)
+
+    model = ResultTableModel()
+    view = QTableView()
+    view.setModel(model)
+    view.verticalHeader().hide()
+    view.resize(800, 400)
+    view.show()
+    app.processEvents()
+    start = time.perf_counter()
+    model.set_columns([("Item", selected + 1, "Item {}"), ("Value", values, "{:.2f}")])
+    app.processEvents()
+    view.scrollToBottom()
+    app.processEvents()
+    table = time.perf_counter() - start
+
+    text = QTextEdit()
+    text.setReadOnly(True)
+    text.resize(800, 400)
+    text.show()
+    app.processEvents()
+    start = time.perf_counter()
+    message = "Selected Items:\n" + "\n".join(f"Item {i + 1}: {v:.2f}" for i, v in zip(selected.tolist(), values))
+    text.setText(message)
+    app.processEvents()
+    scrollbar = text.verticalScrollBar()
+    scrollbar.setValue(scrollbar.maximum())
+    app.processEvents()
+    return table, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    window = fresh_process_time(COLD_START, args.repeats)
+    solver = fresh_process_time(SOLVER_IMPORT, args.repeats)
+    print(f"cold start: window {1000 * window:.0f} ms; importing the solver at startup would add {1000 * solver:.0f} ms")
+    table, text = render_times(args.rows)
+    print(f"render {args.rows} rows: table {1000 * table:.0f} ms, text {1000 * text:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measures the per-update latency of KnapsackSession against re-solving from scratch.
+
+A stream of random updates (item additions, removals, value/weight changes and
+capacity changes) is applied to a knapsack; after every update the session re-solves
+incrementally and, for comparison, solve_knapsack solves the full instance again with
+the same engine.
+
+Run from the repository root:
+    python -m benchmarks.knapsack_session --items 200 1000 --updates 200
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from benchmarks.generators import knapsack_uncorrelated
+from knapsack_session import KnapsackSession
+from optimization_solver import solve_knapsack
+
+
+# Items are scaled down to weights in [1, 100] so the DP table of 1000 items fits its cell budget.
+WEIGHT_DIVISOR = 10
+
+
+def make_updates(count, seed=0):
+    """Returns a list of (operation, value, weight, capacity factor, random draw) tuples."""
+    rng = random.Random(seed)
+    return [(rng.choice(("add", "remove", "update", "capacity")), rng.randint(1, 1000), rng.randint(1, 100),
+             rng.uniform(0.4, 0.6), rng.random()) for _ in range(count)]
+
+
+def run(n, updates, engine):
+    """Returns the median incremental and full re-solve latencies (in seconds)."""
+    instance = knapsack_uncorrelated(n)
+    weights = -(-instance['weights'] // WEIGHT_DIVISOR)
+    items = dict(enumerate(zip(instance['values'].tolist(), weights.tolist())))
+    capacity = float(weights.sum() // 2)
+    incremental, full = [], []
+    with KnapsackSession(capacity, instance['values'], weights, engine=engine) as session:
+        session.solve()
+        for operation, value, weight, factor, draw in updates:
+            start = time.perf_counter()
+            if operation == "add":
+                items[session.add_item(value, weight)] = (value, weight)
+            elif operation == "remove" and items:
+                item_id = list(items)[int(draw * len(items))]
+                session.remove_item(item_id)
+                del items[item_id]
+            elif operation == "update" and items:
+                item_id = list(items)[int(draw * len(items))]
+                session.update_item(item_id, value, weight)
+                items[item_id] = (value, weight)
+            elif operation == "capacity":
+                capacity = float(int(factor * sum(w for _, w in items.values())))
+                session.set_capacity(capacity)
+            _, session_value, _ = session.solve()
+            incremental.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            values, weights = zip(*items.values()) if items else ((), ())
+            _, full_value, _ = solve_knapsack(capacity, list(values), list(weights), engine=engine)
+            full.append(time.perf_counter() - start)
+            if not np.isclose(session_value, full_value, rtol=1e-4):
+                print(f"  warning: session value {session_value} differs from full solve {full_value}")
+    return statistics.median(incremental), statistics.median(full)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--engines", nargs="+", default=["dp", "gurobi"])
+    args = parser.parse_args()
+    if "gurobi" in args.engines:
+        import gurobipy
+
+        gurobipy.setParam("OutputFlag", 0)
+
+    updates = make_updates(args.updates)
+    print(f"{'engine':<8}{'items':>7}{'session ms':>12}{'rebuild ms':>12}{'speedup':>9}")
+    for engine in args.engines:
+        for n in args.items:
+            try:
+                incremental, full = run(n, updates, engine)
+            except ValueError as e:
+                print(f"{engine:<8}{n:>7}  skipped: {e}")
+                continue
+            print(f"{engine:<8}{n:>7}{1000 * incremental:>12.3f}{1000 * full:>12.3f}{full / incremental:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compares model build time of the legacy generator-sum builders and the matrix builders.
+
+Run from the repository root:
+    python -m benchmarks.model_build --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from gurobipy import GRB, Model
+
+from optimization_solver import _quiet_env, build_diet_model, build_knapsack_model
+
+
+def legacy_knapsack(env, capacity, values, weights):
+    """The knapsack build as it was written before the matrix builders."""
+    m = Model("knapsack", env=env)
+    item_count = len(values)
+    x = m.addVars(item_count, vtype=GRB.BINARY, name="x")
+    m.setObjective(sum(values[i] * x[i] for i in range(item_count)), GRB.MAXIMIZE)
+    m.addConstr(sum(weights[i] * x[i] for i in range(item_count)) <= capacity, "Capacity")
+    return m
+
+
+def legacy_diet(env, food_calories, food_protein, food_fat, food_cost):
+    """The diet build as it was written before the matrix builders."""
+    m = Model("diet", env=env)
+    food_count = len(food_calories)
+    x = m.addVars(food_count, lb=0, vtype=GRB.INTEGER, name="x")
+    m.setObjective(sum(food_cost[i] * x[i] for i in range(food_count)), GRB.MINIMIZE)
+    m.addConstr(sum(food_calories[i] * x[i] for i in range(food_count)) >= 2000, "Calories")
+    m.addConstr(sum(food_protein[i] * x[i] for i in range(food_count)) >= 60, "Protein")
+    m.addConstr(sum(food_fat[i] * x[i] for i in range(food_count)) >= 30, "Fat")
+    return m
+
+
+def timed(build):
+    """Runs a builder, flushes the model and returns the elapsed time in seconds."""
+    start = time.perf_counter()
+    m = build()
+    m.update()
+    elapsed = time.perf_counter() - start
+    m.dispose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="largest size run through the slow legacy builders")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with _quiet_env() as env:
+        print(f"{'problem':<10}{'items':>10}{'legacy s':>12}{'matrix s':>12}{'sparse s':>12}{'speedup':>10}")
+        for n in args.sizes:
+            values, weights = rng.integers(1, 100, n).astype(float), rng.integers(1, 100, n).astype(float)
+            nutrients = rng.integers(0, 400, (3, n)).astype(float)
+            nutrients[nutrients < 200] = 0.0
+            cost = rng.uniform(1, 5, n)
+            cases = [
+                ("knapsack",
+                 lambda: legacy_knapsack(env, weights.sum() / 2, values.tolist(), weights.tolist()),
+                 lambda: build_knapsack_model(weights.sum() / 2, values, weights, env)[0],
+                 lambda: build_knapsack_model(weights.sum() / 2, values, sp.csr_matrix(weights), env)[0]),
+                ("diet",
+                 lambda: legacy_diet(env, *nutrients.tolist(), cost.tolist()),
+                 lambda: build_diet_model([2000, 60, 30], nutrients, cost, env)[0],
+                 lambda: build_diet_model([2000, 60, 30], sp.csr_matrix(nutrients), cost, env)[0]),
+            ]
+            for name, legacy, matrix, sparse in cases:
+                legacy_time = timed(legacy) if n <= args.legacy_max else float("nan")
+                matrix_time, sparse_time = timed(matrix), timed(sparse)
+                print(f"{name:<10}{n:>10}{legacy_time:>12.3f}{matrix_time:>12.3f}{sparse_time:>12.3f}"
+                      f"{legacy_time / matrix_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
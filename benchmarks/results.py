@@ -0,0 +1,94 @@
+"""
+Measures the memory and extraction time of compact SolveResults against the legacy formats.
+
+For each problem a solution of --vars variables is held either as a SolveResult (one
+float64 array) or in the legacy format (a list of floats, the "prod_<name>" dictionary or
+the selected indices). The extraction time covers building the result from the solver's
+bulk values; the memory is the peak traced by tracemalloc while building and keeping it.
+With --gurobi-vars, the knapsack is also solved end to end with Gurobi both ways (the
+restricted license limits models to 2000 variables).
+
+Run from the repository root:
+    python -m benchmarks.results --vars 1000000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from solve_result import SolveResult
+
+
+def measure(build):
+    """Returns (seconds, peak bytes) of calling build and keeping its result."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def synthetic(n, seed=0):
+    """Returns the builders of the compact and legacy results of each problem for n variables."""
+    rng = np.random.default_rng(seed)
+    levels = rng.integers(0, 100, n).astype(float)
+    choices = (rng.random(n) < 0.5).astype(float)
+    labels = [str(i) for i in range(n)]
+    # The compact builders copy the values, as the solver's bulk query returns a fresh array
+    return {
+        "diet": (lambda: SolveResult("diet", levels.copy(), 1.0), lambda: (levels.tolist(), 1.0)),
+        "production_planning": (
+            lambda: SolveResult("production_planning", levels.copy(), 1.0, labels=labels),
+            lambda: {'production_levels': dict(zip([f"prod_{label}" for label in labels], levels.tolist())),
+                     'total_profit': 1.0},
+        ),
+        "knapsack": (lambda: SolveResult("knapsack", choices.copy(), 1.0, runtime=0.0),
+                     lambda: (np.flatnonzero(choices > 0.5).tolist(), 1.0, 0.0)),
+    }
+
+
+def gurobi_knapsack(n, repeats=5):
+    """Returns the median end-to-end times of the compact and legacy Gurobi knapsack solves."""
+    from benchmarks.generators import knapsack_uncorrelated
+    from optimization_solver import solve_knapsack
+
+    instance = knapsack_uncorrelated(n)
+    timings = {}
+    for compact in (True, False):
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            solve_knapsack(**instance, engine="gurobi", compact=compact)
+            samples.append(time.perf_counter() - start)
+        timings[compact] = float(np.median(samples))
+    return timings[True], timings[False]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vars", type=int, default=1_000_000)
+    parser.add_argument("--gurobi-vars", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'problem':<22}{'compact ms':>12}{'legacy ms':>12}{'compact MB':>12}{'legacy MB':>12}")
+    for problem, (compact, legacy) in synthetic(args.vars).items():
+        compact_s, compact_bytes = measure(compact)
+        legacy_s, legacy_bytes = measure(legacy)
+        print(f"{problem:<22}{1000 * compact_s:>12.2f}{1000 * legacy_s:>12.2f}"
+              f"{compact_bytes / 2**20:>12.1f}{legacy_bytes / 2**20:>12.1f}")
+
+    if args.gurobi_vars:
+        import gurobipy
+
+        gurobipy.setParam("OutputFlag", 0)
+        compact_s, legacy_s = gurobi_knapsack(args.gurobi_vars)
+        print(f"gurobi knapsack, {args.gurobi_vars} items: compact {1000 * compact_s:.2f} ms, "
+              f"legacy {1000 * legacy_s:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measures SolverPool throughput on a mixed batch of knapsack and diet instances.
+
+Run from the repository root:
+    python -m benchmarks.solver_pool --instances 400 --processes 1 2 4 8
+"""
+import argparse
+import os
+import random
+import time
+
+from solver_pool import SolverPool
+
+
+def make_instances(count, seed=0):
+    """Returns (problem, args) pairs, alternating Gurobi-sized knapsack and diet instances."""
+    rng = random.Random(seed)
+    instances = []
+    for k in range(count):
+        if k % 2 == 0:
+            n = 60
+            values = [rng.randint(10, 100) for _ in range(n)]
+            # Real-valued weights in a wide range keep the knapsack away from the DP engine
+            weights = [v + rng.uniform(-5, 5) for v in values]
+            instances.append(("knapsack", (sum(weights) / 2, values, weights, "gurobi")))
+        else:
+            n = 40
+            instances.append(("diet", (
+                2000, 60, 30,
+                [rng.randint(50, 400) for _ in range(n)],
+                [rng.randint(0, 30) for _ in range(n)],
+                [rng.randint(0, 20) for _ in range(n)],
+                [round(rng.uniform(1, 5), 2) for _ in range(n)],
+            )))
+    return instances
+
+
+def run(instances, processes):
+    """Solves every instance through a pool and returns the throughput in instances/second."""
+    with SolverPool(processes=processes) as pool:
+        # Warm the workers up so environment startup is not part of the measurement
+        list(pool.as_completed([pool.submit(*instances[k % len(instances)]) for k in range(processes)]))
+        start = time.perf_counter()
+        futures = [pool.submit(problem, *args) for problem, args in instances]
+        for future in pool.as_completed(futures):
+            future.result()
+        return len(instances) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--instances", type=int, default=400)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    instances = make_instances(args.instances)
+    baseline = None
+    for processes in args.processes:
+        throughput = run(instances, processes)
+        baseline = baseline or throughput
+        print(f"{processes:>3} processes: {throughput:8.1f} instances/s  (speedup {throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
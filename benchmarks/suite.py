@@ -0,0 +1,200 @@
+"""
+Reproducible benchmark suite: every instance family x size x backend, against a baseline.
+
+Run from the repository root:
+    python -m benchmarks.suite                                   # compare with benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 10 1000 100000 1000000 --modes auto gurobi dp
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+
+Each measurement runs in its own process, so a slow case can be cut off by the timeout
+and the memory peak of one case does not leak into the next. Build and solve times come
+from the solver's SolveStats (parse + build, optimize + extract); the memory peak is the
+growth of the process's maximum resident set during the solve. Times are the median of
+--repeat runs. Timings only compare on the same machine: regenerate the baseline with
+--save-baseline before using it elsewhere.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+
+from benchmarks.generators import FAMILIES, generate
+from knapsack_engine import DP_CELL_LIMIT, dp_cells
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Modes: the solver_backends names, "auto", and the knapsack engines of optimization_solver.
+KNAPSACK_ENGINES = ("dp", "bnb")
+
+# Largest size each (mode, problem) is run at; the native dense simplex branch-and-bound
+# does not scale to tight instances with thousands of variables.
+MAX_SIZE = {
+    ("native", "diet"): 100,
+    ("native", "production_planning"): 100,
+}
+
+
+def _solver(problem, mode):
+    """Returns the solve function of a mode (called with the instance's kwargs)."""
+    if mode in KNAPSACK_ENGINES:
+        import optimization_solver
+
+        return lambda **kwargs: optimization_solver.solve_knapsack(engine=mode, **kwargs)
+    import solver_backends
+
+    if mode == "auto":
+        return lambda **kwargs: solver_backends.solve(problem, **kwargs)
+    return solver_backends.get_backend(mode)[problem]
+
+
+def _objective(problem, result):
+    if problem == "production_planning":
+        return None if result is None else result['total_profit']
+    return float(result[1])
+
+
+def _measure(family, n, mode, repeat, seed, conn):
+    """Child process: generates the instance and solves it repeat times."""
+    # Keep solver banners out of the report; the record goes back through conn
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        problem, kwargs = generate(family, n, seed)
+        if mode == "dp" and dp_cells(kwargs['capacity'], n, 1) > DP_CELL_LIMIT:
+            conn.send({'status': "skipped"})  # The table would not fit in memory
+            return
+        solve = _solver(problem, mode)
+        if mode in ("gurobi", "auto", *KNAPSACK_ENGINES):
+            try:
+                import gurobipy
+
+                gurobipy.setParam("OutputFlag", 0)
+            except ImportError:
+                pass
+        build, solve_time, total = [], [], []
+        peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result, stats = solve(return_stats=True, **kwargs)
+            total.append(time.perf_counter() - start)
+            build.append(stats.times.get("parse", 0.0) + stats.times.get("build", 0.0))
+            solve_time.append(stats.times.get("optimize", 0.0) + stats.times.get("extract", 0.0))
+        peak_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        conn.send({
+            'status': "ok",
+            'backend': stats.backend,
+            'build_s': statistics.median(build),
+            'solve_s': statistics.median(solve_time),
+            'total_s': statistics.median(total),
+            'peak_mb': (peak_after - peak_before) / 1024,  # ru_maxrss is in KiB on Linux
+            'objective': _objective(problem, result),
+        })
+    except Exception as e:
+        conn.send({'status': "error", 'error': f"{type(e).__name__}: {e}"})
+
+
+def measure(family, n, mode, repeat=3, seed=0, timeout=30.0):
+    """Runs one measurement in a child process and returns its record."""
+    problem = FAMILIES[family][0]
+    if n > MAX_SIZE.get((mode, problem), n):
+        return {'status': "skipped"}
+    if mode in KNAPSACK_ENGINES and problem != "knapsack":
+        return {'status': "skipped"}
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure, args=(family, n, mode, repeat, seed, child))
+    process.start()
+    child.close()
+    if parent.poll(timeout):
+        try:
+            record = parent.recv()
+        except EOFError:
+            record = {'status': "error", 'error': f"worker exited with code {process.exitcode}"}
+    else:
+        process.kill()
+        record = {'status': "timeout"}
+    process.join()
+    return record
+
+
+def compare(results, baseline, tolerance=0.25, min_time=0.005):
+    """
+    Compares results to a baseline.
+
+    Args:
+        results, baseline: Dictionaries mapping "family/size/mode" to measurement records.
+        tolerance: Relative slowdown of the total time reported as a regression.
+        min_time: Cases faster than this (in seconds) in both runs are too noisy to compare.
+
+    Returns:
+        A list of (key, message) pairs, one per regression or changed objective.
+    """
+    problems = []
+    for key, record in results.items():
+        base = baseline.get(key)
+        if base is None or base.get('status') != "ok":
+            continue
+        if record.get('status') != "ok":
+            problems.append((key, f"{record.get('status')} (baseline ran in {base['total_s']:.4f}s)"))
+            continue
+        if max(record['total_s'], base['total_s']) >= min_time and record['total_s'] > (1 + tolerance) * base['total_s']:
+            problems.append((key, f"{record['total_s']:.4f}s vs {base['total_s']:.4f}s in the baseline"))
+        if (record['objective'] is None) != (base['objective'] is None) or (
+                record['objective'] is not None
+                and abs(record['objective'] - base['objective']) > 1e-6 * max(1.0, abs(base['objective']))):
+            problems.append((key, f"objective {record['objective']} vs {base['objective']} in the baseline"))
+    return problems
+
+
+def main(argv=None):
+    import solver_backends
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[1])
+    parser.add_argument("--families", nargs="+", choices=sorted(FAMILIES), default=list(FAMILIES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--modes", nargs="+",
+                        default=solver_backends.available_backends() + ["auto", *KNAPSACK_ENGINES])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per measurement")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="relative slowdown reported as a regression")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the results as a new baseline")
+    parser.add_argument("-o", "--output", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'family':<30}{'n':>9}{'mode':>8}{'backend':>9}{'build s':>10}{'solve s':>10}{'peak MB':>9}  objective")
+    for family in args.families:
+        for n in args.sizes:
+            for mode in args.modes:
+                record = measure(family, n, mode, args.repeat, args.seed, args.timeout)
+                if record['status'] == "skipped":
+                    continue
+                results[f"{family}/{n}/{mode}"] = record
+                if record['status'] == "ok":
+                    print(f"{family:<30}{n:>9}{mode:>8}{record['backend']:>9}{record['build_s']:>10.4f}"
+                          f"{record['solve_s']:>10.4f}{record['peak_mb']:>9.1f}  {record['objective']}")
+                else:
+                    print(f"{family:<30}{n:>9}{mode:>8}  {record['status']} {record.get('error', '')}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=1, sort_keys=True)
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        problems = compare(results, json.load(f), args.tolerance)
+    for key, message in problems:
+        print(f"regression: {key}: {message}")
+    print(f"{len(problems)} regression(s) against {args.baseline}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
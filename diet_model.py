@@ -0,0 +1,124 @@
+import numpy as np
+
+from gurobipy import Column, GRB
+
+from optimization_solver import build_diet_model
+
+
+class DietModel:
+    """
+    A diet problem kept alive between solves and updated in place.
+
+    The Gurobi model is built once; later changes to the nutrient requirements, food
+    costs or food columns only touch the affected right-hand sides, objective or
+    constraint coefficients. Every re-solve starts from the previous solution, so
+    what-if sweeps pay re-optimization cost instead of build-plus-solve cost.
+
+    Args:
+        food_calories: A list of calorie content per unit of food.
+        food_protein: A list of protein content per unit of food.
+        food_fat: A list of fat content per unit of food.
+        food_cost: A list of cost per unit of food.
+        calories_needed: The number of calories needed per day.
+        protein_needed: The amount of protein needed per day.
+        fat_needed: The amount of fat needed per day.
+        env: Optional Gurobi environment to build the model in.
+    """
+
+    def __init__(self, food_calories, food_protein, food_fat, food_cost,
+                 calories_needed=0, protein_needed=0, fat_needed=0, env=None):
+        self._table = np.array([food_calories, food_protein, food_fat], dtype=float).reshape(3, -1)
+        self._cost = np.array(food_cost, dtype=float)
+        self.m, x = build_diet_model([calories_needed, protein_needed, fat_needed], self._table, self._cost, env)
+        self.m.update()
+        self._x = x.tolist()
+        self._constrs = self.m.getConstrs()
+        self._start = None
+
+    @property
+    def food_count(self):
+        return len(self._x)
+
+    def set_requirements(self, calories_needed=None, protein_needed=None, fat_needed=None):
+        """Changes the nutrient requirements; arguments left as None are kept."""
+        for constr, rhs in zip(self._constrs, (calories_needed, protein_needed, fat_needed)):
+            if rhs is not None:
+                constr.RHS = rhs
+
+    def set_costs(self, food_cost):
+        """Replaces the cost of every food."""
+        self._cost = np.array(food_cost, dtype=float)
+        self.m.setAttr("Obj", self._x, self._cost.tolist())
+
+    def set_foods(self, food_calories, food_protein, food_fat, food_cost=None):
+        """
+        Replaces the nutrient table of all foods, keeping the number of foods.
+
+        Only the coefficients that actually differ from the current table are changed.
+        """
+        table = np.array([food_calories, food_protein, food_fat], dtype=float).reshape(3, -1)
+        if table.shape != self._table.shape:
+            raise ValueError(f"Expected {self.food_count} foods, got {table.shape[1]}.")
+        for r, c in zip(*np.nonzero(table != self._table)):
+            self.m.chgCoeff(self._constrs[r], self._x[c], table[r, c])
+        self._table = table
+        if food_cost is not None:
+            self.set_costs(food_cost)
+
+    def update_food(self, index, calories=None, protein=None, fat=None, cost=None):
+        """Changes the nutrient content or cost of one food; arguments left as None are kept."""
+        for r, value in enumerate((calories, protein, fat)):
+            if value is not None:
+                self.m.chgCoeff(self._constrs[r], self._x[index], value)
+                self._table[r, index] = value
+        if cost is not None:
+            self._x[index].Obj = cost
+            self._cost[index] = cost
+
+    def add_food(self, calories, protein, fat, cost):
+        """Adds a food column and returns its index."""
+        index = self.food_count
+        column = Column([calories, protein, fat], self._constrs)
+        self._x.append(self.m.addVar(lb=0, vtype=GRB.INTEGER, obj=cost, name=f"x[{index}]", column=column))
+        self._table = np.hstack([self._table, [[calories], [protein], [fat]]])
+        self._cost = np.append(self._cost, cost)
+        if self._start is not None:
+            self._start.append(0.0)
+        return index
+
+    def remove_food(self, index):
+        """Removes a food column; the foods after it shift down by one index."""
+        self.m.remove(self._x.pop(index))
+        self._table = np.delete(self._table, index, axis=1)
+        self._cost = np.delete(self._cost, index)
+        if self._start is not None:
+            del self._start[index]
+
+    def solve(self):
+        """
+        Re-optimizes the model, warm-started from the previous solution.
+
+        Returns:
+            A tuple containing:
+                - A list of amount to consume for each food item (decision variables).
+                - The total cost of the diet (objective function).
+        """
+        if self._start is not None:
+            self.m.setAttr("Start", self._x, self._start)
+        self.m.optimize()
+
+        if self.m.status == GRB.OPTIMAL:
+            self._start = self.m.getAttr("X", self._x)
+            return list(self._start), self.m.objVal
+        else:
+            return [0] * self.food_count, 0
+
+    def dispose(self):
+        """Frees the underlying Gurobi model."""
+        self.m.dispose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.dispose()
@@ -0,0 +1,88 @@
+"""
+Open-source backend for the three problem types, using SciPy's HiGHS MILP solver.
+
+Each function has the signature and return value of its optimization_solver counterpart.
+"""
+import time
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+import solve_stats
+from solve_result import returns_result
+from solve_stats import instrumented
+
+
+def _milp(c, A, lb, ub, integrality, bounds, sense=1):
+    """
+    Runs milp as the optimize phase of the current solve's stats.
+
+    sense is -1 when c is a negated maximization objective, so the recorded objective
+    and bound are those of the original problem.
+    """
+    with solve_stats.phase("optimize"):
+        res = milp(c, constraints=LinearConstraint(A, lb, ub), integrality=integrality, bounds=bounds)
+    if solve_stats.current() is not None:
+        solve_stats.record(
+            num_vars=A.shape[1], num_constrs=A.shape[0], num_nonzeros=int(np.count_nonzero(A)),
+            node_count=getattr(res, "mip_node_count", None), mip_gap=getattr(res, "mip_gap", None)
+        )
+        if res.status == 0:
+            bound = getattr(res, "mip_dual_bound", None)
+            solve_stats.record(objective=sense * res.fun, bound=None if bound is None else sense * bound)
+    return res
+
+
+@instrumented("diet", "highs")
+@returns_result("diet")
+def solve_diet(calories_needed, protein_needed, fat_needed, food_calories, food_protein, food_fat, food_cost):
+    """HiGHS solve_diet; see optimization_solver.solve_diet."""
+    with solve_stats.phase("parse"):
+        nutrients = np.array([food_calories, food_protein, food_fat], dtype=float).reshape(3, -1)
+        food_cost = np.asarray(food_cost, dtype=float)
+    food_count = nutrients.shape[1]
+    res = _milp(
+        food_cost, nutrients, [calories_needed, protein_needed, fat_needed], np.inf,
+        integrality=np.ones(food_count), bounds=Bounds(0, np.inf),
+    )
+    if res.status == 0:
+        return (np.round(res.x) + 0.0).tolist(), res.fun
+    else:
+        return [0] * food_count, 0
+
+
+@instrumented("production_planning", "highs")
+@returns_result("production_planning")
+def solve_production_planning(labor_avail, materials_avail, products):
+    """HiGHS solve_production_planning; see optimization_solver.solve_production_planning."""
+    with solve_stats.phase("parse"):
+        requirements = np.array([[p['labor'] for p in products], [p['materials'] for p in products]], dtype=float)
+        profit = np.array([p['profit'] for p in products], dtype=float)
+        lb = np.maximum([p['min_production'] for p in products], 0.0)
+    res = _milp(
+        -profit, requirements.reshape(2, -1), -np.inf, [labor_avail, materials_avail],
+        integrality=np.ones(len(products)), bounds=Bounds(lb, np.inf), sense=-1,
+    )
+    if res.status == 0:
+        return {
+            'production_levels': {f"prod_{p['name']}": level for p, level in zip(products, (np.round(res.x) + 0.0).tolist())},
+            'total_profit': -res.fun
+        }
+    else:
+        return None
+
+
+@instrumented("knapsack", "highs")
+@returns_result("knapsack")
+def solve_knapsack(capacity, values, weights):
+    """HiGHS solve_knapsack; see optimization_solver.solve_knapsack."""
+    start = time.perf_counter()
+    with solve_stats.phase("parse"):
+        values = np.asarray(values, dtype=float)
+        weights = np.asarray(weights, dtype=float).reshape(1, -1)
+    res = _milp(-values, weights, -np.inf, capacity, integrality=np.ones(len(values)), bounds=Bounds(0, 1), sense=-1)
+    if res.status == 0:
+        selected_items = np.flatnonzero(res.x > 0.5).tolist()
+        return selected_items, -res.fun, time.perf_counter() - start
+    else:
+        return [], 0
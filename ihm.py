@@ -1,12 +1,34 @@
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QLabel,
-    QLineEdit, QMessageBox, QTextEdit, QHBoxLayout, QComboBox
+    QLineEdit, QMessageBox, QHBoxLayout, QComboBox, QStackedWidget, QTableView,
+    QHeaderView, QPlainTextEdit, QFileDialog
 )
-from PyQt5.QtGui import QFont, QIcon
-from PyQt5.QtCore import Qt
-from optimization_solver import solve_diet, solve_production_planning, solve_knapsack
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import QThreadPool
+import functools
 import sys
-from PyQt5.QtWidgets import QSpinBox
+
+import numpy as np
+
+from result_table import ResultTableModel, parse_numbers
+from solve_worker import SolveWorker, format_progress
+
+# Problem shown by each page of the stack (page 0 is the empty selection page), in problem_selector order.
+PAGES = ('production_planning', 'knapsack', 'diet')
+FILE_FILTER = "Tables (*.csv *.npy *.npz)"
+
+
+def _solve(name, *args, **kwargs):
+    """
+    Runs the named optimization_solver function.
+
+    The solver module, and gurobipy with it, is imported on the first solve, on the
+    worker thread, so it does not slow down the start of the window.
+    """
+    import optimization_solver
+
+    return getattr(optimization_solver, name)(*args, **kwargs)
+
 
 class OptimizationApp(QMainWindow):
     def __init__(self):
@@ -19,8 +41,8 @@ class OptimizationApp(QMainWindow):
         self.setStyleSheet("QMainWindow { background-color: #f0f0f0; }"
                            "QPushButton { background-color: #0078d7; color: white; font-size: 11pt; border-radius: 5px; }"
                            "QPushButton:hover { background-color: #005fa3; }"
-                           "QLabel, QLineEdit, QTextEdit, QComboBox { font-size: 10pt; }"
-                           "QTextEdit { background-color: #ffffff; }"
+                           "QLabel, QLineEdit, QPlainTextEdit, QTableView, QComboBox { font-size: 10pt; }"
+                           "QPlainTextEdit, QTableView { background-color: #ffffff; }"
                            "QLineEdit { border-radius: 3px; padding: 2px; background-color: #ffffff; }")
 
         # Layout
@@ -35,311 +57,290 @@ class OptimizationApp(QMainWindow):
         self.problem_selector.currentIndexChanged.connect(self.display_selected_problem)
         self.layout.addWidget(self.problem_selector)
 
-        # Common Back Button (used across different layouts)
+        # Per-problem widgets shared by the pages' solve and display code
+        self.buttons = {}
+        self.status_labels = {}
+        self.result_models = {}
+        self.loaded = {}
+
+        # Every page is built once and kept, so switching problems only changes the visible page
+        self.pages = QStackedWidget(self)
+        self.pages.addWidget(QWidget(self))
+        self.pages.addWidget(self.init_production_planning_page())
+        self.pages.addWidget(self.init_knapsack_page())
+        self.pages.addWidget(self.init_diet_page())
+        self.layout.addWidget(self.pages)
+
+        # Common Back Button, shown on the problem pages
         self.back_button = QPushButton("Back", self)
         self.back_button.clicked.connect(self.go_back_to_selection)
         self.back_button.hide()  # Initially hidden
+        self.layout.addWidget(self.back_button)
 
-    # Each init_*_layout method now includes the back button directly, and specific UI enhancements.
+        # Solves run on pool threads so the window stays responsive; one worker per problem
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max(3, QThreadPool.globalInstance().maxThreadCount()))
+        self.workers = {}
 
     def display_selected_problem(self):
-        # Method modified to handle layouts more cleanly and ensure back button functionality.
         index = self.problem_selector.currentIndex()
-        if index == 0:  # Select Problem
-            self.clear_current_layout()
-            self.problem_selector.show()
-        else:
-            self.problem_selector.hide()
-            self.back_button.show()
-            if index == 1:
-                self.init_production_planning_layout()
-            elif index == 2:
-                self.init_knapsack_layout()
-            elif index == 3:
-                self.init_diet_layout()
-
-    def clear_current_layout(self, keep_back_button=True,keep_selector=True):
-        while self.layout.count():
-            item = self.layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-            # Check if the widget is the back button and if we should keep it
-                if (widget == self.back_button and keep_back_button) or (widget == self.problem_selector and keep_selector):
-                    widget.hide()  # Hide it instead of deleting
-                else:
-                    widget.deleteLater()
-            else:
-                layout = item.layout()
-                if layout:
-                    self.clear_layout(layout)
+        self.pages.setCurrentIndex(index)
+        self.problem_selector.setVisible(index == 0)
+        self.back_button.setVisible(index != 0)
 
-
-    def init_production_planning_layout(self):
-        self.back_button = QPushButton("Back", self)
-        self.back_button.clicked.connect(self.go_back_to_selection)
-    # Clear the layout
-        self.clear_current_layout()
-
-        self.pp_layout = QVBoxLayout()
-
-    # SpinBox to select the number of products
-        self.pp_layout.addWidget(QLabel("Number of Products:"))
-        self.num_products_spinbox = QSpinBox(self)
-        self.num_products_spinbox.setMinimum(1)
-        self.num_products_spinbox.setMaximum(4)
-        self.num_products_spinbox.valueChanged.connect(self.update_product_inputs)
-        self.pp_layout.addWidget(self.num_products_spinbox)
-
-    # Container for product inputs
-        self.product_inputs = []
-        self.products_layout = QVBoxLayout()
-        self.pp_layout.addLayout(self.products_layout)
-     # Add inputs for total labor and materials available
-        self.pp_layout.addWidget(QLabel("Total Labor Available (hours):"))
+    def go_back_to_selection(self):
+        # Pages are kept, so a running solve still reports to its page
+        self.problem_selector.setCurrentIndex(0)
+
+    # Page building blocks
+
+    def list_input(self, problem, placeholder):
+        """A box for a pasted list of numbers (one per line, or separated by commas or spaces)."""
+        box = QPlainTextEdit(self)
+        box.setPlaceholderText(placeholder)
+        # Typing over loaded data replaces it
+        box.textChanged.connect(lambda: self.loaded.pop(problem, None))
+        return box
+
+    def load_button(self, problem, on_load):
+        """A button loading the problem's list inputs from a CSV, .npy or .npz file (see instance_loader)."""
+        button = QPushButton('Load from File...', self)
+
+        def load():
+            path, _ = QFileDialog.getOpenFileName(self, "Load Instance", "", FILE_FILTER)
+            if not path:
+                return
+            try:
+                count = on_load(path)
+            except (OSError, ValueError, KeyError) as e:
+                QMessageBox.warning(self, "Load Error", str(e))
+                return
+            self.status_labels[problem].setText(f"Loaded {count} rows from {path}.")
+
+        button.clicked.connect(load)
+        return button
+
+    def solve_buttons(self, problem, text, on_solve):
+        """The Solve and Cancel buttons of a page."""
+        solve_button = QPushButton(text, self)
+        solve_button.clicked.connect(on_solve)
+        cancel_button = QPushButton('Cancel', self)
+        cancel_button.setEnabled(False)
+        cancel_button.clicked.connect(lambda: self.cancel_solve(problem))
+        self.buttons[problem] = (solve_button, cancel_button)
+        buttons = QHBoxLayout()
+        buttons.addWidget(solve_button)
+        buttons.addWidget(cancel_button)
+        return buttons
+
+    def add_results(self, problem, layout):
+        """Adds the status line and the results table of a page."""
+        status = QLabel(self)
+        status.setWordWrap(True)
+        layout.addWidget(status)
+        self.status_labels[problem] = status
+
+        # The view only formats the rows it paints; fixed row heights spare it measuring every row
+        model = ResultTableModel(self)
+        view = QTableView(self)
+        view.setModel(model)
+        view.verticalHeader().hide()
+        view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(view.fontMetrics().height() + 6)
+        view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(view)
+        self.result_models[problem] = model
+
+    # Pages
+
+    def init_production_planning_page(self):
+        page = QWidget(self)
+        pp_layout = QVBoxLayout(page)
+
+        # Inputs for total labor and materials available
+        pp_layout.addWidget(QLabel("Total Labor Available (hours):"))
         self.total_labor_input = QLineEdit(self)
         self.total_labor_input.setPlaceholderText("Enter total available labor hours")
-        self.pp_layout.addWidget(self.total_labor_input)
+        pp_layout.addWidget(self.total_labor_input)
 
-        self.pp_layout.addWidget(QLabel("Total Materials Available (units):"))
+        pp_layout.addWidget(QLabel("Total Materials Available (units):"))
         self.total_material_input = QLineEdit(self)
         self.total_material_input.setPlaceholderText("Enter total available material units")
-        self.pp_layout.addWidget(self.total_material_input)
-    # Initial setup for product inputs
-
-        self.update_product_inputs(1)
-
-    # Button to solve the production planning problem
-        self.solve_pp_btn = QPushButton('Solve Production Planning', self)
-        self.solve_pp_btn.clicked.connect(self.solve_production_planning)
-        self.pp_layout.addWidget(self.solve_pp_btn)
-
-    # Results display
-        self.pp_results_label = QTextEdit()
-        self.pp_results_label.setReadOnly(True)
-        self.pp_layout.addWidget(self.pp_results_label)
-
-    # Back button
-        self.pp_layout.addWidget(self.back_button)
-        self.back_button.show()
-        self.central_widget.setLayout(self.pp_layout)
-    
-    def update_product_inputs(self, num_products):
-    # Calculate the current count of product layouts in the products_layout
-        current_count = len(self.product_inputs)
-
-    # Remove excess widgets if current count is greater than required
-        if current_count > num_products:
-            for i in range(current_count - 1, num_products - 1, -1):  # Iterate backwards to remove from the end
-            # Retrieve and delete each widget in the layout
-                layout_to_remove = self.products_layout.itemAt(i).layout()
-                while layout_to_remove.count():
-                    item = layout_to_remove.takeAt(0)
-                    widget = item.widget()
-                    if widget:
-                        widget.deleteLater()
-
-            # Remove the layout from the products_layout and delete it
-                layout_item = self.products_layout.takeAt(i)
-                if layout_item.layout() is not None:
-                    layout_item.layout().deleteLater()
-            
-            # Remove the tuple from product_inputs
-                self.product_inputs.pop(i)
-
-    # Add new widgets if the current count is less than the required number
-        if current_count < num_products:
-            for i in range(current_count, num_products):
-                product_layout = QHBoxLayout()
-
-                name_input = QLineEdit(self)
-                name_input.setPlaceholderText("Enter product name")
-                labor_input = QLineEdit(self)
-                labor_input.setPlaceholderText("Enter labor required(hours)")
-                material_input = QLineEdit(self)
-                material_input.setPlaceholderText("Enter materials required(units)")
-                profit_input = QLineEdit(self)
-                profit_input.setPlaceholderText("Enter profit(per unit)")
-                min_production_input = QLineEdit(self)
-                min_production_input.setPlaceholderText("Enter minimum production")
-
-                product_layout.addWidget(QLabel(f"Product {i + 1} Name:"))
-                product_layout.addWidget(name_input)
-                product_layout.addWidget(QLabel("Labor:"))
-                product_layout.addWidget(labor_input)
-                product_layout.addWidget(QLabel("Material:"))
-                product_layout.addWidget(material_input)
-                product_layout.addWidget(QLabel("Profit:"))
-                product_layout.addWidget(profit_input)
-                product_layout.addWidget(QLabel("Minimum Production:"))
-                product_layout.addWidget(min_production_input)
-
-                self.products_layout.addLayout(product_layout)
-                self.product_inputs.append((name_input, labor_input, material_input, profit_input,min_production_input))
-
-
-
-
-    def init_knapsack_layout(self):
-        self.back_button = QPushButton("Back", self)
-        self.back_button.clicked.connect(self.go_back_to_selection)
-
-        self.kp_layout = QVBoxLayout()
+        pp_layout.addWidget(self.total_material_input)
+
+        # Any number of products, pasted one per line or loaded from a file
+        pp_layout.addWidget(QLabel("Products (one per line: name, labor, materials, profit, minimum production):"))
+        self.products_input = QPlainTextEdit(self)
+        self.products_input.setPlaceholderText("Chair, 2, 3, 40, 0\nTable, 5, 8, 120, 1")
+        self.products_input.textChanged.connect(lambda: self.loaded.pop('production_planning', None))
+        pp_layout.addWidget(self.products_input)
+
+        def load(path):
+            from instance_loader import load_products
+
+            data = load_products(path)
+            self.products_input.clear()
+            self.loaded['production_planning'] = [
+                {'name': str(name), 'labor': labor, 'materials': materials, 'profit': profit, 'min_production': low}
+                for name, labor, materials, profit, low in zip(
+                    data['names'], *data['requirements'].tolist(), data['profit'].tolist(),
+                    data['min_production'].tolist())
+            ]
+            return len(data['names'])
+
+        pp_layout.addWidget(self.load_button('production_planning', load))
+        pp_layout.addLayout(self.solve_buttons('production_planning', 'Solve Production Planning',
+                                               self.solve_production_planning))
+        self.add_results('production_planning', pp_layout)
+        return page
+
+    def init_knapsack_page(self):
+        page = QWidget(self)
+        kp_layout = QVBoxLayout(page)
         self.capacity_input = QLineEdit(self)
-        self.values_input = QLineEdit(self)
-        self.weights_input = QLineEdit(self)
-        self.kp_layout.addWidget(QLabel("Knapsack Capacity (kg):"))
-        self.kp_layout.addWidget(self.capacity_input)
-        self.kp_layout.addWidget(QLabel("Item Values (comma-separated):"))
-        self.kp_layout.addWidget(self.values_input)
-        self.kp_layout.addWidget(QLabel("Item Weights (comma-separated):"))
-        self.kp_layout.addWidget(self.weights_input)
-        self.solve_kp_btn = QPushButton('Solve Knapsack Problem', self)
-        self.solve_kp_btn.clicked.connect(self.solve_knapsack)
-        self.kp_layout.addWidget(self.solve_kp_btn)
-        self.kp_results_label = QTextEdit()
-        self.kp_results_label.setReadOnly(True)
-        self.kp_layout.addWidget(self.kp_results_label)
-        self.kp_layout.addWidget(self.back_button)
-
-
-    def init_diet_layout(self):
-
-        self.back_button = QPushButton("Back", self)
-        self.back_button.clicked.connect(self.go_back_to_selection)
-        
-        self.diet_layout = QVBoxLayout()
+        kp_layout.addWidget(QLabel("Knapsack Capacity (kg):"))
+        kp_layout.addWidget(self.capacity_input)
+
+        self.values_input = self.list_input('knapsack', "Item values")
+        self.weights_input = self.list_input('knapsack', "Item weights")
+        lists = QHBoxLayout()
+        for label, box in (("Item Values:", self.values_input), ("Item Weights:", self.weights_input)):
+            column = QVBoxLayout()
+            column.addWidget(QLabel(label))
+            column.addWidget(box)
+            lists.addLayout(column)
+        kp_layout.addLayout(lists)
+
+        def load(path):
+            from instance_loader import load_knapsack
+
+            values, weights = load_knapsack(path)
+            self.values_input.clear()
+            self.weights_input.clear()
+            self.loaded['knapsack'] = (values, weights)
+            return len(values)
+
+        kp_layout.addWidget(self.load_button('knapsack', load))
+        kp_layout.addLayout(self.solve_buttons('knapsack', 'Solve Knapsack Problem', self.solve_knapsack))
+        self.add_results('knapsack', kp_layout)
+        return page
+
+    def init_diet_page(self):
+        page = QWidget(self)
+        diet_layout = QVBoxLayout(page)
         self.calories_needed_input = QLineEdit(self)
         self.protein_needed_input = QLineEdit(self)
         self.fat_needed_input = QLineEdit(self)
-        self.food_calories_input = QLineEdit(self)
-        self.food_protein_input = QLineEdit(self)
-        self.food_fat_input = QLineEdit(self)
-        self.food_cost_input = QLineEdit(self)
-        self.diet_layout.addWidget(QLabel("Calories Needed:"))
-        self.diet_layout.addWidget(self.calories_needed_input)
-        self.diet_layout.addWidget(QLabel("Protein Needed (grams):"))
-        self.diet_layout.addWidget(self.protein_needed_input)
-        self.diet_layout.addWidget(QLabel("Fat Needed (grams):"))
-        self.diet_layout.addWidget(self.fat_needed_input)
-        self.diet_layout.addWidget(QLabel("Food Calories (comma-separated):"))
-        self.diet_layout.addWidget(self.food_calories_input)
-        self.diet_layout.addWidget(QLabel("Food Protein (grams, comma-separated):"))
-        self.diet_layout.addWidget(self.food_protein_input)
-        self.diet_layout.addWidget(QLabel("Food Fat (grams, comma-separated):"))
-        self.diet_layout.addWidget(self.food_fat_input)
-        self.diet_layout.addWidget(QLabel("Food Cost (comma-separated):"))
-        self.diet_layout.addWidget(self.food_cost_input)
-        self.solve_diet_btn = QPushButton('Solve Diet Problem', self)
-        self.solve_diet_btn.clicked.connect(self.solve_diet)
-        self.diet_layout.addWidget(self.solve_diet_btn)
-        self.diet_results_label = QTextEdit()
-        self.diet_results_label.setReadOnly(True)
-        self.diet_layout.addWidget(self.diet_results_label)
-        self.diet_layout.addWidget(self.back_button)
-
-
-    def display_selected_problem(self):
-        index = self.problem_selector.currentIndex()
-        if index == 0:  # Select Problem
-            self.problem_selector.show()
-            self.layout.removeItem(self.layout.itemAt(1))
-            self.layout.removeItem(self.layout.itemAt(1))
-        elif index == 1:  # Production Planning
-                    # Initialize layouts
-            self.problem_selector.hide()
-            self.init_production_planning_layout()
-            self.back_button.show()  # Show back button on problem-solving screens
-            self.layout.removeItem(self.layout.itemAt(1))
-            self.layout.removeItem(self.layout.itemAt(1))
-            self.layout.addLayout(self.pp_layout)
-        elif index == 2:  # Knapsack Problem
-            self.problem_selector.hide()
-            self.init_knapsack_layout()
-            self.back_button.show()  # Show back button on problem-solving screens
-            self.layout.removeItem(self.layout.itemAt(1))
-            self.layout.removeItem(self.layout.itemAt(1))
-            self.layout.addLayout(self.kp_layout)
-        elif index == 3:  # Diet Problem
-            self.problem_selector.hide()
-            self.init_diet_layout()
-            self.back_button.show()  # Show back button on problem-solving screen
-            self.layout.removeItem(self.layout.itemAt(1))
-            self.layout.removeItem(self.layout.itemAt(1))
-            self.layout.addLayout(self.diet_layout)
+        diet_layout.addWidget(QLabel("Calories Needed:"))
+        diet_layout.addWidget(self.calories_needed_input)
+        diet_layout.addWidget(QLabel("Protein Needed (grams):"))
+        diet_layout.addWidget(self.protein_needed_input)
+        diet_layout.addWidget(QLabel("Fat Needed (grams):"))
+        diet_layout.addWidget(self.fat_needed_input)
+
+        self.food_calories_input = self.list_input('diet', "Calories per unit")
+        self.food_protein_input = self.list_input('diet', "Protein per unit (grams)")
+        self.food_fat_input = self.list_input('diet', "Fat per unit (grams)")
+        self.food_cost_input = self.list_input('diet', "Cost per unit")
+        lists = QHBoxLayout()
+        for label, box in (("Food Calories:", self.food_calories_input), ("Food Protein:", self.food_protein_input),
+                           ("Food Fat:", self.food_fat_input), ("Food Cost:", self.food_cost_input)):
+            column = QVBoxLayout()
+            column.addWidget(QLabel(label))
+            column.addWidget(box)
+            lists.addLayout(column)
+        diet_layout.addLayout(lists)
+
+        def load(path):
+            from instance_loader import load_foods
+
+            nutrients, food_cost = load_foods(path)
+            for box in (self.food_calories_input, self.food_protein_input, self.food_fat_input, self.food_cost_input):
+                box.clear()
+            self.loaded['diet'] = (*nutrients, food_cost)
+            return len(food_cost)
+
+        diet_layout.addWidget(self.load_button('diet', load))
+        diet_layout.addLayout(self.solve_buttons('diet', 'Solve Diet Problem', self.solve_diet))
+        self.add_results('diet', diet_layout)
+        return page
+
+    # Solves
+
+    def read_products(self):
+        """Parses the pasted product lines, or returns the products loaded from a file."""
+        if 'production_planning' in self.loaded:
+            return self.loaded['production_planning']
+        products = []
+        for number, line in enumerate(self.products_input.toPlainText().splitlines(), 1):
+            if not line.strip():
+                continue
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) != 5:
+                raise ValueError(f"Line {number}: expected name, labor, materials, profit and minimum production.")
+            labor, material, profit, min_production = map(float, fields[1:])
+            products.append({'name': fields[0], 'labor': labor, 'materials': material, 'profit': profit,
+                             'min_production': min_production})
+        if not products:
+            raise ValueError("Please enter at least one product.")
+        return products
 
-    def go_back_to_selection(self):
-      current_index = self.problem_selector.currentIndex()
-      if current_index == 1:
-        self.delete_layout_widgets(self.pp_layout)
-      elif current_index == 2:
-        self.delete_layout_widgets(self.kp_layout)
-      elif current_index == 3:
-        self.delete_layout_widgets(self.diet_layout)
-      self.problem_selector.setCurrentIndex(0)
-
-    def delete_layout_widgets(self, layout):
-        # Delete widgets within the layout
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-            else:
-                sublayout = item.layout()
-                if sublayout:
-                    self.delete_layout_widgets(sublayout)
-                    
     def solve_production_planning(self):
         try:
-        # Convert input text to floats and validate
+            # Convert input text to floats and validate
             total_labor_avail = float(self.total_labor_input.text().strip())
             total_materials_avail = float(self.total_material_input.text().strip())
-            products = []
-
-            for name_input, labor_input, material_input, profit_input,min_production_input in self.product_inputs:
-                name = name_input.text().strip()
-                labor = float(labor_input.text().strip())
-                material = float(material_input.text().strip())
-                profit = float(profit_input.text().strip())
-                min_production =float(min_production_input.text().strip())
-            
-                products.append({'name': name, 'labor': labor, 'materials': material, 'profit': profit, 'min_production': min_production})
-
-        # Call backend solver
-            result = solve_production_planning(total_labor_avail, total_materials_avail, products)
-
-            if result:
-            # Format and display results
-                result_message = "Optimal Production Levels:\n"
-                for varName, quantity in result['production_levels'].items():
-                    result_message += f"{varName}: {quantity:.0f} units\n"  # Format for integer quantities
-                result_message += f"Total Profit: ${result['total_profit']:.2f}"
-                self.pp_results_label.clear()
-                self.pp_results_label.setText(result_message)
-            else:
-                QMessageBox.warning(self, "Solution Error", "No feasible solution was found.")
+            products = self.read_products()
+
+            # Call backend solver on a worker thread
+            self.start_solve('production_planning', 'solve_production_planning',
+                             (total_labor_avail, total_materials_avail, products),
+                             self.show_production_planning_result)
 
         except ValueError as e:
             QMessageBox.warning(self, "Input Error", f"Please enter valid numbers. Error: {str(e)}")
 
+    def show_production_planning_result(self, result):
+        if result.solved:
+            self.result_models['production_planning'].set_columns([
+                ("Product", np.array(result.names), "{}"),
+                ("Quantity (units)", result.x, "{:.0f}"),  # Format for integer quantities
+            ])
+            self.status_labels['production_planning'].setText(f"Total Profit: ${result.objective:.2f}")
+        else:
+            self.status_labels['production_planning'].clear()
+            QMessageBox.warning(self, "Solution Error", "No feasible solution was found.")
 
     def solve_knapsack(self):
         try:
             capacity = float(self.capacity_input.text())
             if capacity < 0:
                 raise ValueError("Capacity must be non-negative.")
-            values = list(map(float, self.values_input.text().split('-')))
-            weights = list(map(float, self.weights_input.text().split('-')))
-            if any(v < 0 for v in values) or any(w < 0 for w in weights):
+            if 'knapsack' in self.loaded:
+                values, weights = self.loaded['knapsack']
+            else:
+                values = parse_numbers(self.values_input.toPlainText())
+                weights = parse_numbers(self.weights_input.toPlainText())
+            if len(values) != len(weights):
+                raise ValueError("Values and weights must have the same number of items.")
+            if np.any(values < 0) or np.any(weights < 0):
                 raise ValueError("Values and weights must be non-negative.")
-            selected_items, total_value, time = solve_knapsack(capacity, values, weights)
-            item_display = ", ".join(f"Item {i+1}" for i in selected_items)
-            self.kp_results_label.setText(f"Selected Items: {item_display}\nTotal Value: ${total_value:.2f}_\nTime taken: {time:.6f} seconds.")
+            self.start_solve('knapsack', 'solve_knapsack', (capacity, values, weights),
+                             lambda result: self.show_knapsack_result(result, values, weights))
         except ValueError as e:
             QMessageBox.warning(self, "Input Error", str(e))
 
+    def show_knapsack_result(self, result, values, weights):
+        selected_items = result.selected
+        self.result_models['knapsack'].set_columns([
+            ("Item", selected_items + 1, "Item {}"),
+            ("Value", np.asarray(values)[selected_items], "{:.2f}"),
+            ("Weight", np.asarray(weights)[selected_items], "{:.2f}"),
+        ])
+        self.status_labels['knapsack'].setText(
+            f"Selected Items: {len(selected_items)}\nTotal Value: ${result.objective:.2f}\n"
+            f"Time taken: {result.runtime or 0.0:.6f} seconds.")
 
-    
     def solve_diet(self):
         try:
             calories_needed = float(self.calories_needed_input.text())
@@ -347,24 +348,84 @@ class OptimizationApp(QMainWindow):
             fat_needed = float(self.fat_needed_input.text())
             if calories_needed < 0 or protein_needed < 0 or fat_needed < 0:
                 raise ValueError("Nutritional needs must be non-negative.")
-            food_calories = list(map(float, self.food_calories_input.text().split(',')))
-            food_protein = list(map(float, self.food_protein_input.text().split(',')))
-            food_fat = list(map(float, self.food_fat_input.text().split(',')))
-            food_cost = list(map(float, self.food_cost_input.text().split(',')))
-            if any(f < 0 for f in food_calories + food_protein + food_fat + food_cost):
+            if 'diet' in self.loaded:
+                foods = self.loaded['diet']
+            else:
+                foods = [parse_numbers(box.toPlainText()) for box in (
+                    self.food_calories_input, self.food_protein_input, self.food_fat_input, self.food_cost_input)]
+            if len({len(column) for column in foods}) != 1:
+                raise ValueError("Every food list must have the same number of foods.")
+            if any(np.any(column < 0) for column in foods):
                 raise ValueError("Food data must be non-negative.")
-            optimal_quantities, total_cost = solve_diet(calories_needed, protein_needed, fat_needed, food_calories, food_protein, food_fat, food_cost)
-            food_names = ["Food {}".format(i+1) for i in range(len(optimal_quantities))]
-            food_list = [f"{food_names[i]}: {optimal_quantities[i]:.2f} units" for i in range(len(optimal_quantities)) if optimal_quantities[i] > 0]
-            food_display = "\n".join(food_list)
-            self.diet_results_label.setText(f"Selected Foods:\n{food_display}\nTotal Cost: ${total_cost:.2f}")
+            self.start_solve('diet', 'solve_diet', (calories_needed, protein_needed, fat_needed, *foods),
+                             self.show_diet_result)
         except ValueError as e:
             QMessageBox.warning(self, "Input Error", str(e))
 
-        
+    def show_diet_result(self, result):
+        if not result.solved:
+            self.status_labels['diet'].clear()
+            QMessageBox.warning(self, "Solution Error", "No feasible solution was found.")
+            return
+        foods = np.flatnonzero(result.x > 0)
+        self.result_models['diet'].set_columns([
+            ("Food", foods + 1, "Food {}"),
+            ("Units", result.x[foods], "{:.2f}"),
+        ])
+        self.status_labels['diet'].setText(f"Selected Foods: {len(foods)}\nTotal Cost: ${result.objective:.2f}")
+
+    def start_solve(self, problem, solver, args, on_finished):
+        # Run the solver on the thread pool, streaming its progress into the page's status line;
+        # compact results keep the solution as arrays, which the results table reads directly
+        worker = SolveWorker(functools.partial(_solve, solver), *args, compact=True)
+        self.workers[problem] = worker
+        solve_button, cancel_button = self.buttons[problem]
+        status = self.status_labels[problem]
+
+        def done():
+            # Ignore workers that were replaced by a newer solve of the same problem
+            if self.workers.get(problem) is not worker:
+                return False
+            del self.workers[problem]
+            solve_button.setEnabled(True)
+            cancel_button.setEnabled(False)
+            return True
+
+        def finished(result):
+            if done():
+                on_finished(result)
+
+        def cancelled():
+            if done():
+                status.setText("Solve cancelled.")
+
+        def failed(message):
+            if done():
+                status.clear()
+                QMessageBox.warning(self, "Solver Error", message)
+
+        def progress(progress):
+            if self.workers.get(problem) is worker:
+                status.setText(format_progress(progress))
+
+        worker.signals.progress.connect(progress)
+        worker.signals.finished.connect(finished)
+        worker.signals.cancelled.connect(cancelled)
+        worker.signals.error.connect(failed)
+        solve_button.setEnabled(False)
+        cancel_button.setEnabled(True)
+        self.result_models[problem].clear()
+        status.setText("Solving...")
+        self.thread_pool.start(worker)
+
+    def cancel_solve(self, problem):
+        worker = self.workers.get(problem)
+        if worker is not None:
+            worker.cancel()
+
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     ex = OptimizationApp()
     ex.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
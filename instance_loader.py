@@ -0,0 +1,186 @@
+from pathlib import Path
+
+import numpy as np
+
+# Column names expected in the input files of each problem.
+KNAPSACK_COLUMNS = ("value", "weight")
+FOOD_COLUMNS = ("calories", "protein", "fat", "cost")
+PRODUCT_COLUMNS = ("labor", "materials", "profit", "min_production")
+
+# Rows parsed at a time from CSV files.
+CHUNK_ROWS = 65536
+
+
+def _count_rows(path):
+    """Counts the data rows of a CSV file (lines after the header) without parsing it."""
+    rows = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            rows += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        rows += 1  # Last line has no trailing newline
+    return max(rows - 1, 0)
+
+
+def _header_indices(header, columns, path):
+    names = [name.strip().lower() for name in header.split(",")]
+    missing = [c for c in columns if c not in names]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    return [names.index(c) for c in columns]
+
+
+def iter_csv_chunks(path, columns, chunk_rows=CHUNK_ROWS, text_columns=()):
+    """
+    Reads a CSV file with a header row in chunks of rows.
+
+    Args:
+        path: The CSV file.
+        columns: Names of the numeric columns to read.
+        chunk_rows: Number of rows parsed at a time.
+        text_columns: Names of string columns to read as well (e.g. product names).
+
+    Yields:
+        A dictionary mapping each requested column to a NumPy array holding one chunk.
+    """
+    # Each chunk is parsed by loadtxt straight from the buffered file, which it leaves
+    # positioned after the last row read
+    with open(path, "rb") as f:
+        header = f.readline().decode()
+        numeric = _header_indices(header, columns, path)
+        text = _header_indices(header, text_columns, path)
+        while f.peek(1):
+            if text:
+                # One pass over the rows: the numeric columns come back as strings too
+                strings = np.loadtxt(f, delimiter=",", usecols=numeric + text, dtype=str, ndmin=2,
+                                     max_rows=chunk_rows)
+                chunk = dict(zip(columns, strings[:, :len(numeric)].astype(float).T))
+                chunk.update(zip(text_columns, np.char.strip(strings[:, len(numeric):]).T))
+            else:
+                chunk = dict(zip(columns, np.loadtxt(f, delimiter=",", usecols=numeric, ndmin=2,
+                                                     max_rows=chunk_rows).T))
+            yield chunk
+
+
+def read_columns(path, columns, mmap=True, text_columns=()):
+    """
+    Reads the given columns of a table stored as CSV, .npy or .npz.
+
+    CSV files are counted first and parsed chunk by chunk straight into preallocated
+    arrays, so the peak memory is about the size of the result. A .npy file holds either
+    a structured array with the named fields or a 2-D array whose columns are in the
+    given order; it is memory-mapped when mmap is set. A .npz file holds one array per
+    column.
+
+    Args:
+        path: The input file.
+        columns: Names of the numeric columns to read.
+        mmap: Whether to memory-map .npy files instead of loading them.
+        text_columns: Names of string columns to read as well.
+
+    Returns:
+        A dictionary mapping each column to a NumPy array.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        data = np.load(path, mmap_mode="r" if mmap else None)
+        if data.dtype.names:
+            return {c: data[c] for c in tuple(columns) + tuple(text_columns)}
+        if text_columns:
+            raise ValueError(f"{path}: text columns need a structured .npy array")
+        return {c: data[:, k] for k, c in enumerate(columns)}
+    if suffix == ".npz":
+        with np.load(path) as data:
+            return {c: data[c] for c in tuple(columns) + tuple(text_columns)}
+    if suffix != ".csv":
+        raise ValueError(f"{path}: unsupported file type {suffix}")
+
+    rows = _count_rows(path)
+    out = {c: np.empty(rows) for c in columns}
+    pos = 0
+    for chunk in iter_csv_chunks(path, columns, text_columns=text_columns):
+        size = len(chunk[columns[0]])
+        for c, values in chunk.items():
+            if c not in out:
+                # String widths are only known once parsed; grow the text columns as needed
+                out[c] = np.empty(rows, dtype=values.dtype)
+            elif out[c].dtype.kind == "U" and out[c].dtype.itemsize < values.dtype.itemsize:
+                out[c] = out[c].astype(values.dtype)
+            out[c][pos:pos + size] = values
+        pos += size
+    return {c: values[:pos] for c, values in out.items()}
+
+
+def load_knapsack(path, mmap=True):
+    """
+    Loads knapsack items from a file with "value" and "weight" columns.
+
+    Returns:
+        A tuple (values, weights) of NumPy arrays.
+    """
+    data = read_columns(path, KNAPSACK_COLUMNS, mmap)
+    return data["value"], data["weight"]
+
+
+def load_foods(path, mmap=True):
+    """
+    Loads a food table from a file with "calories", "protein", "fat" and "cost" columns.
+
+    Returns:
+        A tuple (nutrients, food_cost): a 3 x n array of calories, protein and fat per
+        unit of each food, and the cost per unit of each food.
+    """
+    data = read_columns(path, FOOD_COLUMNS, mmap)
+    return np.stack([data["calories"], data["protein"], data["fat"]]), data["cost"]
+
+
+def load_products(path, mmap=True):
+    """
+    Loads a product table from a file with "name", "labor", "materials", "profit" and
+    "min_production" columns.
+
+    Returns:
+        A dictionary of arrays: 'names', 'requirements' (2 x n labor and materials per
+        unit), 'profit' and 'min_production'.
+    """
+    data = read_columns(path, PRODUCT_COLUMNS, mmap, text_columns=("name",))
+    return {
+        'names': data["name"],
+        'requirements': np.stack([data["labor"], data["materials"]]),
+        'profit': data["profit"],
+        'min_production': data["min_production"],
+    }
+
+
+def stream_knapsack_model(capacity, path, chunk_rows=CHUNK_ROWS, env=None):
+    """
+    Builds the knapsack model straight from a CSV file, one chunk of items at a time.
+
+    Only one chunk of parsed rows is held in Python at any time; each chunk becomes a
+    block of variables and a term of the capacity constraint.
+
+    Args:
+        capacity: The maximum weight capacity of the knapsack.
+        path: CSV file with "value" and "weight" columns.
+        chunk_rows: Number of items parsed and added at a time.
+        env: Optional Gurobi environment to build the model in.
+
+    Returns:
+        A tuple (model, blocks) where blocks is the list of per-chunk binary MVars, in file order.
+    """
+    from optimization_solver import GRB, Model
+
+    m = Model("knapsack", env=env)
+    m.ModelSense = GRB.MAXIMIZE
+    blocks = []
+    load = 0
+    for chunk in iter_csv_chunks(path, KNAPSACK_COLUMNS, chunk_rows):
+        x = m.addMVar(len(chunk["value"]), vtype=GRB.BINARY, obj=chunk["value"], name=f"x{len(blocks)}")
+        load = load + chunk["weight"] @ x
+        blocks.append(x)
+    if blocks:
+        m.addConstr(load <= capacity, "Capacity")
+    return m, blocks
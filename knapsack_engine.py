@@ -0,0 +1,281 @@
+import time
+
+import numpy as np
+
+# Largest DP table (items x capacity cells) the dynamic program is allowed to allocate.
+DP_CELL_LIMIT = 50_000_000
+
+# Scale factors tried to turn decimal weights (e.g. 2.5 kg) into integers for the DP.
+WEIGHT_SCALES = (1, 10, 100, 1000)
+
+# Cell budget of one chunk of the batched DP; small chunks keep the working set in cache.
+DP_BATCH_CHUNK_CELLS = 1_000_000
+
+# Node budget for branch-and-bound before handing the instance over to Gurobi.
+BNB_NODE_LIMIT = 200_000
+
+
+def integer_scale(weights, scales=WEIGHT_SCALES):
+    """
+    Finds the smallest scale factor that makes every weight an integer.
+
+    Args:
+        weights: A NumPy array with the weight of each item.
+        scales: Candidate scale factors, tried in increasing order.
+
+    Returns:
+        The scale factor, or None if no candidate makes the weights integral.
+    """
+    for scale in scales:
+        scaled = weights * scale
+        if np.all(np.abs(scaled - np.round(scaled)) <= 1e-9 * scale):
+            return scale
+    return None
+
+
+def dp_cells(capacity, item_count, scale):
+    """Returns the size of the DP table needed for the given scaled instance."""
+    return item_count * (int(np.floor(capacity * scale + 1e-9)) + 1)
+
+
+def solve_knapsack_dp(capacity, values, weights, scale=1):
+    """
+    Solves a 0/1 knapsack with integer weights by dynamic programming over capacities.
+
+    Each item is folded into the table with one vectorized NumPy maximum, and the
+    decisions are kept in a boolean table so the selected items can be recovered.
+
+    Args:
+        capacity: The maximum weight capacity of the knapsack.
+        values: A list or array representing the value of each item.
+        weights: A list or array representing the weight of each item.
+        scale: Factor applied to the capacity and weights to make them integers.
+
+    Returns:
+        A tuple containing:
+            - A list of indices representing the selected items to put in the knapsack.
+            - The total value of the selected items.
+            - The time taken to solve the problem (in seconds).
+    """
+    start = time.perf_counter()
+    values = np.asarray(values, dtype=float)
+    int_weights = np.round(np.asarray(weights, dtype=float) * scale).astype(np.int64)
+    cap = int(np.floor(capacity * scale + 1e-9))
+    item_count = len(values)
+
+    best = np.zeros(cap + 1)
+    take = np.zeros((item_count, cap + 1), dtype=bool)
+    for i in range(item_count):
+        w, v = int_weights[i], values[i]
+        if v <= 0 or w > cap:
+            continue
+        # best[c] = max(best[c], best[c - w] + v) for every capacity c >= w at once
+        candidate = best[:cap + 1 - w] + v
+        improved = candidate > best[w:]
+        take[i, w:] = improved
+        best[w:] = np.where(improved, candidate, best[w:])
+
+    # Walk the decision table backwards to recover the selected items
+    selected_items = []
+    c = cap
+    for i in range(item_count - 1, -1, -1):
+        if take[i, c]:
+            selected_items.append(i)
+            c -= int_weights[i]
+    selected_items.reverse()
+
+    return selected_items, float(values[selected_items].sum()), time.perf_counter() - start
+
+
+def solve_knapsack_bnb(capacity, values, weights, max_nodes=None):
+    """
+    Solves a 0/1 knapsack with real-valued weights by depth-first branch-and-bound.
+
+    Items are explored in decreasing value/weight order and every node is pruned
+    against the Dantzig (fractional) upper bound, computed from prefix sums.
+
+    Args:
+        capacity: The maximum weight capacity of the knapsack.
+        values: A list or array representing the value of each item.
+        weights: A list or array representing the weight of each item.
+        max_nodes: Optional limit on the number of explored nodes.
+
+    Returns:
+        A tuple containing:
+            - A list of indices representing the selected items to put in the knapsack.
+            - The total value of the selected items.
+            - The time taken to solve the problem (in seconds).
+        None is returned instead if the node limit was reached.
+    """
+    start = time.perf_counter()
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    tol = 1e-9 * max(1.0, abs(capacity))
+
+    # Items without weight are always worth taking; useless or oversized items are dropped
+    free = np.flatnonzero((weights <= 0) & (values > 0))
+    candidates = np.flatnonzero((weights > 0) & (values > 0) & (weights <= capacity + tol))
+    ratio = values[candidates] / weights[candidates]
+    order = candidates[np.argsort(-ratio, kind="stable")]
+    v, w = values[order], weights[order]
+    n = len(order)
+    prefix_v = np.concatenate(([0.0], np.cumsum(v)))
+    prefix_w = np.concatenate(([0.0], np.cumsum(w)))
+
+    def upper_bound(j, cap):
+        # Items j..r-1 fit entirely, item r is taken fractionally
+        r = int(np.searchsorted(prefix_w, prefix_w[j] + cap + tol, side="right")) - 1
+        bound = prefix_v[r] - prefix_v[j]
+        if r < n:
+            bound += (cap - (prefix_w[r] - prefix_w[j])) * v[r] / w[r]
+        return bound
+
+    best_value, best_stack = 0.0, []
+    stack = []
+    cap, value, j, nodes = float(capacity), 0.0, 0, 0
+    while True:
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            return None
+        if j < n:
+            if value + upper_bound(j, cap) > best_value + tol:
+                # Forward move: take consecutive items while they fit, then skip the next one
+                while j < n and w[j] <= cap + tol:
+                    stack.append(j)
+                    cap -= w[j]
+                    value += v[j]
+                    j += 1
+                j += 1
+                continue
+        elif value > best_value:
+            best_value, best_stack = value, list(stack)
+
+        # Backtrack: drop the most recently taken item and explore its exclusion branch
+        if not stack:
+            break
+        k = stack.pop()
+        cap += w[k]
+        value -= v[k]
+        j = k + 1
+
+    selected_items = sorted(free.tolist() + order[best_stack].tolist())
+    return selected_items, float(values[selected_items].sum()), time.perf_counter() - start
+
+
+def choose_knapsack_engine(capacity, values, weights, gurobi_available=True):
+    """
+    Picks the cheapest engine for a knapsack instance.
+
+    Args:
+        capacity: The maximum weight capacity of the knapsack.
+        values: A NumPy array with the value of each item.
+        weights: A NumPy array with the weight of each item.
+        gurobi_available: Whether the Gurobi fallback can be used.
+
+    Returns:
+        A tuple (engine, scale) where engine is "dp", "bnb" or "gurobi" and scale is
+        the weight scale factor for the DP (None for the other engines).
+    """
+    if np.any(weights < 0):
+        # Negative weights break both specialised engines
+        if not gurobi_available:
+            raise ValueError("Knapsacks with negative weights require Gurobi.")
+        return "gurobi", None
+    scale = integer_scale(weights)
+    if scale is not None and dp_cells(max(capacity, 0), len(values), scale) <= DP_CELL_LIMIT:
+        return "dp", scale
+    return "bnb", None
+
+
+def solve_knapsack_dp_batch(capacities, values, weights, scales=None):
+    """
+    Solves many small integer-weight knapsacks together with one vectorized DP.
+
+    Instances are sorted by capacity, padded to a common item count and processed in
+    chunks of similar capacity whose decision tables fit in DP_BATCH_CHUNK_CELLS cells. Every DP step updates the
+    tables of all instances in the chunk with a single NumPy gather.
+
+    Args:
+        capacities: The capacity of each instance.
+        values: A sequence with the item values of each instance.
+        weights: A sequence with the item weights of each instance.
+        scales: Optional per-instance scale factors that make the weights integers.
+
+    Returns:
+        A list with one (selected_items, total_value, runtime) tuple per instance, in
+        input order. The runtime is the chunk's solve time shared evenly by its instances.
+    """
+    count = len(capacities)
+    if scales is None:
+        scales = [1] * count
+    caps = np.array([int(np.floor(capacities[k] * scales[k] + 1e-9)) for k in range(count)], dtype=np.int64)
+    results = [None] * count
+
+    order = np.argsort(caps, kind="stable")
+    pos = 0
+    while pos < count:
+        # Grow the chunk while the padded decision table stays within the cell budget and
+        # the capacities stay close enough that padding wastes at most half of it
+        end = pos + 1
+        item_count = len(values[order[pos]])
+        while end < count:
+            grown_items = max(item_count, len(values[order[end]]))
+            cells = (end + 1 - pos) * max(grown_items, 1) * (caps[order[end]] + 1)
+            if cells > DP_BATCH_CHUNK_CELLS or caps[order[end]] + 1 > 2 * (caps[order[pos]] + 1):
+                break
+            item_count = grown_items
+            end += 1
+        chunk = order[pos:end]
+        for k, result in zip(chunk, _dp_chunk(caps[chunk], [values[k] for k in chunk],
+                                              [weights[k] for k in chunk], [scales[k] for k in chunk])):
+            results[k] = result
+        pos = end
+    return results
+
+
+def _dp_chunk(caps, values, weights, scales):
+    """Runs the batched DP on one chunk of instances (see solve_knapsack_dp_batch)."""
+    start = time.perf_counter()
+    batch = len(caps)
+    item_count = max(len(v) for v in values)
+    cap = int(caps.max())
+
+    # Pad to a rectangular layout; padding items have no value and are never taken
+    v_table = np.zeros((batch, item_count))
+    w_table = np.zeros((batch, item_count), dtype=np.int64)
+    for b in range(batch):
+        n = len(values[b])
+        v_table[b, :n] = values[b]
+        w_table[b, :n] = np.round(np.asarray(weights[b], dtype=float) * scales[b])
+
+    # Each row is prefixed with `pad` cells of -inf so that best[c - w] never needs a bounds check
+    np.minimum(w_table, cap + 1, out=w_table)
+    pad = int(w_table.max(initial=0))
+    width = pad + cap + 1
+    table = np.full((batch, width), -np.inf)
+    table[:, pad:] = 0.0
+    best = table[:, pad:]
+    flat = table.ravel()
+    base = np.arange(batch)[:, None] * width + pad + np.arange(cap + 1)[None, :]
+    take = np.zeros((batch, item_count, cap + 1), dtype=bool)
+    for i in range(item_count):
+        # best[c] is non-decreasing in c, so items with no value can never improve it
+        candidate = flat.take(base - w_table[:, i:i + 1])
+        candidate += v_table[:, i:i + 1]
+        improved = take[:, i, :]
+        np.greater(candidate, best, out=improved)
+        np.maximum(best, candidate, out=best)
+
+    # Recover the selections of every instance at once, walking the items backwards
+    c = caps.astype(np.int64).copy()
+    chosen = np.zeros((batch, item_count), dtype=bool)
+    for i in range(item_count - 1, -1, -1):
+        chosen[:, i] = take[np.arange(batch), i, c]
+        c -= np.where(chosen[:, i], w_table[:, i], 0)
+
+    runtime = (time.perf_counter() - start) / batch
+    results = []
+    for b in range(batch):
+        selected_items = np.flatnonzero(chosen[b, :len(values[b])]).tolist()
+        results.append((selected_items, float(v_table[b, selected_items].sum()), runtime))
+    return results
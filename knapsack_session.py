@@ -0,0 +1,278 @@
+import time
+
+import numpy as np
+
+import solve_stats
+from knapsack_engine import integer_scale, solve_knapsack_bnb
+from solve_stats import instrumented
+
+try:
+    from gurobipy import Column, LinExpr, Model, GRB
+except ImportError:
+    Column = LinExpr = Model = GRB = None
+
+# Largest DP table (in bytes, spare rows included) a session keeps between solves. Unlike
+# the one-shot DP of knapsack_engine, which keeps one bool decision per cell, a session
+# keeps every float64 value row to recompute only the rows after a change.
+DP_TABLE_BYTES = 64 * 2**20
+
+
+class KnapsackSession:
+    """
+    A knapsack kept alive while items come and go, re-solved incrementally.
+
+    Items are identified by stable ids. With the "dp" engine the dynamic-programming
+    table is kept between solves: each item owns one row, so adding an item computes a
+    single row and removing or changing one recomputes only the rows after it, while
+    lowering the capacity (or raising it back within the largest capacity seen) needs no
+    recomputation at all. With the "gurobi" engine one model is kept and updated in
+    place (columns added or removed, coefficients and right-hand side changed), and
+    every re-solve starts from the previous solution.
+
+    Args:
+        capacity: The maximum weight capacity of the knapsack.
+        values: Optional initial item values.
+        weights: Optional initial item weights; the initial items get ids 0, 1, ...
+        engine: "auto", "dp", "gurobi" or "bnb". "auto" picks the DP when the weights are
+            non-negative integers (or decimals with few digits) and the table fits in
+            DP_TABLE_BYTES, and Gurobi otherwise. A DP session that stops qualifying
+            (e.g. a fractional weight arrives) switches to Gurobi. Without gurobipy,
+            "bnb" re-solves from scratch with the in-house branch-and-bound.
+        env: Optional Gurobi environment to build the model in.
+    """
+
+    def __init__(self, capacity, values=(), weights=(), engine="auto", env=None):
+        self._capacity = capacity
+        self._values = [float(v) for v in values]
+        self._weights = [float(w) for w in weights]
+        self._ids = list(range(len(self._values)))
+        self._index = {item_id: i for i, item_id in enumerate(self._ids)}
+        self._next_id = len(self._ids)
+        self._env = env
+        self.m = None
+        self._rows = None
+
+        scale = integer_scale(np.asarray(self._weights)) if min(self._weights, default=0) >= 0 else None
+        if engine == "auto":
+            if scale is not None and self._dp_fits(scale, capacity):
+                engine = "dp"
+            else:
+                engine = "gurobi" if Model is not None else "bnb"
+        if engine == "dp":
+            if scale is None or not self._dp_fits(scale, capacity):
+                raise ValueError("The DP engine needs non-negative weights with few decimals and a table "
+                                 "within DP_TABLE_BYTES.")
+            self._start_dp(scale)
+        elif engine == "gurobi":
+            self._start_model()
+        elif engine == "bnb":
+            self._engine = "bnb"
+        else:
+            raise ValueError(f"Unknown knapsack session engine: {engine}")
+
+    @property
+    def engine(self):
+        return self._engine
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def item_count(self):
+        return len(self._ids)
+
+    def add_item(self, value, weight, item_id=None):
+        """Adds an item and returns its id."""
+        if item_id is None:
+            item_id = self._next_id
+        elif item_id in self._index:
+            raise ValueError(f"Duplicate item id: {item_id}")
+        if isinstance(item_id, int):
+            self._next_id = max(self._next_id, item_id + 1)
+        self._index[item_id] = len(self._ids)
+        self._ids.append(item_id)
+        self._values.append(float(value))
+        self._weights.append(float(weight))
+
+        if self._engine == "dp" and not (self._dp_accepts(weight) and self._dp_fits_now()):
+            self._fall_back()
+        elif self._engine == "gurobi":
+            column = Column([float(weight)], [self._constr])
+            self._vars.append(self.m.addVar(vtype=GRB.BINARY, obj=float(value), column=column))
+            if self._start is not None:
+                self._start.append(0.0)
+        return item_id
+
+    def remove_item(self, item_id):
+        """Removes an item."""
+        i = self._index.pop(item_id)
+        del self._ids[i], self._values[i], self._weights[i]
+        for k in range(i, len(self._ids)):
+            self._index[self._ids[k]] = k
+
+        if self._engine == "dp":
+            self._dirty = min(self._dirty, i)
+        elif self._engine == "gurobi":
+            self.m.remove(self._vars.pop(i))
+            if self._start is not None:
+                del self._start[i]
+
+    def update_item(self, item_id, value=None, weight=None):
+        """Changes the value and/or weight of an item; arguments left as None are kept."""
+        i = self._index[item_id]
+        if value is not None:
+            self._values[i] = float(value)
+        if weight is not None:
+            self._weights[i] = float(weight)
+
+        if self._engine == "dp":
+            self._dirty = min(self._dirty, i)
+            if weight is not None and not self._dp_accepts(weight):
+                self._fall_back()
+        elif self._engine == "gurobi":
+            if value is not None:
+                self._vars[i].Obj = float(value)
+            if weight is not None:
+                self.m.chgCoeff(self._constr, self._vars[i], float(weight))
+
+    def set_capacity(self, capacity):
+        """Changes the capacity of the knapsack."""
+        self._capacity = capacity
+        if self._engine == "dp" and not self._dp_fits_now():
+            self._fall_back()
+        elif self._engine == "gurobi":
+            self._constr.RHS = capacity
+
+    @instrumented("knapsack", None)
+    def solve(self):
+        """
+        Re-solves the knapsack after the updates made since the previous solve.
+
+        Returns:
+            A tuple containing:
+                - The ids of the selected items, in item order.
+                - The total value of the selected items.
+                - The time taken to solve the problem (in seconds).
+        """
+        start = time.perf_counter()
+        solve_stats.record(backend=self._engine, num_vars=self.item_count, num_constrs=1)
+        if self._engine == "dp":
+            with solve_stats.phase("optimize"):
+                self._update_table()
+            with solve_stats.phase("extract"):
+                selected = self._dp_selection()
+        elif self._engine == "gurobi":
+            if self._start is not None:
+                self.m.setAttr("Start", self._vars, self._start)
+            with solve_stats.phase("optimize"):
+                self.m.optimize()
+            solve_stats.record_model(self.m)
+            if self.m.status != GRB.OPTIMAL:
+                return [], 0, time.perf_counter() - start
+            self._start = self.m.getAttr("X", self._vars)
+            selected = np.flatnonzero(np.array(self._start) > 0.5).tolist()
+        else:
+            with solve_stats.phase("optimize"):
+                selected = solve_knapsack_bnb(self._capacity, self._values, self._weights)[0]
+
+        value = float(sum(self._values[i] for i in selected))
+        return [self._ids[i] for i in selected], value, time.perf_counter() - start
+
+    def dispose(self):
+        """Frees the underlying Gurobi model, if any."""
+        if self.m is not None:
+            self.m.dispose()
+            self.m = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.dispose()
+
+    # Dynamic-programming engine
+
+    def _dp_fits(self, scale, capacity):
+        """Tells whether the table, as _update_table would allocate it, fits in DP_TABLE_BYTES."""
+        width = int(np.floor(max(capacity, 0) * scale + 1e-9)) + 1
+        rows = max(_spare_rows(self.item_count), 0 if self._rows is None else self._rows.shape[0])
+        return rows * width * np.dtype(float).itemsize <= DP_TABLE_BYTES
+
+    def _dp_accepts(self, weight):
+        """Tells whether a weight is a non-negative integer at the table's scale."""
+        scaled = weight * self._scale
+        return weight >= 0 and abs(scaled - round(scaled)) <= 1e-9 * self._scale
+
+    def _dp_fits_now(self):
+        return self._dp_fits(self._scale, max(self._capacity, self._width_capacity))
+
+    def _start_dp(self, scale):
+        self._engine = "dp"
+        self._scale = scale
+        self._width_capacity = max(self._capacity, 0)
+        self._rows = np.zeros((_spare_rows(self.item_count), self._width()))
+        self._dirty = 0
+
+    def _width(self):
+        return int(np.floor(self._width_capacity * self._scale + 1e-9)) + 1
+
+    def _update_table(self):
+        """Recomputes the rows of the items changed since the last solve."""
+        if self._capacity > self._width_capacity:
+            # Columns beyond the largest capacity seen were never computed
+            self._width_capacity = self._capacity
+            self._rows = np.zeros((self._rows.shape[0], self._width()))
+            self._dirty = 0
+        if self._rows.shape[0] < self.item_count + 1:
+            rows = np.zeros((_spare_rows(self.item_count), self._rows.shape[1]))
+            rows[:self._rows.shape[0]] = self._rows
+            self._rows = rows
+        width = self._rows.shape[1]
+        for i in range(self._dirty, self.item_count):
+            # rows[i + 1][c] = max(rows[i][c], rows[i][c - w] + v) for every capacity c >= w at once
+            previous, row = self._rows[i], self._rows[i + 1]
+            w, v = int(round(self._weights[i] * self._scale)), self._values[i]
+            row[:] = previous
+            if v > 0 and w < width:
+                np.maximum(previous[w:], previous[:width - w] + v, out=row[w:])
+        self._dirty = self.item_count
+
+    def _dp_selection(self):
+        """Walks the table backwards from the current capacity to recover the selected items."""
+        if self._capacity < 0:
+            return []
+        c = int(np.floor(self._capacity * self._scale + 1e-9))
+        selected = []
+        for i in range(self.item_count, 0, -1):
+            if self._rows[i, c] > self._rows[i - 1, c]:
+                selected.append(i - 1)
+                c -= int(round(self._weights[i - 1] * self._scale))
+        selected.reverse()
+        return selected
+
+    # Gurobi engine
+
+    def _start_model(self):
+        self._engine = "gurobi"
+        self._rows = None
+        self.m = Model("knapsack_session", env=self._env)
+        self.m.ModelSense = GRB.MAXIMIZE
+        self._vars = list(self.m.addVars(self.item_count, vtype=GRB.BINARY, obj=self._values).values())
+        self._constr = self.m.addLConstr(LinExpr(self._weights, self._vars), GRB.LESS_EQUAL, self._capacity,
+                                         name="Capacity")
+        self.m.update()
+        self._start = None
+
+    def _fall_back(self):
+        """Leaves the DP engine for Gurobi (or branch-and-bound without gurobipy)."""
+        if Model is not None:
+            self._start_model()
+        else:
+            self._engine = "bnb"
+            self._rows = None
+
+
+def _spare_rows(item_count):
+    """Rows allocated for a DP table of item_count items, with room for some more."""
+    return item_count + item_count // 8 + 65
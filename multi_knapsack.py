@@ -0,0 +1,293 @@
+"""
+Multidimensional and multi-objective 0/1 knapsacks.
+
+A multidimensional knapsack has several capacities (weight, volume, budget, ...): the
+weights are a D x n matrix with one row per capacity. With several objectives (a K x n
+matrix of item values) there is no single optimum, and pareto_front enumerates the
+efficient frontier with the epsilon-constraint method:
+
+    maximize    objectives[0] @ x, then objectives[1] @ x, ... (lexicographically)
+    subject to  weights @ x <= capacities
+                objectives[k] @ x >= epsilon[k]          for k = 1 .. K-1
+
+over a grid of epsilon bounds. The lexicographic order makes every solution efficient
+rather than only weakly efficient.
+"""
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+import solve_stats
+from solve_result import SolveResult
+
+try:
+    from gurobipy import Model, GRB, GurobiError
+except ImportError:
+    Model = GRB = GurobiError = None
+
+
+def _as_matrix(values, columns):
+    """Returns values as a 2-D float array (or CSR matrix) with the given number of columns."""
+    if sp.issparse(values):
+        return sp.csr_matrix(values, dtype=float)
+    return np.asarray(values, dtype=float).reshape(-1, columns)
+
+
+class MultiKnapsackModel:
+    """
+    A multidimensional, multi-objective knapsack kept alive between solves.
+
+    Only the epsilon bounds and the objective priorities change between solves, so
+    each re-solve touches nothing else and starts from the previous selection.
+
+    Args:
+        capacities: The D capacities.
+        objectives: The item values, one row per objective (a single row is allowed).
+        weights: D x n matrix (NumPy or SciPy sparse) of item weights, one row per capacity.
+        env: Optional Gurobi environment to build the model in.
+    """
+
+    def __init__(self, capacities, objectives, weights, env=None):
+        self.objectives = np.atleast_2d(np.asarray(objectives, dtype=float))
+        count = self.objectives.shape[1]
+        self.m = Model("multi_knapsack", env=env)
+        self.m.ModelSense = GRB.MAXIMIZE
+        self._x = self.m.addMVar(count, vtype=GRB.BINARY, name="x")
+        self.m.addMConstr(_as_matrix(weights, count), self._x, GRB.LESS_EQUAL,
+                          np.atleast_1d(np.asarray(capacities, dtype=float)), name="capacity")
+        # Epsilon bounds of the secondary objectives, inactive until set_bounds
+        self._bounds = self.m.addMConstr(self.objectives[1:], self._x, GRB.GREATER_EQUAL,
+                                         np.full(len(self.objectives) - 1, -np.inf), name="epsilon")
+        self.set_priority(0)
+        self.selected = None
+        self._budgeted = False
+
+    def set_priority(self, first):
+        """Optimizes objective first, then the others in order."""
+        count = len(self.objectives)
+        if count == 1:
+            self._x.Obj = self.objectives[0]
+            return
+        self.m.NumObj = count
+        for k in range(count):
+            self.m.Params.ObjNumber = k
+            self._x.ObjN = self.objectives[k]
+            self.m.ObjNPriority = count if k == first else count - 1 - k
+
+    def set_bounds(self, epsilon):
+        """Sets the lower bounds of objectives 1 .. K-1 (-inf leaves one free)."""
+        self.m.setAttr("RHS", self._bounds.tolist(), list(epsilon))
+
+    def set_budget(self, time_limit=None, gap=None):
+        """Stops each solve after time_limit seconds or at the given relative gap."""
+        if time_limit is not None:
+            self.m.Params.TimeLimit = time_limit
+        if gap is not None:
+            self.m.Params.MIPGap = gap
+        self._budgeted = self._budgeted or time_limit is not None or gap is not None
+
+    def solve(self, callback=None):
+        """
+        Re-optimizes the model, warm-started from the previous selection.
+
+        Returns:
+            The 0/1 selection as a float array, or None if the model has no solution.
+        """
+        if self.selected is not None:
+            self._x.Start = self.selected
+        self.m.optimize(callback)
+        if self.m.status == GRB.OPTIMAL or (self._budgeted and self.m.SolCount > 0):
+            self.selected = np.round(self._x.X)
+        else:
+            self.selected = None
+        return self.selected
+
+    def dispose(self):
+        """Frees the underlying Gurobi model."""
+        self.m.dispose()
+
+
+def solve_multidimensional(capacities, values, weights, engine="auto", env=None, callback=None, time_limit=None,
+                           gap=None):
+    """
+    Solves a knapsack with several capacities; see optimization_solver.solve_knapsack.
+
+    Args:
+        capacities: The D capacities.
+        values: The n item values.
+        weights: D x n matrix (NumPy, nested lists or SciPy sparse) of item weights.
+        engine: "auto" or "gurobi" use Gurobi, "bnb" the in-house branch-and-bound
+            (also used without gurobipy or a usable license).
+        env: Optional Gurobi environment to build the model in.
+        callback: Optional Gurobi callback passed to optimize.
+        time_limit: Optional time budget (in seconds) of the Gurobi solve.
+        gap: Optional relative gap at which the Gurobi solve stops.
+
+    Returns:
+        A SolveResult of the knapsack (selected items, total value and solve time).
+    """
+    start = time.perf_counter()
+    values = np.asarray(values, dtype=float)
+    with solve_stats.phase("parse"):
+        weights = _as_matrix(weights, len(values))
+        capacities = np.atleast_1d(np.asarray(capacities, dtype=float))
+    if engine not in ("auto", "gurobi", "bnb"):
+        raise ValueError(f"Unknown multidimensional knapsack engine: {engine}")
+
+    if engine != "bnb" and Model is not None:
+        try:
+            with solve_stats.phase("build"):
+                model = MultiKnapsackModel(capacities, values, weights, env=env)
+                model.set_budget(time_limit, gap)
+                model.m.update()
+            try:
+                with solve_stats.phase("optimize"):
+                    selected = model.solve(callback)
+                solve_stats.record_model(model.m)
+                if selected is None:
+                    return SolveResult("knapsack", np.zeros(len(values)), 0.0, solved=False)
+                return SolveResult("knapsack", selected, model.m.objVal, runtime=model.m.Runtime)
+            finally:
+                model.dispose()
+        except GurobiError:
+            if engine == "gurobi":
+                raise
+
+    # In-house branch-and-bound on min -values x subject to weights x <= capacities, 0 <= x <= 1
+    from native_solver import solve_ip
+
+    solve_stats.record(backend="native")
+    with solve_stats.phase("optimize"):
+        solution = solve_ip(-values, weights, capacities, np.zeros(len(values)), np.ones(len(values)))
+    if solution is None:
+        return SolveResult("knapsack", np.zeros(len(values)), 0.0, solved=False)
+    solve_stats.record(objective=-solution[1], bound=-solution[2])
+    return SolveResult("knapsack", solution[0], -solution[1], runtime=time.perf_counter() - start)
+
+
+def pareto_front(capacities, objectives, weights, points=10, processes=1, time_limit=None):
+    """
+    Computes the efficient frontier of a multi-objective, multidimensional knapsack.
+
+    The best value of each secondary objective is first found from the payoff table
+    (objective k optimized first, for every k). The low end of its range is the nadir
+    from the same table with two objectives, and the lowest value any selection can
+    have with more. Each secondary objective's bound then takes points values over
+    that range, and the grid of bounds is split into contiguous runs, one per worker; each worker keeps one warm
+    model and only changes the bound right-hand sides between solves. Within a run the
+    bounds only tighten, so a point is pruned without a solve whenever the previous
+    solution still meets the new bounds (it remains optimal) or the previous bounds
+    were already infeasible. Frontier points found more than once are kept once.
+
+    Args:
+        capacities: The D capacities.
+        objectives: K x n matrix of item values, one row per objective (K >= 2).
+        weights: D x n matrix (NumPy or SciPy sparse) of item weights.
+        points: Number of bound values per secondary objective, so up to
+            points ** (K - 1) solves. With integer values, points above the range of
+            every secondary objective give the complete front.
+        processes: Number of worker processes used for the grid.
+        time_limit: Optional time budget (in seconds) of each solve.
+
+    Returns:
+        A dictionary of arrays with one row per frontier point, sorted by decreasing
+        first objective:
+            - 'objectives': the K objective values.
+            - 'selected': the 0/1 item selection.
+            - 'epsilon': the bounds of objectives 1 .. K-1 the point was found at.
+            - 'runtime': the wall-clock time (in seconds) of the solve that found it.
+        It also holds 'solves', the number of solves run, and 'pruned', the number of
+        grid points settled without a solve.
+    """
+    from optimization_solver import _quiet_env
+
+    objectives = np.atleast_2d(np.asarray(objectives, dtype=float))
+    if len(objectives) < 2:
+        raise ValueError("A Pareto front needs at least two objectives.")
+
+    # Payoff table: the value of every objective when objective k is optimized first
+    payoff = []
+    with _quiet_env() as env:
+        model = MultiKnapsackModel(capacities, objectives, weights, env=env)
+        model.set_budget(time_limit)
+        for k in range(len(objectives)):
+            model.set_priority(k)
+            selected = model.solve()
+            if selected is None:
+                model.dispose()
+                raise ValueError("The knapsack has no feasible selection.")
+            payoff.append(objectives @ selected)
+        model.dispose()
+    payoff = np.array(payoff)
+
+    # Each bound runs up to the objective's best value. With two objectives the worst value in the payoff
+    # table is the nadir; with more, efficient points can lie below every value in the table, so the bound
+    # starts at the lowest value any selection can have
+    if len(objectives) == 2:
+        lowest = [payoff[:, 1].min()]
+    else:
+        lowest = np.minimum(objectives[1:], 0).sum(axis=1)
+    axes = [np.linspace(lowest[k - 1], payoff[k, k], points) for k in range(1, len(objectives))]
+    grid = np.array(list(itertools.product(*axes)))
+    runs = [run for run in np.array_split(np.arange(len(grid)), processes) if len(run)]
+    # Parallel workers run one Gurobi thread each so they do not compete for the cores
+    threads = 1 if processes > 1 else 0
+    args = [(capacities, objectives, weights, grid[run], time_limit, threads) for run in runs]
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = list(executor.map(_front_run, *zip(*args)))
+    else:
+        parts = [_front_run(*a) for a in args]
+
+    found = {}
+    solves = 0
+    for part, count in parts:
+        solves += count
+        for epsilon, selected, runtime in part:
+            key = tuple(selected.astype(bool))
+            if key not in found:
+                found[key] = (epsilon, selected, runtime)
+    rows = list(found.values())
+    values = np.array([objectives @ selected for _, selected, _ in rows]).reshape(-1, len(objectives))
+    order = np.lexsort(values.T[::-1] * -1)
+    return {
+        'objectives': values[order],
+        'selected': np.array([selected for _, selected, _ in rows]).reshape(-1, objectives.shape[1])[order],
+        'epsilon': np.array([epsilon for epsilon, _, _ in rows]).reshape(-1, len(objectives) - 1)[order],
+        'runtime': np.array([runtime for _, _, runtime in rows])[order],
+        'solves': solves,
+        'pruned': len(grid) - solves,
+    }
+
+
+def _front_run(capacities, objectives, weights, bounds, time_limit, threads):
+    """Solves a run of epsilon bounds on one warm model; returns the points found and the solve count."""
+    from optimization_solver import _quiet_env
+
+    found = []
+    solves = 0
+    previous, selected = None, None
+    with _quiet_env() as env:
+        env.setParam("Threads", threads)
+        model = MultiKnapsackModel(capacities, objectives, weights, env=env)
+        model.set_budget(time_limit)
+        for epsilon in bounds:
+            tightened = previous is not None and np.all(epsilon >= previous)
+            if tightened and selected is None:
+                previous = epsilon
+                continue  # Tighter bounds than infeasible ones are infeasible too
+            if tightened and np.all(objectives[1:] @ selected >= epsilon - 1e-9):
+                previous = epsilon
+                continue  # The previous point still qualifies, so it is still optimal
+            model.set_bounds(epsilon)
+            start = time.perf_counter()
+            selected = model.solve()
+            solves += 1
+            if selected is not None:
+                found.append((epsilon, selected, time.perf_counter() - start))
+            previous = epsilon
+        model.dispose()
+    return found, solves
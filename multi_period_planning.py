@@ -0,0 +1,155 @@
+"""
+Multi-period, multi-resource production planning for thousands of products.
+
+Products, resources and periods are held as arrays: usage is an R x P (SciPy sparse or
+dense) matrix of resource use per unit produced, and every per-product or per-resource
+quantity is an array with one row per product or resource and one column per period
+(1-D arrays apply to every period). The model is
+
+    maximize    sum(price * sales) - sum(production_cost * production) - sum(holding_cost * inventory)
+    subject to  usage @ production[:, t] <= capacity[:, t]                    for every period t
+                inventory[:, t] = inventory[:, t-1] + production[:, t] - sales[:, t]
+                min_production <= production,  0 <= sales <= demand,  0 <= inventory <= max_inventory
+
+where the inventory before the first period is initial_inventory. All constraints are assembled as sparse blocks
+and added with two matrix calls, so models with 10^5+ variables build in seconds.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+import solve_stats
+from solve_stats import instrumented
+
+try:
+    from gurobipy import Model, GRB
+except ImportError:
+    Model = GRB = None
+
+
+def _per_period(values, rows, periods):
+    """Broadcasts a scalar, a length-rows vector or a rows x periods array to rows x periods."""
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return np.broadcast_to(values, (rows, periods))
+
+
+def _vec(values):
+    """Flattens a rows x periods array period by period, matching the variable layout."""
+    return np.ravel(values, order="F")
+
+
+def build_multi_period_model(usage, capacity, price, periods=1, demand=np.inf, production_cost=0.0,
+                             holding_cost=0.0, initial_inventory=0.0, min_production=0.0, max_inventory=np.inf,
+                             integer=False, env=None):
+    """
+    Builds the multi-period production planning model.
+
+    Args:
+        usage: R x P matrix (SciPy sparse or dense) of each resource used per unit of each product.
+        capacity: Resource availability per period (R, or R x periods).
+        price: Revenue per unit sold (P, or P x periods).
+        periods: Number of periods of the horizon.
+        demand: Maximum sales per period (P, or P x periods); unlimited by default.
+        production_cost: Cost per unit produced (P, or P x periods).
+        holding_cost: Cost per unit held in inventory at the end of a period (P, or P x periods).
+        initial_inventory: Inventory of each product before the first period (P).
+        min_production: Minimum production per period (P, or P x periods).
+        max_inventory: Inventory capacity of each product (P, or P x periods).
+        integer: If True, production and sales are integer; by default the plan is an LP.
+        env: Optional Gurobi environment to build the model in.
+
+    Returns:
+        A tuple (model, production, sales, inventory) where the last three are MVars of
+        size P * periods, laid out period by period.
+    """
+    usage = sp.csr_matrix(usage, dtype=float)
+    resources, products = usage.shape
+    size = products * periods
+
+    m = Model("multi_period_planning", env=env)
+    m.ModelSense = GRB.MAXIMIZE
+
+    # One MVar holding the production, sales and inventory blocks, so the balance rows are a single matrix constraint
+    def block(values, rows=products):
+        return _vec(_per_period(values, rows, periods))
+
+    zeros, unbounded = np.zeros(size), np.full(size, np.inf)
+    plan = m.addMVar(
+        3 * size,
+        lb=np.concatenate([block(min_production), zeros, zeros]),
+        ub=np.concatenate([unbounded, block(demand), block(max_inventory)]),
+        obj=np.concatenate([-block(production_cost), block(price), -block(holding_cost)]),
+        vtype=np.repeat([GRB.INTEGER if integer else GRB.CONTINUOUS, GRB.CONTINUOUS], [2 * size, size]),
+    )
+    production, sales, inventory = plan[:size], plan[size:2 * size], plan[2 * size:]
+
+    # Resource capacity: one block of usage per period
+    m.addMConstr(sp.kron(sp.identity(periods, format="csr"), usage, format="csr"), production, GRB.LESS_EQUAL,
+                 block(capacity, resources), name="capacity")
+
+    # Inventory balance: stock_t - stock_{t-1} - produce_t + sell_t = initial inventory (t = 0) or 0
+    identity = sp.identity(size, format="csr")
+    carry = sp.eye(size, k=-products, format="csr")
+    rhs = np.zeros(size)
+    rhs[:products] = np.broadcast_to(np.asarray(initial_inventory, dtype=float), products)
+    m.addMConstr(sp.hstack([-identity, identity, identity - carry], format="csr"), plan, GRB.EQUAL, rhs,
+                 name="balance")
+    return m, production, sales, inventory
+
+
+@instrumented("multi_period_planning", "gurobi")
+def solve_multi_period_planning(usage, capacity, price, periods=1, env=None, callback=None, **options):
+    """
+    Solves the multi-period production planning problem.
+
+    Args:
+        usage, capacity, price, periods: See build_multi_period_model.
+        env: Optional Gurobi environment to build the model in.
+        callback: Optional Gurobi callback passed to optimize.
+        **options: The optional arguments of build_multi_period_model (demand, costs,
+            inventory and integrality).
+        return_stats: If True, return (result, SolveStats) instead (see solve_stats).
+
+    Returns:
+        A dictionary with the P x periods arrays 'production', 'sales' and 'inventory',
+        the R x periods array 'resource_usage' and the 'total_profit', or None if no
+        optimal plan was found.
+    """
+    with solve_stats.phase("build"):
+        m, production, sales, inventory = build_multi_period_model(usage, capacity, price, periods, env=env, **options)
+        m.update()
+
+    with solve_stats.phase("optimize"):
+        m.optimize(callback)
+    solve_stats.record_model(m)
+
+    if m.status != GRB.OPTIMAL:
+        return None
+    with solve_stats.phase("extract"):
+        shape = (-1, periods)
+        plan = {
+            'production': production.X.reshape(shape, order="F"),
+            'sales': sales.X.reshape(shape, order="F"),
+            'inventory': inventory.X.reshape(shape, order="F"),
+        }
+        plan['resource_usage'] = sp.csr_matrix(usage, dtype=float) @ plan['production']
+        plan['total_profit'] = m.objVal
+    return plan
+
+
+def from_products(labor_avail, materials_avail, products):
+    """
+    Converts a solve_production_planning instance into multi-period arrays (one period).
+
+    Returns:
+        A tuple (kwargs, names): the keyword arguments of solve_multi_period_planning and
+        the product names, in column order.
+    """
+    kwargs = {
+        'usage': np.array([[p['labor'] for p in products], [p['materials'] for p in products]], dtype=float),
+        'capacity': np.array([labor_avail, materials_avail], dtype=float),
+        'price': np.array([p['profit'] for p in products], dtype=float),
+        'min_production': np.array([p['min_production'] for p in products], dtype=float),
+    }
+    return kwargs, [p['name'] for p in products]
@@ -0,0 +1,274 @@
+"""
+In-house engine for the three problem types, using only NumPy.
+
+Knapsacks go to the DP / branch-and-bound engines of knapsack_engine. Diet and
+production planning are small integer programs (three or two constraints), solved by
+depth-first branch-and-bound over LP relaxations computed with a dense two-phase
+simplex. Each function has the signature and return value of its optimization_solver
+counterpart.
+"""
+import warnings
+
+import numpy as np
+
+import solve_stats
+from knapsack_engine import choose_knapsack_engine, solve_knapsack_bnb, solve_knapsack_dp
+from solve_modes import relative_gap
+from solve_result import returns_result
+from solve_stats import instrumented
+
+TOL = 1e-9
+INT_TOL = 1e-6
+
+# Node budget of the integer branch-and-bound.
+MAX_NODES = 100_000
+
+
+class Unbounded(Exception):
+    """Raised when an LP relaxation is unbounded."""
+
+
+def _pivot(T, obj, basis, p, j):
+    T[p] /= T[p, j]
+    col = T[:, j].copy()
+    col[p] = 0.0
+    T -= np.outer(col, T[p])
+    obj -= obj[j] * T[p]
+    basis[p] = j
+
+
+def _simplex(T, obj, basis, columns):
+    """Runs primal simplex iterations on the tableau until the reduced costs are non-negative."""
+    degenerate = 0
+    while True:
+        reduced = obj[:columns]
+        if degenerate > 50:
+            # Bland's rule once the search stalls, to rule out cycling
+            candidates = np.flatnonzero(reduced < -TOL)
+            if len(candidates) == 0:
+                return
+            j = candidates[0]
+        else:
+            j = int(np.argmin(reduced))
+            if reduced[j] >= -TOL:
+                return
+        col = T[:, j]
+        positive = col > TOL
+        if not positive.any():
+            raise Unbounded()
+        ratios = np.full(len(col), np.inf)
+        ratios[positive] = T[positive, -1] / col[positive]
+        best = ratios.min()
+        ties = np.flatnonzero(ratios <= best + TOL)
+        p = ties[np.argmin(basis[ties])]
+        degenerate = degenerate + 1 if best <= TOL else 0
+        _pivot(T, obj, basis, p, j)
+
+
+def solve_lp(c, A, b):
+    """
+    Solves min c x subject to A x <= b, x >= 0 with a dense two-phase simplex.
+
+    Returns:
+        The optimal x, or None if the problem is infeasible. Raises Unbounded if the
+        objective is unbounded.
+    """
+    m, n = A.shape
+    sign = np.where(b < 0, -1.0, 1.0)
+    needs_artificial = np.flatnonzero(sign < 0)
+    k = len(needs_artificial)
+
+    T = np.zeros((m, n + m + k + 1))
+    T[:, :n] = A * sign[:, None]
+    T[np.arange(m), n + np.arange(m)] = sign
+    T[needs_artificial, n + m + np.arange(k)] = 1.0
+    T[:, -1] = b * sign
+    basis = n + np.arange(m)
+    basis[needs_artificial] = n + m + np.arange(k)
+
+    if k:
+        # Phase 1: minimize the sum of the artificials
+        obj = np.zeros(n + m + k + 1)
+        obj[n + m:n + m + k] = 1.0
+        obj -= T[needs_artificial].sum(axis=0)
+        _simplex(T, obj, basis, n + m + k)
+        if -obj[-1] > 1e-7 * max(1.0, np.abs(b).max()):
+            return None
+        # Drive the remaining (zero-valued) artificials out of the basis, dropping redundant rows
+        keep = np.ones(m, dtype=bool)
+        for p in np.flatnonzero(basis >= n + m):
+            candidates = np.flatnonzero(np.abs(T[p, :n + m]) > TOL)
+            if len(candidates):
+                _pivot(T, obj, basis, p, candidates[0])
+            else:
+                keep[p] = False
+        T = np.delete(T[keep], np.s_[n + m:n + m + k], axis=1)
+        basis = basis[keep]
+
+    # Phase 2: the original objective, expressed in terms of the current basis
+    obj = np.zeros(n + m + 1)
+    obj[:n] = c
+    obj -= obj[basis] @ T
+    _simplex(T, obj, basis, n + m)
+
+    x = np.zeros(n + m)
+    x[basis] = T[:, -1]
+    return x[:n]
+
+
+def _solve_bounded_lp(c, A, b, lb, ub):
+    """Solves min c x subject to A x <= b, lb <= x <= ub by shifting x to x - lb."""
+    if np.any(ub < lb - TOL):
+        return None
+    finite = np.flatnonzero(np.isfinite(ub))
+    rows = np.zeros((len(finite), len(c)))
+    rows[np.arange(len(finite)), finite] = 1.0
+    y = solve_lp(c, np.vstack([A, rows]), np.concatenate([b - A @ lb, ub[finite] - lb[finite]]))
+    return None if y is None else lb + y
+
+
+def solve_ip(c, A, b, lb, ub=None, max_nodes=MAX_NODES):
+    """
+    Solves min c x subject to A x <= b, lb <= x <= ub, x integer by branch-and-bound.
+
+    Nodes are explored depth-first, branching on the most fractional variable; at every
+    node the floor and ceiling of the LP solution are tried as incumbents.
+
+    Args:
+        c: Objective coefficients.
+        A: Constraint matrix (dense or SciPy sparse).
+        b: Constraint right-hand sides.
+        lb: Lower bounds of the variables (finite).
+        ub: Optional upper bounds of the variables.
+        max_nodes: Node budget; the best incumbent is returned when it runs out.
+
+    Returns:
+        A tuple (x, objective, bound) for the best solution found, or None if there is
+        none. bound is the proven lower bound on the optimum: it equals objective when
+        the search finished, and is lower when the node budget cut it short.
+        Raises Unbounded if the relaxation is unbounded.
+    """
+    c = np.asarray(c, dtype=float)
+    b = np.asarray(b, dtype=float)
+    A = A.toarray() if hasattr(A, "toarray") else np.asarray(A, dtype=float).reshape(len(b), len(c))
+    lb = np.ceil(np.asarray(lb, dtype=float) - INT_TOL)
+    ub = np.full(len(c), np.inf) if ub is None else np.floor(np.asarray(ub, dtype=float) + INT_TOL)
+
+    def feasible(x):
+        return np.all(A @ x <= b + 1e-7 * np.maximum(1.0, np.abs(b))) and np.all(x >= lb) and np.all(x <= ub)
+
+    best_x, best_value = None, np.inf
+    # Each open node carries the LP value of its parent, a lower bound on its subtree
+    stack = [(lb, ub, -np.inf)]
+    nodes = 0
+    while stack and nodes < max_nodes:
+        nodes += 1
+        node_lb, node_ub, _ = stack.pop()
+        x = _solve_bounded_lp(c, A, b, node_lb, node_ub)
+        if x is None:
+            continue
+        value = c @ x
+        if value >= best_value - 1e-9 * max(1.0, abs(best_value)):
+            continue
+        frac = np.abs(x - np.round(x))
+        if frac.max(initial=0.0) <= INT_TOL:
+            best_x = np.round(x) + 0.0  # + 0.0 turns -0.0 into 0.0
+            best_value = c @ best_x
+            continue
+        for candidate in (np.floor(x + INT_TOL), np.ceil(x - INT_TOL)):
+            candidate = np.clip(candidate, node_lb, node_ub)
+            if c @ candidate < best_value and feasible(candidate):
+                best_x, best_value = candidate, c @ candidate
+
+        j = int(np.argmax(frac))
+        down_ub, up_lb = node_ub.copy(), node_lb.copy()
+        down_ub[j], up_lb[j] = np.floor(x[j]), np.ceil(x[j])
+        # Explore the branch nearer to the LP value first
+        if x[j] - np.floor(x[j]) < 0.5:
+            stack += [(up_lb, node_ub, value), (node_lb, down_ub, value)]
+        else:
+            stack += [(node_lb, down_ub, value), (up_lb, node_ub, value)]
+
+    bound = min([best_value] + [parent for _, _, parent in stack])
+    if solve_stats.current() is not None:
+        solve_stats.record(
+            num_vars=len(c), num_constrs=len(b), num_nonzeros=int(np.count_nonzero(A)), node_count=nodes,
+            mip_gap=relative_gap(best_value, bound) if best_x is not None else None
+        )
+    if best_x is None:
+        return None
+    return best_x, float(best_value), float(bound)
+
+
+def _warn_if_truncated(objective, bound):
+    """Warns that the node budget ran out before the solution was proven optimal."""
+    if bound < objective:
+        warnings.warn(f"Node limit of {MAX_NODES} reached: the solution may not be optimal "
+                      f"(relative gap {relative_gap(objective, bound):.2%}).", RuntimeWarning, stacklevel=3)
+
+
+@instrumented("diet", "native")
+@returns_result("diet")
+def solve_diet(calories_needed, protein_needed, fat_needed, food_calories, food_protein, food_fat, food_cost):
+    """In-house solve_diet; see optimization_solver.solve_diet."""
+    with solve_stats.phase("parse"):
+        nutrients = np.array([food_calories, food_protein, food_fat], dtype=float).reshape(3, -1)
+        requirements = np.array([calories_needed, protein_needed, fat_needed], dtype=float)
+    try:
+        with solve_stats.phase("optimize"):
+            result = solve_ip(food_cost, -nutrients, -requirements, np.zeros(nutrients.shape[1]))
+    except Unbounded:
+        result = None
+    if result is None:
+        return [0] * nutrients.shape[1], 0
+    x, total_cost, bound = result
+    solve_stats.record(objective=total_cost, bound=bound)
+    _warn_if_truncated(total_cost, bound)
+    return x.tolist(), total_cost
+
+
+@instrumented("production_planning", "native")
+@returns_result("production_planning")
+def solve_production_planning(labor_avail, materials_avail, products):
+    """In-house solve_production_planning; see optimization_solver.solve_production_planning."""
+    with solve_stats.phase("parse"):
+        requirements = np.array([[p['labor'] for p in products], [p['materials'] for p in products]], dtype=float)
+        profit = np.array([p['profit'] for p in products], dtype=float)
+        lb = np.maximum([p['min_production'] for p in products], 0.0)
+    try:
+        with solve_stats.phase("optimize"):
+            result = solve_ip(-profit, requirements, [labor_avail, materials_avail], lb)
+    except Unbounded:
+        result = None
+    if result is None:
+        return None
+    x, value, bound = result
+    solve_stats.record(objective=-value, bound=-bound)
+    _warn_if_truncated(value, bound)
+    return {
+        'production_levels': {f"prod_{p['name']}": level for p, level in zip(products, x.tolist())},
+        'total_profit': -value
+    }
+
+
+@instrumented("knapsack", "native")
+@returns_result("knapsack")
+def solve_knapsack(capacity, values, weights):
+    """In-house solve_knapsack; see optimization_solver.solve_knapsack."""
+    if capacity < 0:
+        return [], 0, 0.0
+    with solve_stats.phase("parse"):
+        weights_array = np.asarray(weights, dtype=float)
+        engine, scale = choose_knapsack_engine(
+            capacity, np.asarray(values, dtype=float), weights_array, gurobi_available=False
+        )
+    with solve_stats.phase("optimize"):
+        if engine == "dp":
+            result = solve_knapsack_dp(capacity, values, weights, scale)
+        else:
+            result = solve_knapsack_bnb(capacity, values, weights)
+    solve_stats.record(
+        backend=engine, num_vars=len(weights_array), num_constrs=1,
+        num_nonzeros=int(np.count_nonzero(weights_array)), mip_gap=0.0
+    )
+    return result
@@ -0,0 +1,186 @@
+"""
+Headless JSON-lines runner for the optimization_solver functions.
+
+Each input line is one instance: a JSON object with a "problem" ("diet", "knapsack"
+or "production_planning"), the keyword arguments of the matching solve function and
+an optional "id". Each output line holds the id, the problem and either the named
+result fields or an "error".
+
+    python -m optimization_cli instances.jsonl --jobs 4 > results.jsonl
+    echo '{"problem": "knapsack", "capacity": 10, "values": [3, 4], "weights": [6, 5]}' | python -m optimization_cli
+"""
+import argparse
+import json
+import sys
+from collections import deque
+
+# Names given to the parts of each solver's return value in the output.
+RESULT_FIELDS = {
+    "diet": ("amounts", "total_cost"),
+    "knapsack": ("selected_items", "total_value", "runtime"),
+    "production_planning": None,  # Already a dictionary (or None)
+}
+
+
+def parse_instance(line, default_problem=None):
+    """
+    Parses one input line.
+
+    Returns:
+        A tuple (id, problem, kwargs).
+    """
+    data = json.loads(line)
+    instance_id = data.pop("id", None)
+    problem = data.pop("problem", default_problem)
+    if problem not in RESULT_FIELDS:
+        raise ValueError(f"Unknown problem: {problem}")
+    return instance_id, problem, data
+
+
+def format_result(problem, result):
+    """Turns a solver's return value into a JSON-friendly dictionary."""
+    fields = RESULT_FIELDS[problem]
+    if fields is None:
+        return {'result': result}
+    return {'result': dict(zip(fields, result))}
+
+
+class _LocalSolver:
+    """Solves in this process, in a quiet Gurobi environment started on first use."""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.env = None
+
+    def __call__(self, problem, kwargs):
+        import optimization_solver
+
+        solve = getattr(optimization_solver, f"solve_{problem}")
+        if self.backend is not None:
+            import solver_backends
+
+            solve = solver_backends.select(problem, (), kwargs, self.backend)
+            if not solver_backends.accepts(solve, "env"):
+                return solve(**kwargs)
+
+        if self.env is None and optimization_solver.Env is not None:
+            # Gurobi's log would otherwise be interleaved with the JSON lines on stdout
+            self.env = optimization_solver._quiet_env()
+        return solve(env=self.env, **kwargs)
+
+    def close(self):
+        if self.env is not None:
+            self.env.dispose()
+
+
+def run(lines, out, jobs=1, max_in_flight=None, default_problem=None, backend=None, stats=False):
+    """
+    Solves the instances read from lines and writes one JSON line per instance to out.
+
+    Results are written in input order. With jobs > 1 the instances are solved by a
+    SolverPool and at most max_in_flight of them are queued at any time, so input is
+    only read as fast as the workers keep up.
+
+    Args:
+        lines: An iterable of JSON lines.
+        out: A text stream for the results.
+        jobs: Number of worker processes (1 solves in this process).
+        max_in_flight: Bound on queued instances (defaults to 2 * jobs).
+        default_problem: Problem used for lines without a "problem" key.
+        backend: Optional solver_backends name (or "auto"); by default the
+            optimization_solver functions are used.
+        stats: If True, add each solve's SolveStats (see solve_stats) to its output line.
+
+    Returns:
+        The number of instances that failed.
+    """
+    failures = 0
+
+    def emit(instance_id, problem, result=None, error=None):
+        nonlocal failures
+        record = {'id': instance_id, 'problem': problem}
+        if error is not None:
+            failures += 1
+            record['error'] = error
+        else:
+            if stats:
+                result, solve_stats = result
+                record['stats'] = solve_stats.as_dict()
+            record.update(format_result(problem, result))
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    pool = local = None
+    if jobs > 1:
+        from solver_pool import SolverPool
+
+        pool = SolverPool(processes=jobs, backend=backend)
+    else:
+        local = _LocalSolver(backend)
+    max_in_flight = max_in_flight or 2 * jobs
+    pending = deque()
+
+    def drain(limit):
+        while len(pending) > limit:
+            instance_id, problem, future = pending.popleft()
+            try:
+                emit(instance_id, problem, future.result())
+            except Exception as e:
+                emit(instance_id, problem, error=str(e))
+
+    try:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                instance_id, problem, kwargs = parse_instance(line, default_problem)
+            except (ValueError, AttributeError) as e:
+                drain(0)
+                emit(number, None, error=f"line {number}: {e}")
+                continue
+            if instance_id is None:
+                instance_id = number
+            if stats:
+                kwargs['return_stats'] = True
+            if pool is None:
+                try:
+                    emit(instance_id, problem, local(problem, kwargs))
+                except Exception as e:
+                    emit(instance_id, problem, error=str(e))
+            else:
+                pending.append((instance_id, problem, pool.submit(problem, **kwargs)))
+                drain(max_in_flight)
+        drain(0)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        else:
+            local.close()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m optimization_cli", description=__doc__.splitlines()[1])
+    parser.add_argument("input", nargs="?", default="-", help="JSON-lines file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes")
+    parser.add_argument("--max-in-flight", type=int, help="instances queued at once (default: 2 * jobs)")
+    parser.add_argument("--problem", choices=sorted(RESULT_FIELDS), help="problem for lines without one")
+    parser.add_argument("--backend", help="solver backend: auto, gurobi, highs or native (default: optimization_solver)")
+    parser.add_argument("--stats", action="store_true", help="add per-phase timings and model sizes to each line")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        failures = run(src, out, args.jobs, args.max_in_flight, args.problem, args.backend, args.stats)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,50 @@
-from gurobipy import Model, GRB
-from gurobipy import quicksum
+import inspect
+import time
+from contextlib import nullcontext
 
-def solve_diet(calories_needed, protein_needed, fat_needed, food_calories, food_protein, food_fat, food_cost):
+import numpy as np
+
+try:
+    from gurobipy import Env, Model, GRB, GurobiError, LinExpr
+except ImportError:  # The knapsack engines below still work without Gurobi
+    Env = Model = GRB = GurobiError = LinExpr = None
+
+from knapsack_engine import (
+    choose_knapsack_engine, integer_scale, solve_knapsack_bnb, solve_knapsack_dp, solve_knapsack_dp_batch,
+    BNB_NODE_LIMIT, WEIGHT_SCALES
+)
+import solve_stats
+from solve_modes import (
+    SOLVE_MODES, diet_greedy, diet_round, knapsack_greedy, knapsack_relaxed, relative_gap
+)
+from solve_result import SolveResult, returns_result
+from solve_stats import instrumented
+
+DIET_ARGS = ("calories_needed", "protein_needed", "fat_needed", "food_calories", "food_protein", "food_fat", "food_cost")
+PRODUCTION_PLANNING_ARGS = ("labor_avail", "materials_avail", "products")
+KNAPSACK_ARGS = ("capacity", "values", "weights")
+
+NUTRIENTS = ("Calories", "Protein", "Fat")
+RESOURCES = ("Labor", "Materials")
+
+# Instances with more items than this are solved one by one instead of in the vectorized batch DP.
+DP_BATCH_MAX_ITEMS = 200
+
+@instrumented("diet", "gurobi")
+@returns_result("diet")
+def solve_diet(calories_needed, protein_needed, fat_needed, food_calories, food_protein, food_fat, food_cost, env=None,
+               callback=None, mode="exact", time_limit=None, gap=None):
   """
   This function solves a diet optimization problem.
 
+  The mode trades accuracy for latency (see solve_modes): "exact" solves the MIP,
+  "relaxed" rounds the LP solution up, "heuristic" runs a greedy rule with local search
+  and "anytime" returns the best MIP solution found within time_limit or gap. The
+  proven gap of the answer is reported in its SolveStats.
+
+  Without gurobipy or a usable license, the MIP is solved by the HiGHS or native backend
+  instead (see solver_backends); env and callback are then ignored.
+
   Args:
       calories_needed: The number of calories needed per day.
       protein_needed: The amount of protein needed per day.
@@ -13,35 +53,157 @@ def solve_diet(calories_needed, protein_needed, fat_needed, food_calories, food_
       food_protein: A list of protein content per unit of food.
       food_fat: A list of fat content per unit of food.
       food_cost: A list of cost per unit of food.
+      env: Optional Gurobi environment to build the model in.
+      callback: Optional Gurobi callback passed to optimize (e.g. for progress or cancellation).
+      mode: "exact", "relaxed", "heuristic" or "anytime".
+      time_limit: Time budget (in seconds) of the "anytime" mode.
+      gap: Relative gap at which the "anytime" mode stops.
+      compact: If True, return a SolveResult holding the amounts as an array (see solve_result).
+      return_stats: If True, return (result, SolveStats) instead (see solve_stats).
 
   Returns:
       A tuple containing:
           - A list of amount to consume for each food item (decision variables).
           - The total cost of the diet (objective function).
   """
-  m = Model("diet")
-
-  # Decision variables
-  food_count = len(food_calories)
-  x = m.addVars(food_count, lb=0, vtype=GRB.INTEGER, name="x")  # Enforce non-negative integer amounts
+  if mode not in SOLVE_MODES:
+    raise ValueError(f"Unknown solve mode: {mode}")
+  with solve_stats.phase("parse"):
+    nutrients = np.array([food_calories, food_protein, food_fat], dtype=float).reshape(3, -1)
+    requirements = np.array([calories_needed, protein_needed, fat_needed], dtype=float)
+    food_cost = np.asarray(food_cost, dtype=float)
+  food_count = nutrients.shape[1]
 
-  # Objective function (Minimize total cost)
-  m.setObjective(sum(food_cost[i] * x[i] for i in range(food_count)), GRB.MINIMIZE)
+  if mode == "heuristic":
+    with solve_stats.phase("optimize"):
+      result = diet_greedy(requirements, nutrients, food_cost)
+    if result is None:
+      return [0] * food_count, 0
+    _record_fast_path("greedy", nutrients, result[1], result[2])
+    return result[0].tolist(), result[1]
+  if mode == "relaxed":
+    result = _solve_diet_relaxed(requirements, nutrients, food_cost, env)
+    if result is not None:
+      return result
+    # Rounding up only fails with negative nutrient contents: fall back to the MIP
+  if Model is None:
+    return _solve_without_gurobi("diet", calories_needed, protein_needed, fat_needed, food_calories, food_protein,
+                                 food_fat, food_cost)
 
-  # Constraints
-  m.addConstr(sum(food_calories[i] * x[i] for i in range(food_count)) >= calories_needed, "Calories")
-  m.addConstr(sum(food_protein[i] * x[i] for i in range(food_count)) >= protein_needed, "Protein")
-  m.addConstr(sum(food_fat[i] * x[i] for i in range(food_count)) >= fat_needed, "Fat")
+  try:
+    with solve_stats.phase("build"):
+      m, x = build_diet_model(requirements, nutrients, food_cost, env)
+      m.update()
+    if mode == "anytime":
+      _set_budget(m, time_limit, gap)
+      greedy = diet_greedy(requirements, nutrients, food_cost)
+      if greedy is not None:
+        x.Start = greedy[0]
 
-  # Solve model
-  m.optimize()
+    # Solve model
+    with solve_stats.phase("optimize"):
+      m.optimize(callback)
+  except GurobiError:
+    # No usable license, e.g. a size-limited one and a large instance
+    return _solve_without_gurobi("diet", calories_needed, protein_needed, fat_needed, food_calories, food_protein,
+                                 food_fat, food_cost)
+  solve_stats.record_model(m)
 
-  if m.status == GRB.OPTIMAL:
-    return [x[i].X for i in range(food_count)], m.objVal
+  if m.status == GRB.OPTIMAL or (mode == "anytime" and m.SolCount > 0):
+    with solve_stats.phase("extract"):
+      return SolveResult("diet", x.X, m.objVal)
   else:
     return [0] * food_count, 0
-  
-def solve_production_planning(labor_avail, materials_avail, products):
+
+
+def _solve_without_gurobi(problem, *args):
+    """Solves an instance with the HiGHS or native backend, recording the phases in the current stats."""
+    import solver_backends
+
+    backend = solver_backends.choose_backend(problem, solver_backends.instance_size(problem, args, {}))
+    if backend == "gurobi":
+        # gurobipy is installed but cannot be imported or has no usable license
+        backend = "highs" if "highs" in solver_backends.available_backends() else "native"
+    solve_stats.record(backend=backend)
+    # The undecorated function, so its phases go to this solve's stats
+    return inspect.unwrap(solver_backends.get_backend(backend)[problem])(*args)
+
+
+def _solve_diet_relaxed(requirements, nutrients, food_cost, env=None):
+    """Solves the diet LP (with Gurobi, or the native simplex without it) and rounds it up."""
+    with solve_stats.phase("optimize"):
+        if Model is not None:
+            m, _ = build_diet_model(requirements, nutrients, food_cost, env)
+            m.update()
+            relaxed = m.relax()
+            m.dispose()
+            try:
+                relaxed.optimize()
+                if relaxed.status != GRB.OPTIMAL:
+                    return None
+                x_lp, bound = np.array(relaxed.getAttr("X", relaxed.getVars())), relaxed.objVal
+            finally:
+                relaxed.dispose()
+        else:
+            from native_solver import solve_lp
+
+            x_lp = solve_lp(food_cost, -nutrients, -requirements)
+            if x_lp is None:
+                return None
+            bound = float(food_cost @ x_lp)
+        x = diet_round(x_lp, requirements, nutrients, food_cost)
+    if x is None:
+        return None
+    _record_fast_path("lp", nutrients, float(food_cost @ x), bound)
+    return x.tolist(), float(food_cost @ x)
+
+
+def _record_fast_path(backend, matrix, value, bound):
+    """Records a fast-path answer, its model size and its proven gap in the current solve's stats."""
+    if solve_stats.current() is not None:
+        matrix = np.atleast_2d(matrix)
+        solve_stats.record(
+            backend=backend, num_vars=matrix.shape[1], num_constrs=matrix.shape[0],
+            num_nonzeros=int(np.count_nonzero(matrix)), mip_gap=relative_gap(value, bound), bound=bound
+        )
+
+
+def _set_budget(m, time_limit=None, gap=None):
+    """Applies the time and gap budget of the "anytime" mode to a model."""
+    if time_limit is not None:
+        m.Params.TimeLimit = time_limit
+    if gap is not None:
+        m.Params.MIPGap = gap
+
+
+def build_diet_model(requirements, nutrients, food_cost, env=None):
+    """
+    Builds the diet model from arrays in a few matrix-level calls.
+
+    Args:
+        requirements: The calories, protein and fat needed per day.
+        nutrients: A 3 x n NumPy array or SciPy sparse matrix with the calories, protein
+            and fat content per unit of each food.
+        food_cost: An array of cost per unit of food.
+        env: Optional Gurobi environment to build the model in.
+
+    Returns:
+        A tuple (model, x) where x is the MVar of amounts to consume.
+    """
+    m = Model("diet", env=env)
+
+    # Decision variables: non-negative integer amounts, costed directly through their objective coefficients
+    x = m.addMVar(nutrients.shape[1], lb=0, obj=np.asarray(food_cost, dtype=float), vtype=GRB.INTEGER, name="x")
+    m.ModelSense = GRB.MINIMIZE
+
+    # Constraints: nutrients @ x >= requirements
+    m.addMConstr(nutrients, x, GRB.GREATER_EQUAL, np.asarray(requirements, dtype=float), name=list(NUTRIENTS))
+    return m, x
+
+
+@instrumented("production_planning", "gurobi")
+@returns_result("production_planning")
+def solve_production_planning(labor_avail, materials_avail, products, env=None, callback=None):
     """
     Solves a  production planning problem focusing on maximizing profit with basic labor and material constraints.
 
@@ -49,87 +211,431 @@ def solve_production_planning(labor_avail, materials_avail, products):
     - labor_avail (float): Total available labor hours.
     - materials_avail (float): Total available material units.
     - products (list of dicts): Information about each product, including profit, labor requirement, and material requirement.
+    - env (gurobipy.Env, optional): Gurobi environment to build the model in.
+    - callback (callable, optional): Gurobi callback passed to optimize.
+    - compact (bool, optional): If True, return a SolveResult holding the levels as an array (see solve_result).
+    - return_stats (bool, optional): If True, return (result, SolveStats) instead (see solve_stats).
 
     Returns:
     - A dictionary with production levels and the total profit.
-    """
-    m = Model("Simplified Production Planning")
-
-    # Decision variables for production levels of each product
-    x = {p['name']: m.addVar(vtype=GRB.INTEGER, name=f"prod_{p['name']}") for p in products}
-
-    # Objective: Maximize profit
-    m.setObjective(quicksum(p['profit'] * x[p['name']] for p in products), GRB.MAXIMIZE)
-
-    # Constraints
-    # Labor constraint
-    m.addConstr(quicksum(p['labor'] * x[p['name']] for p in products) <= labor_avail, "Labor")
 
-    # Material constraint
-    m.addConstr(quicksum(p['materials'] * x[p['name']] for p in products) <= materials_avail, "Materials")
+    Without gurobipy or a usable license, the instance is solved by the HiGHS or native
+    backend instead (see solver_backends); env and callback are then ignored.
+    """
+    if Model is None:
+        return _solve_without_gurobi("production_planning", labor_avail, materials_avail, products)
+    with solve_stats.phase("parse"):
+        requirements = np.array([[p['labor'] for p in products], [p['materials'] for p in products]], dtype=float)
+        profit = [p['profit'] for p in products]
+        min_production = [p['min_production'] for p in products]
+        names = [p['name'] for p in products]
+    try:
+        with solve_stats.phase("build"):
+            m, x = build_production_planning_model(
+                [labor_avail, materials_avail], requirements, profit, min_production, names, env
+            )
+            m.update()
 
-    # Minimum production requirements
-    for p in products:
-        m.addConstr(x[p['name']] >= p['min_production'], f"MinProd_{p['name']}")
-    
-    # Solve model
-    m.optimize()
+        # Solve model
+        with solve_stats.phase("optimize"):
+            m.optimize(callback)
+    except GurobiError:
+        # No usable license, e.g. a size-limited one and a large instance
+        return _solve_without_gurobi("production_planning", labor_avail, materials_avail, products)
+    solve_stats.record_model(m)
 
     # Extract solution
     if m.status == GRB.OPTIMAL:
-        production_levels = {v.varName: v.x for v in m.getVars()}
-        total_profit = m.getObjective().getValue()
-        return {
-            'production_levels': production_levels,
-            'total_profit': total_profit
-        }
+        # Levels in one bulk query; the "prod_<name>" dictionary is only built if the caller wants it
+        with solve_stats.phase("extract"):
+            return SolveResult("production_planning", x.X, m.objVal, labels=names)
     else:
         return None
 
 
-def solve_knapsack(capacity, values, weights):
+def build_production_planning_model(resources_avail, requirements, profit, min_production, names, env=None):
+    """
+    Builds the production planning model from arrays in a few matrix-level calls.
+
+    Parameters:
+    - resources_avail (array): Available labor hours and material units.
+    - requirements (array or sparse matrix): 2 x n labor and material requirement per unit of each product.
+    - profit (array): Profit per unit of each product.
+    - min_production (array): Minimum production of each product.
+    - names (list of str): Product names, used to name the variables "prod_<name>".
+    - env (gurobipy.Env, optional): Gurobi environment to build the model in.
+
+    Returns:
+    - A tuple (model, x) where x is the MVar of production levels.
+    """
+    m = Model("Simplified Production Planning", env=env)
+
+    # Decision variables for production levels of each product, with profit as objective coefficient
+    x = m.addMVar(len(names), vtype=GRB.INTEGER, obj=np.asarray(profit, dtype=float),
+                  name=[f"prod_{name}" for name in names])
+    m.ModelSense = GRB.MAXIMIZE
+
+    # Labor and material constraints
+    m.addMConstr(requirements, x, GRB.LESS_EQUAL, np.asarray(resources_avail, dtype=float), name=list(RESOURCES))
+
+    # Minimum production requirements
+    m.addConstr(x >= np.asarray(min_production, dtype=float), name=[f"MinProd_{name}" for name in names])
+    return m, x
+
+
+@instrumented("knapsack", "gurobi")
+@returns_result("knapsack")
+def solve_knapsack(capacity, values, weights, engine="auto", env=None, callback=None, mode="exact", time_limit=None,
+                   gap=None):
     """
     This function solves a knapsack problem to maximize the total value of items,
     considering a weight constraint on the knapsack.
 
+    With engine="auto" the instance is handed to the cheapest engine: a vectorized
+    dynamic program when the weights are integers (or decimals with few digits),
+    a branch-and-bound otherwise, and Gurobi only when the branch-and-bound runs
+    out of nodes or the instance has negative weights.
+
+    The mode trades accuracy for latency (see solve_modes): "relaxed" returns the LP
+    solution without its fractional item, "heuristic" a greedy ratio rule with local
+    search, and "anytime" the best Gurobi solution found within time_limit or gap,
+    warm-started from the heuristic. The fast paths need non-negative weights; other
+    instances are solved exactly. The proven gap of the answer is reported in its
+    SolveStats.
+
+    With a list of capacities the knapsack is multidimensional: weights then holds one
+    row of item weights per capacity, and the instance goes to Gurobi (or the in-house
+    branch-and-bound with engine="bnb"), see multi_knapsack. Only the "exact" and
+    "anytime" modes apply.
+
     Args:
-        capacity: The maximum weight capacity of the knapsack.
+        capacity: The maximum weight capacity of the knapsack, or a list of capacities.
         values: A list representing the value of each item.
-        weights: A list representing the weight of each item.
+        weights: A list representing the weight of each item, or one such row per capacity.
+        engine: "auto", "dp", "bnb" or "gurobi". "dp" raises ValueError unless the
+            weights are non-negative integers at one of the WEIGHT_SCALES.
+        env: Optional Gurobi environment used if the instance goes to Gurobi.
+        callback: Optional Gurobi callback used if the instance goes to Gurobi.
+        mode: "exact", "relaxed", "heuristic" or "anytime".
+        time_limit: Time budget (in seconds) of the "anytime" mode.
+        gap: Relative gap at which the "anytime" mode stops.
+        compact: If True, return a SolveResult holding the 0/1 choices as an array (see solve_result).
+        return_stats: If True, return (result, SolveStats) instead (see solve_stats).
 
     Returns:
         A tuple containing:
             - A list of indices representing the selected items to put in the knapsack.
             - The total value of the selected items.
-            - The time taken by Gurobi to solve the model (in seconds).
+            - The time taken to solve the problem (in seconds).
     """
-    # Create a Gurobi model instance named "knapsack"
-    m = Model("knapsack")
+    if np.ndim(capacity) > 0:
+        if mode not in ("exact", "anytime"):
+            raise ValueError(f"The {mode} mode does not apply to a multidimensional knapsack.")
+        if mode == "exact":
+            time_limit = gap = None
+        # Imported here: multi_knapsack pulls in scipy.sparse, too slow for every CLI start
+        import multi_knapsack
+
+        return multi_knapsack.solve_multidimensional(capacity, values, weights, engine, env, callback, time_limit,
+                                                     gap)
+    gurobi_available = Model is not None
+    scale = None
+    if mode != "exact":
+        if mode not in SOLVE_MODES:
+            raise ValueError(f"Unknown solve mode: {mode}")
+        start = time.perf_counter()
+        weights_array = np.asarray(weights, dtype=float)
+        if capacity >= 0 and not np.any(weights_array < 0):
+            with solve_stats.phase("optimize"):
+                selected_items, total_value, bound = (
+                    knapsack_relaxed if mode == "relaxed" else knapsack_greedy
+                )(capacity, values, weights_array)
+            if mode != "anytime":
+                _record_fast_path("lp" if mode == "relaxed" else "greedy", weights_array, total_value, bound)
+                return selected_items, total_value, time.perf_counter() - start
+            start_solution = np.zeros(len(weights_array))
+            start_solution[selected_items] = 1.0
+        else:
+            start_solution = None
+        if mode == "anytime" and gurobi_available:
+            try:
+                return _solve_knapsack_gurobi(capacity, values, weights, env, callback, time_limit, gap,
+                                              start_solution)
+            except GurobiError:
+                pass
+        # Without (a usable) Gurobi, or for negative weights, the instance is solved exactly
+    if engine == "auto":
+        if capacity < 0 and not gurobi_available:
+            # Nothing with a non-negative weight can be packed
+            return [], 0, 0.0
+        with solve_stats.phase("parse"):
+            values_array, weights_array = np.asarray(values, dtype=float), np.asarray(weights, dtype=float)
+            engine, scale = choose_knapsack_engine(capacity, values_array, weights_array, gurobi_available)
+        if capacity < 0:
+            engine = "gurobi"
+
+    if engine == "dp":
+        if scale is None:
+            # Requested explicitly: the weights must still be exact integers at some scale
+            weights_array = np.asarray(weights, dtype=float)
+            scale = None if np.any(weights_array < 0) else integer_scale(weights_array)
+            if scale is None:
+                raise ValueError(f"The DP engine needs non-negative weights that are integers at one of the "
+                                 f"scales {WEIGHT_SCALES}.")
+        return _run_knapsack_engine("dp", weights, solve_knapsack_dp, capacity, values, weights, scale)
+    if engine == "bnb":
+        if not gurobi_available:
+            return _run_knapsack_engine("bnb", weights, solve_knapsack_bnb, capacity, values, weights)
+        result = _run_knapsack_engine(
+            "bnb", weights, solve_knapsack_bnb, capacity, values, weights, max_nodes=BNB_NODE_LIMIT
+        )
+        if result is not None:
+            return result
+        engine = "gurobi"
+    if engine != "gurobi":
+        raise ValueError(f"Unknown knapsack engine: {engine}")
+    if not gurobi_available:
+        raise RuntimeError("The Gurobi knapsack engine requires gurobipy.")
+    try:
+        return _solve_knapsack_gurobi(capacity, values, weights, env, callback)
+    except GurobiError:
+        # No usable license: finish the search in-house without a node limit
+        return _run_knapsack_engine("bnb", weights, solve_knapsack_bnb, capacity, values, weights)
 
-    # Define the number of items based on the length of the values and weights lists
-    item_count = len(values)
 
-    # Define decision variables (x) as binary variables (0 or 1)
-    #   - x[i] = 1 if item i is selected, 0 otherwise
-    x = m.addVars(item_count, vtype=GRB.BINARY, name="x")
+def _run_knapsack_engine(engine, weights, solve, *args, **kwargs):
+    """Runs one of the in-house knapsack engines as the optimize phase of the current solve's stats."""
+    with solve_stats.phase("optimize"):
+        result = solve(*args, **kwargs)
+    if solve_stats.current() is not None:
+        weights = np.asarray(weights, dtype=float)
+        solve_stats.record(
+            backend=engine, num_vars=len(weights), num_constrs=1, num_nonzeros=int(np.count_nonzero(weights)),
+            mip_gap=None if result is None else 0.0, bound=None if result is None else result[1]
+        )
+    return result
 
-    # Define the objective function to maximize the total value of selected items
-    m.setObjective(sum(values[i] * x[i] for i in range(item_count)), GRB.MAXIMIZE)
 
-    # Define constraint: Total weight of selected items <= knapsack capacity
-    #   - Each item i has weight weights[i].
-    m.addConstr(sum(weights[i] * x[i] for i in range(item_count)) <= capacity, "Capacity")
+def _solve_knapsack_gurobi(capacity, values, weights, env=None, callback=None, time_limit=None, gap=None, start=None):
+    """
+    This function solves a knapsack problem to maximize the total value of items,
+    considering a weight constraint on the knapsack.
+
+    Args:
+        capacity: The maximum weight capacity of the knapsack.
+        values: A list representing the value of each item.
+        weights: A list representing the weight of each item.
+        env: Optional Gurobi environment to build the model in.
+        callback: Optional Gurobi callback passed to optimize.
+        time_limit: Optional time budget; the best solution found within it is returned.
+        gap: Optional relative gap at which to stop; the solution found is returned.
+        start: Optional 0/1 array of a known solution, used as MIP start.
+
+    Returns:
+        A SolveResult whose legacy() value is a tuple containing:
+            - A list of indices representing the selected items to put in the knapsack.
+            - The total value of the selected items.
+            - The time taken by Gurobi to solve the model (in seconds).
+    """
+    with solve_stats.phase("build"):
+        m, x = build_knapsack_model(capacity, values, weights, env)
+        _set_budget(m, time_limit, gap)
+        if start is not None:
+            x.Start = start
+        m.update()
 
     # Solve the model using Gurobi optimizer
-    m.optimize()
-    
-    # Check if the solution is optimal (GRB.OPTIMAL status code)
-    if m.status == GRB.OPTIMAL:
+    with solve_stats.phase("optimize"):
+        m.optimize(callback)
+    solve_stats.record(backend="gurobi")
+    solve_stats.record_model(m)
+
+    # Check if the solution is optimal (GRB.OPTIMAL status code), or the best within the budget
+    budgeted = time_limit is not None or gap is not None
+    if m.status == GRB.OPTIMAL or (budgeted and m.SolCount > 0):
         # Extract indices of selected items (where x[i] is greater than 0.5 to account for rounding errors)
-        selected_items = [i for i in range(item_count) if x[i].X > 0.5]
-        # Return selected items, total value, and solution time
-        return selected_items, m.objVal, m.Runtime
+        # The 0/1 choices in one bulk query; the selected indices are derived on demand
+        with solve_stats.phase("extract"):
+            return SolveResult("knapsack", x.X, m.objVal, runtime=m.Runtime)
     else:
         # If not optimal, return empty list and 0 for all values
         return [], 0
-    
\ No newline at end of file
+
+
+def build_knapsack_model(capacity, values, weights, env=None):
+    """
+    Builds the knapsack model from arrays in a few matrix-level calls.
+
+    Args:
+        capacity: The maximum weight capacity of the knapsack.
+        values: An array representing the value of each item.
+        weights: An array (or 1 x n sparse matrix) representing the weight of each item.
+        env: Optional Gurobi environment to build the model in.
+
+    Returns:
+        A tuple (model, x) where x is the binary MVar of selected items.
+    """
+    # Create a Gurobi model instance named "knapsack"
+    m = Model("knapsack", env=env)
+
+    # Decision variables (x) are binary, with the item values as objective coefficients
+    x = m.addMVar(len(values), vtype=GRB.BINARY, obj=np.asarray(values, dtype=float), name="x")
+    m.ModelSense = GRB.MAXIMIZE
+
+    # Constraint: total weight of selected items <= knapsack capacity
+    if not hasattr(weights, "tocsr"):
+        weights = np.asarray(weights, dtype=float).reshape(1, -1)
+    m.addMConstr(weights, x, GRB.LESS_EQUAL, np.array([capacity], dtype=float), name=["Capacity"])
+    return m, x
+
+
+def _batch_rows(instances, arg_names):
+    """
+    Normalizes a batch of instances into a list of argument tuples.
+
+    Args:
+        instances: Either a list of instances (each a tuple in the order of the single-call
+            function's arguments, or a dict keyed by argument name) or a dict of columns
+            mapping each argument name to a sequence with one entry per instance.
+        arg_names: The argument names of the single-call function.
+
+    Returns:
+        A list of argument tuples, in input order.
+    """
+    if isinstance(instances, dict):
+        return list(zip(*(instances[name] for name in arg_names)))
+    return [tuple(inst[name] for name in arg_names) if isinstance(inst, dict) else tuple(inst)
+            for inst in instances]
+
+
+def _quiet_env():
+    """Starts a Gurobi environment with logging disabled, shared by every model of a batch."""
+    env = Env(empty=True)
+    env.setParam("OutputFlag", 0)
+    env.start()
+    return env
+
+
+def solve_diet_batch(instances, env=None):
+    """
+    Solves a batch of diet problems, sharing one Gurobi environment and model.
+
+    Consecutive instances with the same number of foods reuse the same DietModel: only
+    the objective coefficients, the changed constraint coefficients and the nutrient
+    requirements are updated before re-optimizing.
+
+    Args:
+        instances: Diet instances, as accepted by _batch_rows with the arguments of solve_diet.
+        env: Optional Gurobi environment to solve in (a quiet one is started by default).
+
+    Returns:
+        A list with one (amounts, total_cost) tuple per instance, in input order.
+    """
+    from diet_model import DietModel
+
+    results = []
+    with _quiet_env() if env is None else nullcontext(env) as env:
+        model = None
+        for calories_needed, protein_needed, fat_needed, food_calories, food_protein, food_fat, food_cost \
+                in _batch_rows(instances, DIET_ARGS):
+            if model is None or model.food_count != len(food_cost):
+                if model is not None:
+                    model.dispose()
+                model = DietModel(food_calories, food_protein, food_fat, food_cost, env=env)
+            else:
+                model.set_foods(food_calories, food_protein, food_fat, food_cost)
+            model.set_requirements(calories_needed, protein_needed, fat_needed)
+            results.append(model.solve())
+        if model is not None:
+            model.dispose()
+    return results
+
+
+def solve_production_planning_batch(instances, env=None):
+    """
+    Solves a batch of production planning problems, sharing one Gurobi environment.
+
+    Consecutive instances with the same product names reuse the same model: only the
+    profits, resource requirements and limits, and minimum productions are updated.
+
+    Args:
+        instances: Production planning instances, as accepted by _batch_rows with the
+            arguments of solve_production_planning.
+        env: Optional Gurobi environment to solve in (a quiet one is started by default).
+
+    Returns:
+        A list with one result per instance (the dict returned by solve_production_planning,
+        or None when no optimal plan exists), in input order.
+    """
+    results = []
+    with _quiet_env() if env is None else nullcontext(env) as env:
+        m = x = names = None
+        for labor_avail, materials_avail, products in _batch_rows(instances, PRODUCTION_PLANNING_ARGS):
+            new_names = [p['name'] for p in products]
+            if m is None or new_names != names:
+                if m is not None:
+                    m.dispose()
+                m = Model("Simplified Production Planning", env=env)
+                x = [m.addVar(vtype=GRB.INTEGER, name=f"prod_{name}") for name in new_names]
+                labor = m.addConstr(LinExpr([0.0] * len(x), x) <= 0, "Labor")
+                materials = m.addConstr(LinExpr([0.0] * len(x), x) <= 0, "Materials")
+                min_prod = [m.addConstr(var >= 0, f"MinProd_{name}") for var, name in zip(x, new_names)]
+                m.ModelSense = GRB.MAXIMIZE
+                names = new_names
+            for var, p in zip(x, products):
+                m.chgCoeff(labor, var, p['labor'])
+                m.chgCoeff(materials, var, p['materials'])
+            m.setAttr("Obj", x, [p['profit'] for p in products])
+            m.setAttr("RHS", [labor, materials] + min_prod,
+                      [labor_avail, materials_avail] + [p['min_production'] for p in products])
+            m.optimize()
+
+            if m.status == GRB.OPTIMAL:
+                results.append({
+                    'production_levels': dict(zip(m.getAttr("VarName", x), m.getAttr("X", x))),
+                    'total_profit': m.objVal
+                })
+            else:
+                results.append(None)
+        if m is not None:
+            m.dispose()
+    return results
+
+
+def solve_knapsack_batch(instances, env=None):
+    """
+    Solves a batch of knapsack problems.
+
+    Instances whose weights are integers (or decimals with few digits) and whose DP
+    tables are small are solved together in one vectorized NumPy pass; the rest go
+    through solve_knapsack one by one.
+
+    Args:
+        instances: Knapsack instances, as accepted by _batch_rows with the arguments of
+            solve_knapsack. Columnar values/weights may be 2-D arrays (one row per instance).
+        env: Optional Gurobi environment for the instances solved by Gurobi.
+
+    Returns:
+        A list with one (selected_items, total_value, runtime) tuple per instance, in input order.
+    """
+    rows = _batch_rows(instances, KNAPSACK_ARGS)
+    results = [None] * len(rows)
+    vectorized = []
+    for k, (capacity, values, weights) in enumerate(rows):
+        if capacity >= 0 and len(values) <= DP_BATCH_MAX_ITEMS:
+            engine, scale = choose_knapsack_engine(
+                capacity, np.asarray(values, dtype=float), np.asarray(weights, dtype=float), Model is not None
+            )
+            if engine == "dp":
+                vectorized.append((k, scale))
+                continue
+        results[k] = solve_knapsack(capacity, values, weights, env=env)
+
+    if vectorized:
+        indices, scales = zip(*vectorized)
+        batch_results = solve_knapsack_dp_batch(
+            [rows[k][0] for k in indices], [rows[k][1] for k in indices], [rows[k][2] for k in indices], scales
+        )
+        for k, result in zip(indices, batch_results):
+            results[k] = result
+    return results
@@ -0,0 +1,210 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gurobipy import GRB
+
+from optimization_solver import RESOURCES, build_production_planning_model
+
+
+class ProductionPlanningModel:
+    """
+    A production planning problem kept alive between solves.
+
+    Only the Labor/Materials right-hand sides and the product profits can change, so
+    re-solves touch nothing else and start from the previous plan.
+
+    Args:
+        labor_avail: Total available labor hours.
+        materials_avail: Total available material units.
+        products: Information about each product, as for solve_production_planning.
+        env: Optional Gurobi environment to build the model in.
+    """
+
+    def __init__(self, labor_avail, materials_avail, products, env=None):
+        self.names = [p['name'] for p in products]
+        self._requirements = np.array([[p['labor'] for p in products], [p['materials'] for p in products]], dtype=float)
+        self.m, x = build_production_planning_model(
+            [labor_avail, materials_avail], self._requirements, [p['profit'] for p in products],
+            [p['min_production'] for p in products], self.names, env
+        )
+        self.m.update()
+        self._x = x.tolist()
+        self._resources = self.m.getConstrs()[:len(RESOURCES)]
+        self.levels = None
+
+    def set_resources(self, labor_avail=None, materials_avail=None):
+        """Changes the resource limits; arguments left as None are kept."""
+        for constr, rhs in zip(self._resources, (labor_avail, materials_avail)):
+            if rhs is not None:
+                constr.RHS = rhs
+
+    def set_profits(self, profits):
+        """Replaces the profit of every product."""
+        self.m.setAttr("Obj", self._x, list(profits))
+
+    def usage(self):
+        """Returns the labor and materials used by the last optimal plan."""
+        return self._requirements @ self.levels
+
+    def solve(self):
+        """
+        Re-optimizes the model, warm-started from the previous plan.
+
+        Returns:
+            The dictionary returned by solve_production_planning, or None if no optimal
+            plan exists.
+        """
+        if self.levels is not None:
+            self.m.setAttr("Start", self._x, self.levels.tolist())
+        self.m.optimize()
+
+        if self.m.status == GRB.OPTIMAL:
+            self.levels = np.array(self.m.getAttr("X", self._x))
+            return {
+                'production_levels': dict(zip(self.m.getAttr("VarName", self._x), self.levels.tolist())),
+                'total_profit': self.m.objVal
+            }
+        else:
+            self.levels = None
+            return None
+
+    def lp_sensitivity(self):
+        """
+        Solves the LP relaxation and returns its sensitivity information.
+
+        Returns:
+            A dictionary with:
+                - 'duals': the shadow price of Labor and Materials.
+                - 'rhs_ranges': for each resource, the (low, high) interval of its limit
+                  within which the LP optimal basis, and hence the duals, stay the same.
+                - 'profit_ranges': for each product, the (low, high) interval of its profit
+                  within which the LP optimal basis stays the same.
+            None is returned if the relaxation has no optimal solution.
+        """
+        relaxed = self.m.relax()
+        try:
+            relaxed.optimize()
+            if relaxed.status != GRB.OPTIMAL:
+                return None
+            constrs = [relaxed.getConstrByName(name) for name in RESOURCES]
+            xs = relaxed.getVars()
+            return {
+                'duals': dict(zip(RESOURCES, relaxed.getAttr("Pi", constrs))),
+                'rhs_ranges': dict(zip(RESOURCES, zip(relaxed.getAttr("SARHSLow", constrs),
+                                                      relaxed.getAttr("SARHSUp", constrs)))),
+                'profit_ranges': dict(zip(self.names, zip(relaxed.getAttr("SAObjLow", xs),
+                                                          relaxed.getAttr("SAObjUp", xs)))),
+            }
+        finally:
+            relaxed.dispose()
+
+    def dispose(self):
+        """Frees the underlying Gurobi model."""
+        self.m.dispose()
+
+
+def sweep_production_planning(products, labor_values, materials_values, profits=None, processes=1,
+                              sensitivity=False):
+    """
+    Solves production planning over a grid of resource limits (and optionally profits).
+
+    Each worker keeps one warm ProductionPlanningModel and walks its share of the grid,
+    changing only the Labor/Materials right-hand sides and the profits. Along every
+    materials line the limits are visited from largest to smallest: when the previous
+    plan still fits in the smaller limit it remains optimal (the feasible region only
+    shrank), so that point is filled in without a solve.
+
+    Args:
+        products: Information about each product, as for solve_production_planning.
+        labor_values: The labor limits of the grid.
+        materials_values: The materials limits of the grid.
+        profits: Optional list of per-product profit vectors to sweep as well.
+        processes: Number of worker processes used for the grid.
+        sensitivity: Whether to also report LP-relaxation duals and ranging at every point.
+
+    Returns:
+        A dictionary of arrays indexed by [profit, labor, materials] (the profit axis is
+        dropped when profits is None):
+            - 'total_profit': the optimal profit, NaN where no optimal plan exists.
+            - 'production_levels': the plan, with the products on the last axis.
+            - 'solved': False where the point was filled in from its neighbour.
+            - 'duals' and 'rhs_ranges' (if sensitivity): shadow prices of Labor/Materials
+              and their (low, high) ranging intervals.
+        It also holds the 'labor' and 'materials' grid values.
+    """
+    labor_values = np.asarray(labor_values, dtype=float)
+    materials_values = np.asarray(materials_values, dtype=float)
+    profit_list = [[p['profit'] for p in products]] if profits is None else [list(pr) for pr in profits]
+
+    lines = [(k, i) for k in range(len(profit_list)) for i in range(len(labor_values))]
+    chunks = [lines[w::processes] for w in range(processes) if lines[w::processes]]
+    args = [(products, labor_values, materials_values, profit_list, chunk, sensitivity) for chunk in chunks]
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = list(executor.map(_sweep_lines, *zip(*args)))
+    else:
+        parts = [_sweep_lines(*a) for a in args]
+
+    shape = (len(profit_list), len(labor_values), len(materials_values))
+    surface = {
+        'labor': labor_values,
+        'materials': materials_values,
+        'total_profit': np.full(shape, np.nan),
+        'production_levels': np.full(shape + (len(products),), np.nan),
+        'solved': np.zeros(shape, dtype=bool),
+    }
+    if sensitivity:
+        surface['duals'] = np.full(shape + (2,), np.nan)
+        surface['rhs_ranges'] = np.full(shape + (2, 2), np.nan)
+    for part in parts:
+        for (k, i), line in part:
+            for key, values in line.items():
+                surface[key][k, i] = values
+    if profits is None:
+        for key in ('total_profit', 'production_levels', 'solved', 'duals', 'rhs_ranges'):
+            if key in surface:
+                surface[key] = surface[key][0]
+    return surface
+
+
+def _sweep_lines(products, labor_values, materials_values, profit_list, lines, sensitivity):
+    """Solves the given (profit, labor) lines of the grid on one warm model."""
+    from optimization_solver import _quiet_env
+
+    count = len(materials_values)
+    order = np.argsort(materials_values)[::-1]
+    out = []
+    with _quiet_env() as env:
+        model = ProductionPlanningModel(labor_values[0], materials_values[0], products, env=env)
+        for k, i in lines:
+            model.set_profits(profit_list[k])
+            model.set_resources(labor_avail=labor_values[i])
+            line = {
+                'total_profit': np.full(count, np.nan),
+                'production_levels': np.full((count, len(products)), np.nan),
+                'solved': np.zeros(count, dtype=bool),
+            }
+            if sensitivity:
+                line['duals'] = np.full((count, 2), np.nan)
+                line['rhs_ranges'] = np.full((count, 2, 2), np.nan)
+
+            result = None
+            for j in order:
+                model.set_resources(materials_avail=materials_values[j])
+                if result is None or model.usage()[1] > materials_values[j] + 1e-9:
+                    result = model.solve()
+                    line['solved'][j] = True
+                    if result is None:
+                        # Smaller materials limits cannot make the plan feasible again
+                        break
+                line['total_profit'][j] = result['total_profit']
+                line['production_levels'][j] = model.levels
+                if sensitivity:
+                    info = model.lp_sensitivity()
+                    if info is not None:
+                        line['duals'][j] = [info['duals'][name] for name in RESOURCES]
+                        line['rhs_ranges'][j] = [info['rhs_ranges'][name] for name in RESOURCES]
+            out.append(((k, i), line))
+        model.dispose()
+    return out
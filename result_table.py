@@ -0,0 +1,76 @@
+import numpy as np
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class ResultTableModel(QAbstractTableModel):
+    """
+    Read-only table of solution columns held as NumPy arrays.
+
+    A QTableView only asks for the cells it paints, so a row is formatted when it
+    scrolls into view and a solution of 10^5+ rows is shown without building one
+    string or widget per row.
+
+    Args:
+        parent: Optional parent QObject.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._columns = []
+        self._formats = []
+        self._rows = 0
+
+    def set_columns(self, columns):
+        """
+        Replaces the table contents.
+
+        Args:
+            columns: List of (header, values, format) tuples, one per column, where values
+                is an array (all of the same length) and format a str.format pattern
+                applied to each value, e.g. "{:.2f}".
+        """
+        self.beginResetModel()
+        self._headers = [header for header, _, _ in columns]
+        self._columns = [np.asarray(values) for _, values, _ in columns]
+        self._formats = [fmt for _, _, fmt in columns]
+        self._rows = len(self._columns[0]) if self._columns else 0
+        self.endResetModel()
+
+    def clear(self):
+        self.set_columns([])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            value = self._columns[index.column()][index.row()]
+            return self._formats[index.column()].format(value.item() if hasattr(value, "item") else value)
+        if role == Qt.TextAlignmentRole and self._columns[index.column()].dtype.kind in "iuf":
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+
+def parse_numbers(text):
+    """
+    Parses a pasted list of numbers separated by commas, semicolons, whitespace or newlines.
+
+    Returns:
+        A float NumPy array. Raises ValueError on anything that is not a number.
+    """
+    tokens = text.replace(",", " ").replace(";", " ").split()
+    if not tokens:
+        raise ValueError("Please enter at least one number.")
+    return np.array(tokens, dtype=float)
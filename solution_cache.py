@@ -0,0 +1,205 @@
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import optimization_solver
+
+# Arguments that select how an instance is solved but not what its solution is.
+IGNORED_KWARGS = ("env", "callback")
+
+# Returned by SolutionCache.get on a miss, since None is a valid cached result.
+MISSING = object()
+
+
+def is_cacheable(kwargs):
+    """
+    Tells whether a solve call returns a reproducible, exact result worth caching.
+
+    Calls with a callback (which may cancel the solve), a time limit, a non-exact mode
+    or return_stats (whose stats would be replayed on every hit) are not.
+    """
+    return (kwargs.get("callback") is None and kwargs.get("time_limit") is None
+            and kwargs.get("mode", "exact") == "exact" and not kwargs.get("return_stats"))
+
+
+def bind_arguments(func, args, kwargs):
+    """
+    Returns the arguments of a call to func by name, defaults included.
+
+    The same call made with positional or keyword arguments gives the same dictionary.
+    Keywords added by decorators (such as compact) are kept as given.
+    """
+    signature = inspect.signature(func)
+    extra = {k: v for k, v in kwargs.items() if k not in signature.parameters}
+    bound = signature.bind(*args, **{k: v for k, v in kwargs.items() if k in signature.parameters})
+    bound.apply_defaults()
+    return {**bound.arguments, **extra}
+
+
+def _normalize(value):
+    """Converts an argument to plain JSON types so equal instances serialize identically."""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return value
+
+
+def canonical_key(problem, args, kwargs=None, func=None):
+    """
+    Returns a content hash identifying a solve request.
+
+    Numbers are compared by value (1, 1.0 and np.int64(1) hash the same) and NumPy
+    arrays hash like the equivalent lists.
+
+    Args:
+        problem: Name of the problem, e.g. "knapsack".
+        args: Positional arguments of the solve call.
+        kwargs: Keyword arguments of the solve call; IGNORED_KWARGS are left out.
+        func: Optional solve function called; its signature names every argument, so
+            positional and keyword calls (and omitted defaults) hash the same.
+
+    Returns:
+        A hex SHA-256 digest.
+    """
+    if func is not None:
+        args, kwargs = (), bind_arguments(func, args, kwargs or {})
+    kwargs = {k: v for k, v in (kwargs or {}).items() if k not in IGNORED_KWARGS}
+    payload = json.dumps([problem, _normalize(list(args)), _normalize(kwargs)], sort_keys=True,
+                         separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SolutionCache:
+    """
+    A content-addressed cache of solver results.
+
+    Results live in an in-memory LRU tier of bounded size and, if a path is given, in a
+    SQLite file that survives restarts. Results are stored pickled, so every lookup returns
+    a fresh copy that callers can modify without corrupting the cache.
+
+    Args:
+        maxsize: Maximum number of results kept in memory.
+        path: Optional SQLite file used as the on-disk tier.
+    """
+
+    def __init__(self, maxsize=1024, path=None):
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, result BLOB)")
+            self._db.commit()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=MISSING):
+        """Returns the cached result for a key, or default (MISSING) if there is none."""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            elif self._db is not None:
+                row = self._db.execute("SELECT result FROM solutions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    blob = row[0]
+                    self._remember(key, blob)
+                    self.disk_hits += 1
+            if blob is None:
+                self.misses += 1
+                return default
+        return pickle.loads(blob)
+
+    def put(self, key, result):
+        """Stores a result under a key."""
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, blob))
+                self._db.commit()
+
+    def _remember(self, key, blob):
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def wrap(self, func, problem=None):
+        """
+        Returns a cached version of a solver function.
+
+        Calls that are not exact and reproducible (see is_cacheable) go straight to func.
+
+        Args:
+            func: One of the optimization_solver solve functions.
+            problem: Name used in the cache key (defaults to the function name).
+        """
+        problem = problem or func.__name__
+
+        @functools.wraps(func)
+        def cached(*args, **kwargs):
+            if not is_cacheable(kwargs):
+                return func(*args, **kwargs)
+            key = canonical_key(problem, args, kwargs, func)
+            result = self.get(key)
+            if result is MISSING:
+                result = func(*args, **kwargs)
+                self.put(key, result)
+            return result
+
+        return cached
+
+    def stats(self):
+        """Returns hit/miss counters and the current memory tier size."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._memory),
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Empties both tiers and resets the counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM solutions")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def close(self):
+        """Closes the on-disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def solve_diet(self, *args, **kwargs):
+        """Cached optimization_solver.solve_diet."""
+        return self.wrap(optimization_solver.solve_diet, "diet")(*args, **kwargs)
+
+    def solve_production_planning(self, *args, **kwargs):
+        """Cached optimization_solver.solve_production_planning."""
+        return self.wrap(optimization_solver.solve_production_planning, "production_planning")(*args, **kwargs)
+
+    def solve_knapsack(self, *args, **kwargs):
+        """Cached optimization_solver.solve_knapsack."""
+        return self.wrap(optimization_solver.solve_knapsack, "knapsack")(*args, **kwargs)
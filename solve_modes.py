@@ -0,0 +1,224 @@
+"""
+Fast paths for the diet and knapsack problems, used by the non-exact solve modes.
+
+    exact      the full MIP (or exact in-house engine)
+    relaxed    the LP bound plus a rounded feasible solution
+    heuristic  a vectorized greedy ratio rule followed by local search
+    anytime    the best MIP incumbent within a time or gap budget
+
+Every fast path returns a feasible solution together with a proven bound on the
+optimum, so the gap of each answer is known.
+"""
+import numpy as np
+
+SOLVE_MODES = ("exact", "relaxed", "heuristic", "anytime")
+
+# Items on each side of the break item searched for improving swaps.
+SWAP_WINDOW = 64
+
+
+def relative_gap(value, bound):
+    """Returns |bound - value| / |value|, Gurobi's MIPGap convention."""
+    if bound == value:
+        return 0.0
+    if value == 0:
+        return float("inf")
+    return abs(bound - value) / abs(value)
+
+
+def _knapsack_order(capacity, values, weights):
+    """
+    Sorts the items that can be part of a solution by decreasing value/weight.
+
+    Returns:
+        A tuple (order, prefix, bound): the sorted item indices, the number of leading
+        items that fit together, and the Dantzig (LP) upper bound.
+    """
+    candidates = np.flatnonzero((values > 0) & (weights <= capacity))
+    ratio = np.divide(values[candidates], weights[candidates], out=np.full(len(candidates), np.inf),
+                      where=weights[candidates] > 0)
+    order = candidates[np.argsort(-ratio, kind="stable")]
+    cumulative = np.cumsum(weights[order])
+    prefix = int(np.searchsorted(cumulative, capacity + 1e-9, side="right"))
+    bound = values[order[:prefix]].sum()
+    if prefix < len(order):
+        residual = capacity - (cumulative[prefix - 1] if prefix else 0.0)
+        bound += values[order[prefix]] * residual / weights[order[prefix]]
+    return order, prefix, float(bound)
+
+
+def knapsack_relaxed(capacity, values, weights):
+    """
+    Solves the LP relaxation of a knapsack (non-negative weights) and rounds it down.
+
+    Returns:
+        A tuple (selected, value, bound): the items of the LP solution without its
+        fractional item, their value and the LP bound.
+    """
+    values, weights = np.asarray(values, dtype=float), np.asarray(weights, dtype=float)
+    order, prefix, bound = _knapsack_order(capacity, values, weights)
+    selected = np.sort(order[:prefix])
+    return selected.tolist(), float(values[selected].sum()), bound
+
+
+def _fill(selected, rest, residual, weights):
+    """Adds items of rest, in order, while they fit; each pass takes a whole fitting prefix."""
+    while len(rest):
+        rest = rest[weights[rest] <= residual + 1e-9]
+        if not len(rest):
+            break
+        cumulative = np.cumsum(weights[rest])
+        count = int(np.searchsorted(cumulative, residual + 1e-9, side="right"))
+        selected[rest[:count]] = True
+        residual -= cumulative[count - 1]
+        rest = rest[count:]
+    return residual
+
+
+def knapsack_greedy(capacity, values, weights, window=SWAP_WINDOW):
+    """
+    Greedy ratio rule with local search for a knapsack with non-negative weights.
+
+    The LP prefix is extended with every later item that still fits, then one-for-one
+    swaps among the items around the break item are applied while they improve the value.
+
+    Returns:
+        A tuple (selected, value, bound) as for knapsack_relaxed.
+    """
+    values, weights = np.asarray(values, dtype=float), np.asarray(weights, dtype=float)
+    order, prefix, bound = _knapsack_order(capacity, values, weights)
+    selected = np.zeros(len(values), dtype=bool)
+    selected[order[:prefix]] = True
+    residual = capacity - weights[order[:prefix]].sum()
+    residual = _fill(selected, order[prefix:], residual, weights)
+
+    core = order[max(prefix - window, 0):prefix + window]
+    for _ in range(len(core)):
+        inside, outside = core[selected[core]], core[~selected[core]]
+        if not len(inside) or not len(outside):
+            break
+        gain = values[outside][None, :] - values[inside][:, None]
+        fits = weights[outside][None, :] - weights[inside][:, None] <= residual + 1e-9
+        gain[~fits] = 0.0
+        i, j = np.unravel_index(np.argmax(gain), gain.shape)
+        if gain[i, j] <= 1e-12:
+            break
+        selected[inside[i]], selected[outside[j]] = False, True
+        residual += weights[inside[i]] - weights[outside[j]]
+    residual = _fill(selected, order[~selected[order]], residual, weights)
+
+    chosen = np.flatnonzero(selected)
+    return chosen.tolist(), float(values[chosen].sum()), bound
+
+
+def diet_lower_bound(requirements, nutrients, food_cost):
+    """
+    Cheap lower bound on the diet cost: the best single-nutrient bound.
+
+    Meeting requirement k costs at least requirement_k times the lowest cost per unit
+    of nutrient k. Valid for non-negative nutrients and costs (0 otherwise).
+    """
+    if np.any(nutrients < 0) or np.any(food_cost < 0):
+        return 0.0
+    cost_per_unit = np.divide(food_cost[None, :], nutrients, out=np.full(nutrients.shape, np.inf),
+                              where=nutrients > 0)
+    cheapest = cost_per_unit.min(axis=1, initial=np.inf)
+    needed = requirements > 0
+    if np.any(np.isinf(cheapest[needed])):
+        return float("inf")  # Some requirement cannot be met
+    return float(np.max(requirements[needed] * cheapest[needed], initial=0.0))
+
+
+def _drop_redundant(x, requirements, nutrients, food_cost):
+    """Removes units while the diet stays feasible, most expensive food first."""
+    slack = nutrients @ x - requirements
+    while True:
+        # Units of each food that can go without breaking any requirement
+        with np.errstate(divide="ignore", invalid="ignore"):
+            limits = np.where(nutrients > 0, np.floor((slack[:, None] + 1e-9) / nutrients), np.inf)
+        removable = np.minimum(limits.min(axis=0), x)
+        removable[food_cost <= 0] = 0
+        candidates = np.flatnonzero(removable >= 1)
+        if not len(candidates):
+            return x
+        j = candidates[np.argmax(food_cost[candidates])]
+        x[j] -= removable[j]
+        slack -= removable[j] * nutrients[:, j]
+
+
+def _diet_fill(x, requirements, nutrients, food_cost, available):
+    """
+    Buys units of the available foods until the requirements are met.
+
+    Each step takes the food with the lowest cost per unit of still-missing nutrients
+    (each nutrient weighted by its requirement), as many units as it can take without
+    overshooting. Returns False if the requirements cannot be met.
+    """
+    remaining = requirements - nutrients @ x
+    scale = np.where(requirements > 0, requirements, 1.0)[:, None]
+    while np.any(remaining > 1e-9):
+        need = np.maximum(remaining, 0.0)[:, None]
+        coverage = (np.minimum(nutrients, need) / scale).sum(axis=0)
+        score = np.divide(food_cost, coverage, out=np.full(len(food_cost), np.inf),
+                          where=(coverage > 1e-12) & available)
+        j = int(np.argmin(score))
+        if not np.isfinite(score[j]):
+            return False
+        column = nutrients[:, j]
+        useful = (column > 0) & (remaining > 1e-9)
+        units = max(1.0, np.floor(np.min(remaining[useful] / column[useful])))
+        x[j] += units
+        remaining -= units * column
+    return True
+
+
+def diet_greedy(requirements, nutrients, food_cost):
+    """
+    Greedy ratio rule with local search for the diet problem.
+
+    After the greedy fill and the removal of redundant units, each food of the diet is
+    in turn taken out entirely and the gap refilled from the other foods, keeping the
+    change whenever it lowers the cost.
+
+    Returns:
+        A tuple (amounts, cost, bound), or None if the requirements cannot be met.
+    """
+    requirements = np.asarray(requirements, dtype=float)
+    nutrients, food_cost = np.asarray(nutrients, dtype=float), np.asarray(food_cost, dtype=float)
+    x = np.zeros(nutrients.shape[1])
+    available = np.ones(len(food_cost), dtype=bool)
+    if not _diet_fill(x, requirements, nutrients, food_cost, available):
+        return None
+    x = _drop_redundant(x, requirements, nutrients, food_cost)
+    cost = food_cost @ x
+
+    improved = True
+    while improved:
+        improved = False
+        for j in np.flatnonzero(x)[np.argsort(-(food_cost * x)[np.flatnonzero(x)])]:
+            candidate = x.copy()
+            candidate[j] = 0.0
+            available[j] = False
+            feasible = _diet_fill(candidate, requirements, nutrients, food_cost, available)
+            available[j] = True
+            if feasible:
+                candidate = _drop_redundant(candidate, requirements, nutrients, food_cost)
+                if food_cost @ candidate < cost - 1e-9:
+                    x, cost, improved = candidate, food_cost @ candidate, True
+                    break
+    return x, float(cost), diet_lower_bound(requirements, nutrients, food_cost)
+
+
+def diet_round(x_lp, requirements, nutrients, food_cost):
+    """
+    Rounds an LP diet up to integers and drops redundant units.
+
+    Returns:
+        The integer amounts, or None if rounding up breaks a requirement (negative nutrients).
+    """
+    requirements = np.asarray(requirements, dtype=float)
+    nutrients, food_cost = np.asarray(nutrients, dtype=float), np.asarray(food_cost, dtype=float)
+    x = np.ceil(np.asarray(x_lp, dtype=float) - 1e-9)
+    if np.any(nutrients @ x < requirements - 1e-9):
+        return None
+    return _drop_redundant(x, requirements, nutrients, food_cost)
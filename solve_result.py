@@ -0,0 +1,148 @@
+"""
+Compact solve results: one typed NumPy array per solution instead of Python objects.
+
+Solve functions decorated with returns_result() accept compact=True and then return a
+SolveResult instead of their usual tuple or dictionary. The solution values are fetched
+from the solver in one bulk query and kept as a float64 array; the legacy formats (lists,
+the name -> value dictionary, the selected item indices) are only built when asked for,
+with legacy().
+
+The array can be handed to other jobs without copying: np.asarray(result), result.buffer()
+(a memoryview), result.save(path) (.npy) or result.to_arrow() (needs pyarrow).
+"""
+import functools
+
+import numpy as np
+
+
+class SolveResult:
+    """
+    Solution of one solve.
+
+    Attributes:
+        problem: "diet", "production_planning" or "knapsack".
+        x: float64 array of the variable values (amounts, production levels, or 0/1 item choices).
+        objective: Objective value.
+        solved: Whether a solution was found; otherwise x is all zeros.
+        runtime: Solve time in seconds (knapsack only, as in the legacy result).
+    """
+
+    __slots__ = ("problem", "x", "objective", "solved", "runtime", "_labels", "_legacy")
+
+    def __init__(self, problem, x, objective, solved=True, runtime=None, labels=None):
+        self.problem = problem
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.objective = float(objective)
+        self.solved = solved
+        self.runtime = runtime
+        self._labels = labels
+        self._legacy = None
+
+    @classmethod
+    def from_legacy(cls, problem, legacy, size):
+        """Wraps the legacy return value of a solve function with size variables."""
+        if problem == "production_planning":
+            if legacy is None:
+                return cls(problem, np.zeros(size), 0.0, solved=False)
+            levels = legacy['production_levels']
+            labels = [name[len("prod_"):] if name.startswith("prod_") else name for name in levels]
+            return cls(problem, np.fromiter(levels.values(), float, len(levels)), legacy['total_profit'],
+                       labels=labels)
+        if problem == "knapsack":
+            x = np.zeros(size)
+            x[legacy[0]] = 1.0
+            solved = len(legacy) == 3  # Failures are ([], 0)
+            return cls(problem, x, legacy[1], solved=solved, runtime=legacy[2] if solved else None)
+        return cls(problem, legacy[0], legacy[1], solved=bool(legacy[1]) or bool(np.any(legacy[0])))
+
+    @property
+    def selected(self):
+        """Indices of the selected knapsack items, as an array."""
+        return np.flatnonzero(self.x > 0.5)
+
+    @property
+    def names(self):
+        """Variable names of a production planning result ("prod_<product name>")."""
+        if self._labels is None:
+            return None
+        return [f"prod_{label}" for label in self._labels]
+
+    def legacy(self):
+        """Returns the result in the format of the original solve functions (built once, then cached)."""
+        if self._legacy is None:
+            self._legacy = self._build_legacy()
+        return self._legacy
+
+    def _build_legacy(self):
+        if self.problem == "production_planning":
+            if not self.solved:
+                return None
+            return {'production_levels': dict(zip(self.names, self.x.tolist())), 'total_profit': self.objective}
+        if self.problem == "knapsack":
+            if not self.solved:
+                return [], 0
+            return self.selected.tolist(), self.objective, self.runtime
+        if not self.solved:
+            return [0] * len(self.x), 0
+        return self.x.tolist(), self.objective
+
+    def __len__(self):
+        return len(self.x)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.x.dtype:
+            return self.x.copy() if copy else self.x
+        return self.x.astype(dtype)
+
+    def buffer(self):
+        """Returns a read-only memoryview of the values, sharing their memory."""
+        view = self.x.view()
+        view.flags.writeable = False
+        return memoryview(view)
+
+    def save(self, path):
+        """Writes the values to a .npy file (streamed from the array, no intermediate copy)."""
+        np.save(path, self.x, allow_pickle=False)
+
+    def to_arrow(self):
+        """
+        Returns the values as a pyarrow RecordBatch with an "x" column, sharing their memory.
+
+        Raises ImportError if pyarrow is not installed.
+        """
+        import pyarrow as pa
+
+        return pa.record_batch([pa.array(self.x)], names=["x"])
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "_legacy"}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._legacy = None
+
+    def __repr__(self):
+        return f"SolveResult({self.problem}, {len(self.x)} variables, objective={self.objective}, solved={self.solved})"
+
+
+def returns_result(problem):
+    """
+    Decorator adding the compact keyword to a solve function.
+
+    The function may return either a SolveResult or its legacy value; callers get the
+    legacy value by default and a SolveResult with compact=True.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, compact=False, **kwargs):
+            result = func(*args, **kwargs)
+            if not compact:
+                return result.legacy() if isinstance(result, SolveResult) else result
+            if isinstance(result, SolveResult):
+                return result
+            from solver_backends import instance_size
+
+            return SolveResult.from_legacy(problem, result, instance_size(problem, args, kwargs))
+        return wrapper
+    return decorate
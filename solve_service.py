@@ -0,0 +1,295 @@
+"""
+Long-running local solve service over localhost HTTP or a Unix socket.
+
+    python -m solve_service --port 8765
+    curl -d '{"capacity": 10, "values": [3, 4], "weights": [6, 5]}' localhost:8765/solve/knapsack
+    curl localhost:8765/metrics
+
+Requests are dispatched to a pool of worker processes, each keeping one warm Gurobi
+environment for every solve it runs. Exact results are cached, concurrent identical
+requests are coalesced into one solve, and small requests arriving within batch_window
+seconds of each other are solved together through the solve_*_batch functions.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import optimization_solver
+import solver_pool
+from optimization_cli import RESULT_FIELDS, format_result
+from solution_cache import MISSING, SolutionCache, canonical_key, is_cacheable
+
+# Instances with at most this many variables are micro-batched.
+BATCH_MAX_SIZE = 200
+
+# Argument names of each problem, and the one whose length is the instance size.
+_ARGS = {
+    "diet": (optimization_solver.DIET_ARGS, "food_cost"),
+    "production_planning": (optimization_solver.PRODUCTION_PLANNING_ARGS, "products"),
+    "knapsack": (optimization_solver.KNAPSACK_ARGS, "values"),
+}
+
+
+def _solve_batch(problem, instances):
+    """Solves a list of argument dictionaries in a worker process, in its shared environment."""
+    return getattr(optimization_solver, f"solve_{problem}_batch")(instances, env=solver_pool._worker_env)
+
+
+def _solve_one(problem, kwargs):
+    """Solves one instance in a worker process, in its shared environment when it has one."""
+    if solver_pool._worker_env is not None:
+        kwargs = dict(kwargs, env=solver_pool._worker_env)
+    return getattr(optimization_solver, f"solve_{problem}")(**kwargs)
+
+
+class SolveService:
+    """
+    Asynchronous front door to the solvers, shared by every client.
+
+    Args:
+        executor: concurrent.futures executor running the solves (defaults to a
+            ProcessPoolExecutor with the given number of processes, each starting one
+            quiet Gurobi environment). A custom process pool can share that setup with
+            initializer=solver_pool._init_worker.
+        processes: Number of worker processes of the default executor.
+        batch_window: How long (in seconds) a small request waits for others to batch with.
+        max_batch: Largest number of instances solved in one batch.
+        latency_samples: Number of recent request latencies kept for the percentiles.
+        cache: SolutionCache answering repeated exact requests without a solve
+            (defaults to an in-memory one).
+        env_params: Optional Gurobi parameters of the default executor's worker
+            environments (defaults to {"Threads": 1}, as in SolverPool).
+    """
+
+    def __init__(self, executor=None, processes=None, batch_window=0.005, max_batch=64, latency_samples=10000,
+                 cache=None, env_params=None):
+        self._owns_executor = executor is None
+        if executor is None:
+            if env_params is None:
+                env_params = {"Threads": 1}
+            executor = ProcessPoolExecutor(max_workers=processes, initializer=solver_pool._init_worker,
+                                           initargs=(env_params,))
+        self.executor = executor
+        self._owns_cache = cache is None
+        self.cache = SolutionCache() if cache is None else cache
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._inflight = {}
+        self._batches = {}
+        # Strong references to the running tasks: the event loop only keeps weak ones
+        self._tasks = set()
+        self._latencies = deque(maxlen=latency_samples)
+        self.requests = self.cache_hits = self.coalesced = self.batches = self.solves = 0
+
+    async def submit(self, problem, kwargs):
+        """
+        Solves one instance.
+
+        Args:
+            problem: "diet", "production_planning" or "knapsack".
+            kwargs: Arguments of the matching optimization_solver function, by name.
+
+        Returns:
+            The solver's usual return value.
+        """
+        if problem not in RESULT_FIELDS:
+            raise ValueError(f"Unknown problem: {problem}")
+        start = time.perf_counter()
+        self.requests += 1
+        key = canonical_key(problem, (), kwargs, getattr(optimization_solver, f"solve_{problem}"))
+        cacheable = is_cacheable(kwargs)
+        try:
+            if cacheable:
+                result = self.cache.get(key)
+                if result is not MISSING:
+                    self.cache_hits += 1
+                    return result
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                future.add_done_callback(lambda done: self._settled(key, done, cacheable))
+                arg_names, size_arg = _ARGS[problem]
+                # Only plain instances batch; extra options such as engine= are solved on their own
+                if set(kwargs) == set(arg_names) and len(kwargs[size_arg]) <= BATCH_MAX_SIZE:
+                    self._enqueue(problem, kwargs, future)
+                else:
+                    self._spawn(self._run_one(problem, kwargs, future))
+            return await asyncio.shield(future)
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+
+    def _settled(self, key, future, cacheable):
+        del self._inflight[key]
+        if cacheable and not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _enqueue(self, problem, kwargs, future):
+        batch = self._batches.get(problem)
+        if batch is None:
+            batch = self._batches[problem] = []
+            asyncio.get_running_loop().call_later(self.batch_window, self._flush, problem, batch)
+        batch.append((kwargs, future))
+        if len(batch) >= self.max_batch:
+            self._flush(problem, batch)
+
+    def _flush(self, problem, batch):
+        if self._batches.get(problem) is not batch:
+            return  # Already flushed because it was full
+        del self._batches[problem]
+        self._spawn(self._run_batch(problem, batch))
+
+    async def _run_batch(self, problem, batch):
+        self.batches += 1
+        self.solves += len(batch)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, _solve_batch, problem, [kw for kw, _ in batch])
+        except Exception:
+            # One bad instance fails the whole batch: retry them one by one to isolate it
+            self.solves -= len(batch)
+            for kwargs, future in batch:
+                self._spawn(self._run_one(problem, kwargs, future))
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _run_one(self, problem, kwargs, future):
+        self.solves += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, _solve_one, problem, kwargs)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    def metrics(self):
+        """Returns request counters, queue depth and latency percentiles (in milliseconds)."""
+        latencies = sorted(self._latencies)
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return 1000 * latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'coalesced': self.coalesced,
+            'solves': self.solves,
+            'batches': self.batches,
+            'queue_depth': len(self._inflight),
+            'latency_p50_ms': percentile(0.50),
+            'latency_p99_ms': percentile(0.99),
+        }
+
+    def close(self):
+        """Shuts the default executor and cache down."""
+        if self._owns_executor:
+            self.executor.shutdown(cancel_futures=True)
+        if self._owns_cache:
+            self.cache.close()
+
+
+class InProcessClient:
+    """Client calling a SolveService in the same event loop, e.g. from tests."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def solve(self, problem, **kwargs):
+        """Returns the JSON-friendly result of one solve, as the HTTP front-end would."""
+        return format_result(problem, await self.service.submit(problem, kwargs))
+
+    def metrics(self):
+        return self.service.metrics()
+
+
+async def _handle_http(service, reader, writer):
+    """Serves one HTTP/1.1 request: POST /solve/<problem> or GET /metrics."""
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+        status, payload = 404, {'error': "not found"}
+        if len(request_line) >= 2:
+            method, path = request_line[0], request_line[1]
+            if method == "GET" and path == "/metrics":
+                status, payload = 200, service.metrics()
+            elif method == "POST" and path.startswith("/solve/"):
+                problem = path[len("/solve/"):]
+                try:
+                    result = await service.submit(problem, json.loads(body or b"{}"))
+                    status, payload = 200, format_result(problem, result)
+                except (ValueError, TypeError, KeyError) as e:
+                    status, payload = 400, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+
+        data = json.dumps(payload).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+        await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=8765, unix_path=None):
+    """Starts the HTTP front-end on a TCP port or a Unix socket and returns the asyncio server."""
+    def handler(reader, writer):
+        return _handle_http(service, reader, writer)
+
+    if unix_path is not None:
+        return await asyncio.start_unix_server(handler, path=unix_path)
+    return await asyncio.start_server(handler, host, port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m solve_service", description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--processes", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--batch-window", type=float, default=0.005, help="micro-batching window in seconds")
+    parser.add_argument("--cache", metavar="PATH", help="SQLite file keeping cached solutions across restarts")
+    args = parser.parse_args(argv)
+
+    async def run():
+        cache = SolutionCache(path=args.cache)
+        service = SolveService(processes=args.processes, batch_window=args.batch_window, cache=cache)
+        server = await serve(service, args.host, args.port, args.unix)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+            cache.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
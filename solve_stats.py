@@ -0,0 +1,195 @@
+"""
+Per-solve instrumentation: phase timings, model size and search statistics.
+
+Every solve function decorated with instrumented() accepts return_stats=True and then
+returns (result, SolveStats) instead of its usual result:
+
+    result, stats = solve_knapsack(capacity, values, weights, return_stats=True)
+    print(stats.times, stats.backend)
+
+Hooks registered with add_hook() see every instrumented solve, whether or not the caller
+asked for the stats, which is how traces and metrics are exported. set_profiling(True)
+additionally runs each solve under cProfile and keeps the result in stats.profile.
+"""
+import cProfile
+import functools
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+PHASES = ("parse", "build", "optimize", "extract")
+
+_current = ContextVar("solve_stats", default=None)
+_hooks = []
+_profiling = False
+
+
+class SolveStats:
+    """
+    Performance record of one solve.
+
+    Attributes:
+        problem: "diet", "production_planning" or "knapsack".
+        backend: Engine that produced the solution ("gurobi", "highs", "native", "dp", "bnb", or the
+            "lp" and "greedy" fast paths of solve_modes).
+        times: Seconds spent in each phase of PHASES that ran.
+        num_vars, num_constrs, num_nonzeros: Size of the model.
+        node_count: Branch-and-bound nodes explored, when the engine reports it.
+        mip_gap: Relative gap of the returned solution (0.0 when proven optimal).
+        objective: Objective value of the returned solution, when a solver model reports it.
+        bound: Best proven bound on the optimal objective, when known.
+        profile: pstats.Stats of the solve when profiling was enabled, else None.
+    """
+
+    def __init__(self, problem, backend=None):
+        self.problem = problem
+        self.backend = backend
+        self.times = {}
+        self.num_vars = self.num_constrs = self.num_nonzeros = None
+        self.node_count = self.mip_gap = self.objective = self.bound = None
+        self.profile = None
+
+    @property
+    def total_time(self):
+        return sum(self.times.values())
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager adding the time spent in its block to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.times[name] = self.times.get(name, 0.0) + seconds
+            for hook in _hooks:
+                hook.on_phase(self, name, seconds)
+
+    def as_dict(self):
+        """Returns the stats as a JSON-friendly dictionary (without the profile)."""
+        return {
+            'problem': self.problem,
+            'backend': self.backend,
+            'times': dict(self.times),
+            'total_time': self.total_time,
+            'num_vars': self.num_vars,
+            'num_constrs': self.num_constrs,
+            'num_nonzeros': self.num_nonzeros,
+            'node_count': self.node_count,
+            'mip_gap': self.mip_gap,
+            'objective': self.objective,
+            'bound': self.bound,
+        }
+
+    def __getstate__(self):
+        # pstats.Stats does not pickle; results coming back from worker processes drop it
+        state = self.__dict__.copy()
+        state['profile'] = None
+        return state
+
+    def __repr__(self):
+        times = ", ".join(f"{name}={seconds * 1000:.2f}ms" for name, seconds in self.times.items())
+        return f"SolveStats({self.problem}, backend={self.backend}, {times}, vars={self.num_vars})"
+
+
+class SolveHook:
+    """Base class of hooks; override the events of interest."""
+
+    def on_phase(self, stats, phase, seconds):
+        """Called at the end of each phase of a solve (for tracing)."""
+
+    def on_solve(self, stats):
+        """Called once a solve has finished, with its complete stats (for metrics export)."""
+
+
+def add_hook(hook):
+    """Registers a SolveHook for every subsequent instrumented solve."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+
+
+def set_profiling(enabled):
+    """Turns cProfile profiling of every instrumented solve on or off."""
+    global _profiling
+    _profiling = enabled
+
+
+def current():
+    """Returns the SolveStats of the solve running in this context, or None."""
+    return _current.get()
+
+
+def phase(name):
+    """Times a block as the named phase of the current solve (no-op when none is recorded)."""
+    stats = _current.get()
+    return nullcontext() if stats is None else stats.phase(name)
+
+
+def record(**fields):
+    """Sets fields of the current solve's stats (no-op when none is recorded)."""
+    stats = _current.get()
+    if stats is not None:
+        for name, value in fields.items():
+            setattr(stats, name, value)
+
+
+def record_model(m):
+    """
+    Records the size, objective and bound of a solved Gurobi model in the current stats,
+    and for a MIP its node count and gap.
+    """
+    stats = _current.get()
+    if stats is None:
+        return
+    # Imported here so solve_stats stays light; a Gurobi model means gurobipy is loaded already
+    from gurobipy import GRB
+
+    stats.num_vars, stats.num_constrs, stats.num_nonzeros = m.NumVars, m.NumConstrs, m.NumNZs
+    if m.SolCount > 0:
+        stats.objective = m.ObjVal
+        if m.IsMIP:
+            stats.node_count = int(m.NodeCount)
+            stats.mip_gap = m.MIPGap
+            stats.bound = m.ObjBound
+        elif m.Status == GRB.OPTIMAL:  # An optimal LP solution proves its own value
+            stats.bound = m.ObjVal
+
+
+def instrumented(problem, backend):
+    """
+    Decorator adding the return_stats keyword to a solve function.
+
+    Args:
+        problem: Problem type recorded in the stats.
+        backend: Default backend recorded in the stats; the function may override it
+            with record(backend=...).
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, return_stats=False, **kwargs):
+            if not (return_stats or _hooks or _profiling):
+                return func(*args, **kwargs)
+            stats = SolveStats(problem, backend)
+            # A solve nested in a profiled one is already covered by the outer profiler
+            profiler = cProfile.Profile() if _profiling and _current.get() is None else None
+            token = _current.set(stats)
+            try:
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    result = func(*args, **kwargs)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+                        stats.profile = pstats.Stats(profiler)
+            finally:
+                _current.reset(token)
+            for hook in _hooks:
+                hook.on_solve(stats)
+            return (result, stats) if return_stats else result
+        return wrapper
+    return decorate
@@ -0,0 +1,84 @@
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class SolveSignals(QObject):
+    """Signals emitted by a SolveWorker, delivered on the GUI thread."""
+    progress = pyqtSignal(dict)
+    finished = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    error = pyqtSignal(str)
+
+
+class SolveWorker(QRunnable):
+    """
+    Runs one solver call on a QThreadPool thread.
+
+    The solver is given a Gurobi callback that streams progress (incumbent, bound, gap
+    and elapsed time) through signals.progress at most every progress_interval seconds,
+    and terminates the model once cancel() has been called.
+
+    Args:
+        func: One of the optimization_solver solve functions.
+        *args, **kwargs: Arguments passed to func.
+        progress_interval: Minimum time between two progress signals (in seconds).
+    """
+
+    def __init__(self, func, *args, progress_interval=0.25, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.progress_interval = progress_interval
+        self.signals = SolveSignals()
+        self._cancelled = False
+        self._last_progress = float("-inf")
+
+    def cancel(self):
+        """Asks the running solve to stop; signals.cancelled is emitted instead of finished."""
+        self._cancelled = True
+
+    def _callback(self, model, where):
+        from optimization_solver import GRB
+
+        if self._cancelled:
+            model.terminate()
+            return
+        if where != GRB.Callback.MIP:
+            return
+        now = time.monotonic()
+        if now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        best = model.cbGet(GRB.Callback.MIP_OBJBST)
+        bound = model.cbGet(GRB.Callback.MIP_OBJBND)
+        has_incumbent = abs(best) < GRB.INFINITY
+        self.signals.progress.emit({
+            'incumbent': best if has_incumbent else None,
+            'bound': bound,
+            'gap': abs(bound - best) / max(abs(best), 1e-10) if has_incumbent else None,
+            'elapsed': model.cbGet(GRB.Callback.RUNTIME),
+        })
+
+    def run(self):
+        try:
+            result = self.func(*self.args, callback=self._callback, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        if self._cancelled:
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
+
+
+def format_progress(progress):
+    """Formats a progress dict from SolveWorker as one line for the results pane."""
+    parts = [f"{progress['elapsed']:.1f}s"]
+    if progress['incumbent'] is not None:
+        parts.append(f"incumbent {progress['incumbent']:.2f}")
+    parts.append(f"bound {progress['bound']:.2f}")
+    if progress['gap'] is not None:
+        parts.append(f"gap {100 * progress['gap']:.2f}%")
+    return "  ".join(parts)
@@ -0,0 +1,156 @@
+"""
+Registry of solver backends, imported lazily on first use.
+
+    gurobi  optimization_solver (Gurobi; knapsacks forced onto the Gurobi MIP)
+    highs   highs_solver (SciPy's HiGHS MILP)
+    native  native_solver (NumPy only: knapsack DP / branch-and-bound, small-IP simplex)
+
+Importing this module imports none of them, so callers only pay for the backend they
+actually use.
+"""
+import importlib
+import importlib.util
+import inspect
+from functools import partial
+
+PROBLEMS = ("diet", "production_planning", "knapsack")
+
+# Without Gurobi, diet and production planning instances up to this many variables go to
+# the native engine rather than HiGHS.
+NATIVE_MAX_VARS = 8
+
+# Keywords added by the instrumented and returns_result decorators, accepted by every backend.
+DECORATOR_KWARGS = ("compact", "return_stats")
+
+
+def _module_backend(module_name, **knapsack_kwargs):
+    def load():
+        module = importlib.import_module(module_name)
+        functions = {problem: getattr(module, f"solve_{problem}") for problem in PROBLEMS}
+        if knapsack_kwargs:
+            functions["knapsack"] = partial(functions["knapsack"], **knapsack_kwargs)
+        return functions
+    return load
+
+
+def _has_milp():
+    if importlib.util.find_spec("scipy") is None:
+        return False
+    from scipy import optimize
+
+    return hasattr(optimize, "milp")
+
+
+# name -> (loader returning {problem: function}, availability check)
+_BACKENDS = {
+    "gurobi": (_module_backend("optimization_solver", engine="gurobi"),
+               lambda: importlib.util.find_spec("gurobipy") is not None),
+    "highs": (_module_backend("highs_solver"), _has_milp),
+    "native": (_module_backend("native_solver"), lambda: True),
+}
+_loaded = {}
+
+
+def register_backend(name, load, available=lambda: True):
+    """
+    Registers a backend.
+
+    Args:
+        name: Name used to select the backend.
+        load: Callable returning a dictionary mapping each problem of PROBLEMS to a
+            function with the signature of the optimization_solver one. Called once,
+            on first use.
+        available: Callable telling whether the backend can be loaded on this machine.
+    """
+    _BACKENDS[name] = (load, available)
+    _loaded.pop(name, None)
+
+
+def available_backends():
+    """Returns the names of the backends that can be used on this machine."""
+    return [name for name, (_, available) in _BACKENDS.items() if available()]
+
+
+def get_backend(name):
+    """Returns the {problem: function} dictionary of a backend, loading it if needed."""
+    if name not in _loaded:
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown backend: {name}")
+        _loaded[name] = _BACKENDS[name][0]()
+    return _loaded[name]
+
+
+def choose_backend(problem, size):
+    """
+    Picks a backend for an instance with the given number of variables.
+
+    Knapsacks go to the native DP / branch-and-bound engines. Diet and production
+    planning go to Gurobi when it is installed; otherwise small instances go to the
+    native engine and larger ones to HiGHS.
+    """
+    if problem == "knapsack":
+        return "native"
+    if _BACKENDS["gurobi"][1]():
+        return "gurobi"
+    if size <= NATIVE_MAX_VARS or not _BACKENDS["highs"][1]():
+        return "native"
+    return "highs"
+
+
+def instance_size(problem, args, kwargs):
+    """Returns the number of variables of a solve call's instance."""
+    names = {"diet": ("food_cost", 6), "production_planning": ("products", 2), "knapsack": ("values", 1)}
+    name, position = names[problem]
+    return len(kwargs[name] if name in kwargs else args[position])
+
+
+def accepts(function, name):
+    """Tells whether a backend function takes the keyword argument name."""
+    return name in DECORATOR_KWARGS or name in inspect.signature(function).parameters
+
+
+def select(problem, args, kwargs, backend="auto"):
+    """
+    Returns the function solving a call's instance with the named backend, or one chosen
+    by choose_backend.
+
+    Options such as mode, engine or time_limit are only taken by optimization_solver:
+    "auto" sends calls using them there, and a named backend that does not take them
+    raises ValueError.
+
+    Args:
+        problem: "diet", "production_planning" or "knapsack".
+        args, kwargs: Arguments of the solve call.
+        backend: A registered backend name, or "auto".
+    """
+    if backend == "auto":
+        backend = choose_backend(problem, instance_size(problem, args, kwargs))
+        if problem == "knapsack":
+            weights = kwargs["weights"] if "weights" in kwargs else args[2]
+            if any(w < 0 for w in weights):
+                # Only the MIP backends handle negative weights
+                backend = next((name for name in ("gurobi", "highs") if _BACKENDS[name][1]()), "native")
+        function = get_backend(backend)[problem]
+        if not all(accepts(function, name) for name in kwargs):
+            return getattr(importlib.import_module("optimization_solver"), f"solve_{problem}")
+        return function
+    function = get_backend(backend)[problem]
+    unsupported = [name for name in kwargs if not accepts(function, name)]
+    if unsupported:
+        raise ValueError(f"The {backend} backend does not support {', '.join(unsupported)} for {problem}.")
+    return function
+
+
+def solve(problem, *args, backend="auto", **kwargs):
+    """
+    Solves an instance with the named backend, or one chosen by choose_backend (see select).
+
+    Args:
+        problem: "diet", "production_planning" or "knapsack".
+        *args, **kwargs: Arguments of the matching optimization_solver function.
+        backend: A registered backend name, or "auto".
+
+    Returns:
+        The solver's usual return value.
+    """
+    return select(problem, args, kwargs, backend)(*args, **kwargs)
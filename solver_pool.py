@@ -0,0 +1,241 @@
+import concurrent.futures
+import heapq
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import InvalidStateError, ProcessPoolExecutor
+
+import optimization_solver
+
+# Problem names accepted by SolverPool, mapped to the solver function each one runs.
+SOLVERS = {
+    "diet": optimization_solver.solve_diet,
+    "production_planning": optimization_solver.solve_production_planning,
+    "knapsack": optimization_solver.solve_knapsack,
+}
+
+# Gurobi environment of the current worker process, started once by _init_worker.
+_worker_env = None
+# Queue on which the current worker reports the tasks with a timeout it starts.
+_started = None
+
+
+def _init_worker(env_params, started=None):
+    """Starts the worker's Gurobi environment, reused by every task the worker runs."""
+    global _worker_env, _started
+    _started = started
+    if optimization_solver.Env is None:
+        return
+    try:
+        _worker_env = optimization_solver._quiet_env()
+        for name, value in (env_params or {}).items():
+            _worker_env.setParam(name, value)
+    except optimization_solver.GurobiError:
+        # No license: the in-house knapsack engines still work, Gurobi solves will raise
+        _worker_env = None
+
+
+def _run_task(problem, args, kwargs, timeout, backend, task_id=None):
+    """Runs one solve inside a worker process; timeout also stops a Gurobi solve early."""
+    if task_id is not None:
+        _started.put(task_id)
+    solve = SOLVERS[problem]
+    if backend is not None:
+        import solver_backends
+
+        solve = solver_backends.select(problem, args, kwargs, backend)
+        if not solver_backends.accepts(solve, "env"):
+            return solve(*args, **kwargs)
+    if _worker_env is not None:
+        _worker_env.setParam("TimeLimit", float("inf") if timeout is None else timeout)
+        kwargs = dict(kwargs, env=_worker_env)
+    return solve(*args, **kwargs)
+
+
+class _Deadlines:
+    """
+    Fails the futures of tasks still running timeout seconds after they started.
+
+    Workers report each task they start on a queue. One thread per pool reads the
+    reports, keeps the deadlines in a heap and sleeps until the next deadline or report.
+    A worker process cannot be interrupted, so a task still running at its deadline
+    finishes in the background and its result is dropped.
+    """
+
+    def __init__(self):
+        self.started = multiprocessing.Queue()
+        self._tasks = {}  # task id -> [deadline future, worker future, timeout]
+        self._ids = itertools.count()
+        self._thread = None
+
+    def submit(self, submit, timeout):
+        """
+        Calls submit(task_id), which schedules the task, and returns a future following
+        the task's, or failing with TimeoutError once it has run for timeout seconds.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="SolverPool deadlines", daemon=True)
+            self._thread.start()
+        task_id = next(self._ids)
+        deadline = concurrent.futures.Future()
+        entry = self._tasks[task_id] = [deadline, None, timeout]
+        future = entry[1] = submit(task_id)
+
+        def settle(done):
+            self._tasks.pop(task_id, None)
+            try:
+                if done.cancelled():
+                    deadline.cancel()
+                elif done.exception() is not None:
+                    deadline.set_exception(done.exception())
+                else:
+                    deadline.set_result(done.result())
+            except InvalidStateError:
+                pass  # Already timed out or cancelled
+
+        def cancelled(done):
+            if done.cancelled():
+                future.cancel()
+
+        deadline.add_done_callback(cancelled)
+        future.add_done_callback(settle)
+        return deadline
+
+    def _run(self):
+        heap = []
+        while True:
+            wait = max(heap[0][0] - time.monotonic(), 0) if heap else None
+            try:
+                task_id = self.started.get(timeout=wait)
+                if task_id is None:
+                    return  # Pool shut down
+                entry = self._tasks.get(task_id)
+                if entry is not None:
+                    heapq.heappush(heap, (time.monotonic() + entry[2], task_id))
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            while heap and heap[0][0] <= now:
+                _, task_id = heapq.heappop(heap)
+                entry = self._tasks.pop(task_id, None)
+                if entry is not None:
+                    self._expire(entry)
+
+    @staticmethod
+    def _expire(entry):
+        deadline, future, timeout = entry
+        try:
+            deadline.set_exception(TimeoutError(f"The solve did not finish within {timeout} s"))
+        except InvalidStateError:
+            return  # Finished or cancelled meanwhile
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        """Stops the scheduler thread."""
+        if self._thread is not None:
+            self.started.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class SolverPool:
+    """
+    Spreads independent solve requests over a pool of worker processes.
+
+    Each worker starts its own quiet Gurobi environment once and reuses it for every
+    request it handles, so tasks only pay for building and solving their model.
+
+    Args:
+        processes: Number of worker processes (defaults to the number of CPUs).
+        env_params: Optional Gurobi parameters applied to every worker environment,
+            e.g. {"Threads": 1} to keep each worker on one core.
+        backend: Optional solver_backends name (or "auto") used for every task; by
+            default tasks run the optimization_solver functions.
+    """
+
+    def __init__(self, processes=None, env_params=None, backend=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.backend = backend
+        if env_params is None:
+            env_params = {"Threads": 1}
+        self._deadlines = _Deadlines()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes, initializer=_init_worker, initargs=(env_params, self._deadlines.started)
+        )
+
+    def submit(self, problem, *args, timeout=None, **kwargs):
+        """
+        Schedules one solve.
+
+        Args:
+            problem: "diet", "production_planning" or "knapsack".
+            *args, **kwargs: Arguments of the matching optimization_solver function,
+                including its own time_limit (e.g. for mode="anytime").
+            timeout: Optional wall-clock limit for this task (in seconds), counted from
+                when a worker starts it, so time spent queued does not count. Once it
+                passes, the future fails with TimeoutError whatever the engine; a Gurobi
+                solve is also stopped at that time limit.
+
+        Returns:
+            A concurrent.futures.Future holding the solver's usual return value.
+            Calling cancel() on it drops the task if it has not started yet.
+        """
+        if problem not in SOLVERS:
+            raise ValueError(f"Unknown problem: {problem}")
+        if timeout is None:
+            return self._executor.submit(_run_task, problem, args, kwargs, None, self.backend)
+        return self._deadlines.submit(
+            lambda task_id: self._executor.submit(_run_task, problem, args, kwargs, timeout, self.backend, task_id),
+            timeout
+        )
+
+    def map(self, problem, instances, task_timeout=None, timeout=None, **kwargs):
+        """
+        Solves a sequence of instances and yields the results in input order.
+
+        Args:
+            problem: "diet", "production_planning" or "knapsack".
+            instances: Argument tuples for the matching optimization_solver function.
+            task_timeout: Optional wall-clock limit for each task (in seconds), as for submit.
+            timeout: Optional wall-clock limit for the whole map (in seconds); raises
+                TimeoutError when exceeded and cancels the tasks that did not start.
+            **kwargs: Keyword arguments passed to every solve (e.g. mode, time_limit).
+
+        Returns:
+            An iterator over the results, in the order of the instances.
+        """
+        futures = [self.submit(problem, *instance, timeout=task_timeout, **kwargs) for instance in instances]
+        return self._iter_results(futures, timeout)
+
+    @staticmethod
+    def _iter_results(futures, timeout):
+        try:
+            if timeout is not None:
+                _, not_done = concurrent.futures.wait(futures, timeout=timeout)
+                if not_done:
+                    raise TimeoutError(f"{len(not_done)} solves did not finish within {timeout} s")
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    @staticmethod
+    def as_completed(futures, timeout=None):
+        """Yields the given futures as they finish, like concurrent.futures.as_completed."""
+        return concurrent.futures.as_completed(futures, timeout=timeout)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """Stops the workers, optionally cancelling the tasks that have not started."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        self._deadlines.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(cancel_futures=exc_type is not None)
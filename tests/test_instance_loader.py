@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from instance_loader import iter_csv_chunks, load_knapsack, load_products
+
+
+@pytest.mark.parametrize("rows", [6, 7])
+def test_csv_chunks_cover_every_row(tmp_path, rows):
+    path = tmp_path / "items.csv"
+    path.write_text("Value, Weight\n" + "\n".join(f"{k},{k / 2}" for k in range(rows)))
+    chunks = list(iter_csv_chunks(path, ["value", "weight"], chunk_rows=3))
+    assert [len(chunk["value"]) for chunk in chunks] == [3, 3, 1][:-(-rows // 3)]
+    np.testing.assert_array_equal(np.concatenate([chunk["weight"] for chunk in chunks]), np.arange(rows) / 2)
+    values, weights = load_knapsack(path)
+    np.testing.assert_array_equal(values, np.arange(rows))
+    np.testing.assert_array_equal(weights, np.arange(rows) / 2)
+
+
+def test_csv_text_columns(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("name,labor,materials,profit,min_production\n"
+                    "Chairs, 2, 3, 10, 1\nTables,4,5,30,0\nDesks,6,1,20,2\n")
+    chunks = list(iter_csv_chunks(path, ["profit"], chunk_rows=2, text_columns=["name"]))
+    assert [list(chunk["name"]) for chunk in chunks] == [["Chairs", "Tables"], ["Desks"]]
+    assert [list(chunk["profit"]) for chunk in chunks] == [[10, 30], [20]]
+    assert list(load_products(path)["names"]) == ["Chairs", "Tables", "Desks"]
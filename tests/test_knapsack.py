@@ -0,0 +1,14 @@
+import pytest
+
+from optimization_solver import solve_knapsack
+
+
+def test_explicit_dp_scales_decimal_weights():
+    selected, value, _ = solve_knapsack(4.5, [10, 10], [2.4, 2.4], engine="dp")
+    assert len(selected) == 1
+    assert value == 10
+
+
+def test_explicit_dp_rejects_weights_without_integer_scale():
+    with pytest.raises(ValueError):
+        solve_knapsack(4.5, [10, 10], [2.41234, 2.4], engine="dp")
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+import knapsack_session
+from knapsack_session import KnapsackSession
+from optimization_solver import solve_knapsack
+
+
+def test_dp_session_matches_a_fresh_solve():
+    rng = np.random.default_rng(0)
+    values, weights = rng.integers(1, 50, 40).tolist(), rng.integers(1, 30, 40).tolist()
+    session = KnapsackSession(200, values, weights, engine="dp")
+    session.add_item(45, 7)
+    session.remove_item(3)
+    session.update_item(10, value=60)
+    session.set_capacity(150)
+    _, value, _ = session.solve()
+    values = values[:3] + values[4:] + [45]
+    weights = weights[:3] + weights[4:] + [7]
+    values[9] = 60
+    assert value == solve_knapsack(150, values, weights, engine="dp")[1]
+
+
+def test_dp_session_table_stays_within_its_byte_limit(monkeypatch):
+    monkeypatch.setattr(knapsack_session, "DP_TABLE_BYTES", 100_000)
+    # 65 spare rows of 101 float64 cells fit, 201 cells do not
+    assert KnapsackSession(100, [1, 2], [1, 2], engine="auto").engine == "dp"
+    assert KnapsackSession(200, [1, 2], [1, 2], engine="auto").engine != "dp"
+    with pytest.raises(ValueError, match="DP_TABLE_BYTES"):
+        KnapsackSession(200, [1, 2], [1, 2], engine="dp")
+    session = KnapsackSession(100, [1, 2], [1, 2], engine="dp")
+    session.set_capacity(200)
+    assert session.engine != "dp"
@@ -0,0 +1,36 @@
+import itertools
+
+import numpy as np
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from multi_knapsack import pareto_front
+
+
+def brute_force_front(capacities, objectives, weights):
+    """Returns the set of efficient objective vectors by enumerating every selection."""
+    count = objectives.shape[1]
+    points = set()
+    for bits in itertools.product((0, 1), repeat=count):
+        x = np.array(bits)
+        if np.all(weights @ x <= capacities):
+            points.add(tuple((objectives @ x).tolist()))
+    return {p for p in points
+            if not any(q != p and all(a >= b for a, b in zip(q, p)) for q in points)}
+
+
+def test_three_objective_front_matches_brute_force():
+    rng = np.random.default_rng(7)
+    objectives = rng.integers(0, 6, (3, 10)).astype(float)
+    weights = rng.integers(1, 10, (2, 10)).astype(float)
+    capacities = weights.sum(axis=1) / 2
+
+    expected = brute_force_front(capacities, objectives, weights)
+    # A step of at most 1 between bounds reaches every integer objective value
+    points = int(objectives.sum(axis=1).max()) + 1
+    front = pareto_front(capacities, objectives, weights, points=points)
+
+    assert {tuple(row) for row in front['objectives'].tolist()} == expected
+    assert len(front['runtime']) == len(expected)
+    assert np.all(front['runtime'] >= 0)
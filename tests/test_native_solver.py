@@ -0,0 +1,33 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from native_solver import solve_diet, solve_ip
+
+
+def knapsack_ip(n=30, seed=3):
+    rng = np.random.default_rng(seed)
+    values, weights = rng.integers(10, 100, n), rng.integers(10, 100, (1, n))
+    return -values.astype(float), weights.astype(float), [weights.sum() / 2], np.zeros(n), np.ones(n)
+
+
+def test_finished_search_proves_its_objective():
+    x, objective, bound = solve_ip(*knapsack_ip(n=8))
+    assert bound == objective
+
+
+def test_truncated_search_reports_a_lower_bound():
+    x, objective, bound = solve_ip(*knapsack_ip(), max_nodes=5)
+    assert bound < objective
+    _, optimum, _ = solve_ip(*knapsack_ip())
+    assert bound <= optimum <= objective
+
+
+def test_diet_records_bound_and_gap():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # A proven optimum must not warn
+        (amounts, cost), stats = solve_diet(2000, 50, 70, [200, 400, 300], [10, 5, 20], [5, 20, 10], [2, 3, 4],
+                                            return_stats=True)
+    assert cost == pytest.approx(17)
+    assert stats.bound == pytest.approx(17) and stats.mip_gap == 0.0
@@ -0,0 +1,28 @@
+from optimization_solver import solve_knapsack
+from solution_cache import SolutionCache, canonical_key
+
+
+def test_positional_and_keyword_calls_share_a_key():
+    positional = canonical_key("knapsack", (10, [5, 4], [5, 4]), {}, solve_knapsack)
+    keyword = canonical_key("knapsack", (), {'capacity': 10, 'values': [5, 4], 'weights': [5, 4]}, solve_knapsack)
+    with_default = canonical_key("knapsack", (10, [5, 4], [5, 4]), {'engine': "auto"}, solve_knapsack)
+    assert positional == keyword == with_default
+
+
+def test_equivalent_calls_hit_the_cache():
+    cache = SolutionCache()
+    cached = cache.wrap(solve_knapsack, "knapsack")
+    first = cached(10, [5, 4, 3], [5, 4, 6])
+    assert cached(capacity=10, values=[5, 4, 3], weights=[5, 4, 6])[:2] == first[:2]
+    assert cache.stats()['hits'] == 1
+
+
+def test_inexact_and_instrumented_calls_are_not_cached():
+    cache = SolutionCache()
+    cached = cache.wrap(solve_knapsack, "knapsack")
+    cached(10, [5, 4, 3], [5, 4, 6], mode="heuristic")
+    cached(10, [5, 4, 3], [5, 4, 6], mode="anytime", time_limit=1.0)
+    cached(10, [5, 4, 3], [5, 4, 6], callback=lambda model, where: None)
+    result, stats = cached(10, [5, 4, 3], [5, 4, 6], return_stats=True)
+    assert stats.problem == "knapsack"
+    assert cache.stats()['size'] == 0 and cache.stats()['misses'] == 0
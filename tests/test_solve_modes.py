@@ -0,0 +1,133 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+import highs_solver
+import optimization_solver
+from optimization_solver import solve_diet, solve_knapsack
+from solve_modes import diet_greedy, diet_lower_bound, diet_round, knapsack_greedy, knapsack_relaxed, relative_gap
+
+SEEDS = range(20)
+
+
+def knapsack_instance(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(4, 12))
+    values = rng.integers(1, 40, n).astype(float)
+    weights = rng.integers(1, 25, n).astype(float)
+    if seed % 2:
+        weights /= 2  # Decimal weights
+    return float(weights.sum() * rng.uniform(0.2, 0.7)), values, weights
+
+
+def knapsack_optimum(capacity, values, weights):
+    """Best value over every subset of the items."""
+    choices = np.array(list(itertools.product((0, 1), repeat=len(values))))
+    fits = choices @ weights <= capacity + 1e-9
+    return float((choices[fits] @ values).max())
+
+
+def diet_instance(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 7))
+    nutrients = rng.integers(0, 30, (3, n)).astype(float)
+    nutrients[:, 0] += 1  # Some food covers every nutrient, so the diet is feasible
+    requirements = rng.integers(20, 200, 3).astype(float)
+    return requirements, nutrients, rng.integers(1, 20, n).astype(float)
+
+
+def diet_optimum(requirements, nutrients, food_cost):
+    return highs_solver.solve_diet(*requirements, *nutrients.tolist(), food_cost.tolist())[1]
+
+
+def check_knapsack_answer(capacity, values, weights, selected, value):
+    assert len(set(selected)) == len(selected)
+    assert weights[selected].sum() <= capacity + 1e-9
+    assert value == pytest.approx(values[selected].sum())
+
+
+def check_diet_answer(requirements, nutrients, food_cost, amounts, cost):
+    amounts = np.asarray(amounts, dtype=float)
+    assert np.all(amounts >= 0) and np.array_equal(amounts, np.round(amounts))
+    assert np.all(nutrients @ amounts >= requirements - 1e-9)
+    assert cost == pytest.approx(food_cost @ amounts)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("fast_path", [knapsack_relaxed, knapsack_greedy])
+def test_knapsack_fast_paths_are_feasible_with_a_valid_bound(seed, fast_path):
+    capacity, values, weights = knapsack_instance(seed)
+    optimum = knapsack_optimum(capacity, values, weights)
+    selected, value, bound = fast_path(capacity, values, weights)
+    check_knapsack_answer(capacity, values, weights, selected, value)
+    assert value <= optimum + 1e-9 <= bound + 2e-9
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("window", [1, 2])
+def test_knapsack_swap_search_only_improves(seed, window):
+    capacity, values, weights = knapsack_instance(seed)
+    relaxed_value = knapsack_relaxed(capacity, values, weights)[1]
+    selected, value, _ = knapsack_greedy(capacity, values, weights, window=window)
+    check_knapsack_answer(capacity, values, weights, selected, value)
+    assert relaxed_value - 1e-9 <= value <= knapsack_optimum(capacity, values, weights) + 1e-9
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("mode", ["relaxed", "heuristic", "anytime"])
+def test_knapsack_modes_report_a_proven_gap(seed, mode):
+    if mode == "anytime":
+        pytest.importorskip("gurobipy")
+    capacity, values, weights = knapsack_instance(seed)
+    optimum = knapsack_optimum(capacity, values, weights)
+    (selected, value, _), stats = solve_knapsack(capacity, values.tolist(), weights.tolist(), mode=mode,
+                                                 time_limit=10, return_stats=True)
+    check_knapsack_answer(capacity, values, weights, selected, value)
+    assert value <= optimum + 1e-9 <= stats.bound + 2e-9
+    assert stats.mip_gap == pytest.approx(relative_gap(value, stats.bound), abs=1e-6)
+    assert relative_gap(value, optimum) <= stats.mip_gap + 1e-6
+    if mode == "anytime":
+        assert value == pytest.approx(optimum)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_diet_fast_paths_are_feasible_with_a_valid_bound(seed):
+    requirements, nutrients, food_cost = diet_instance(seed)
+    optimum = diet_optimum(requirements, nutrients, food_cost)
+    assert diet_lower_bound(requirements, nutrients, food_cost) <= optimum + 1e-9
+
+    amounts, cost, bound = diet_greedy(requirements, nutrients, food_cost)
+    check_diet_answer(requirements, nutrients, food_cost, amounts, cost)
+    assert bound <= optimum + 1e-9 <= cost + 2e-9
+
+    lp = linprog(food_cost, A_ub=-nutrients, b_ub=-requirements)
+    amounts = diet_round(lp.x, requirements, nutrients, food_cost)
+    check_diet_answer(requirements, nutrients, food_cost, amounts, food_cost @ amounts)
+    assert lp.fun <= optimum + 1e-9 <= food_cost @ amounts + 2e-9
+
+
+def test_diet_greedy_reports_infeasible_requirements():
+    assert diet_greedy([10, 0, 0], np.zeros((3, 2)), np.ones(2)) is None
+    assert diet_lower_bound(np.array([10.0, 0, 0]), np.zeros((3, 2)), np.ones(2)) == float("inf")
+
+
+@pytest.mark.parametrize("gurobi", [True, False])
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("mode", ["relaxed", "heuristic", "anytime"])
+def test_diet_modes_report_a_proven_gap(monkeypatch, gurobi, seed, mode):
+    if gurobi:
+        pytest.importorskip("gurobipy")
+    else:
+        monkeypatch.setattr(optimization_solver, "Model", None)
+    requirements, nutrients, food_cost = diet_instance(seed)
+    optimum = diet_optimum(requirements, nutrients, food_cost)
+    (amounts, cost), stats = solve_diet(*requirements, *nutrients.tolist(), food_cost.tolist(), mode=mode,
+                                        time_limit=10, return_stats=True)
+    check_diet_answer(requirements, nutrients, food_cost, amounts, cost)
+    assert stats.bound <= optimum + 1e-9 <= cost + 2e-9
+    if stats.mip_gap is not None:
+        assert relative_gap(cost, optimum) <= stats.mip_gap + 1e-6
+    if mode == "anytime":
+        assert cost == pytest.approx(optimum)
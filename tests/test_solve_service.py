@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from solve_service import InProcessClient, SolveService
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = SolveService(processes=1, batch_window=0.05)
+    yield service
+    service.close()
+
+
+def run(service, requests):
+    """Sends (problem, kwargs) requests concurrently; returns the results and the metrics."""
+    client = InProcessClient(service)
+
+    async def main():
+        return await asyncio.gather(*(client.solve(problem, **kwargs) for problem, kwargs in requests))
+
+    before = client.metrics()
+    results = asyncio.run(main())
+    after = client.metrics()
+    counters = {name: after[name] - before[name] for name in ("requests", "cache_hits", "coalesced", "solves",
+                                                              "batches")}
+    return results, counters, after
+
+
+def test_identical_requests_are_coalesced(service):
+    request = ("knapsack", {'capacity': 10, 'values': [5, 4, 3], 'weights': [5, 4, 6], 'engine': "dp"})
+    results, counters, metrics = run(service, [request] * 3)
+    assert [r['result']['total_value'] for r in results] == [9, 9, 9]
+    assert counters == {'requests': 3, 'cache_hits': 0, 'coalesced': 2, 'solves': 1, 'batches': 0}
+    assert metrics['queue_depth'] == 0
+
+
+def test_small_requests_are_micro_batched(service):
+    requests = [("knapsack", {'capacity': c, 'values': [5, 4, 3], 'weights': [5, 4, 6]}) for c in (5, 9, 11)]
+    results, counters, _ = run(service, requests)
+    assert [r['result']['total_value'] for r in results] == [5, 9, 9]
+    assert counters == {'requests': 3, 'cache_hits': 0, 'coalesced': 0, 'solves': 3, 'batches': 1}
+
+
+def test_repeated_requests_are_cached(service):
+    request = ("knapsack", {'capacity': 7, 'values': [5, 4, 3], 'weights': [5, 4, 6]})
+    run(service, [request])
+    # Omitting a default argument is the same request
+    results, counters, metrics = run(service, [request, ("knapsack", dict(request[1], engine="auto"))])
+    assert [r['result']['total_value'] for r in results] == [5, 5]
+    assert counters == {'requests': 2, 'cache_hits': 2, 'coalesced': 0, 'solves': 0, 'batches': 0}
+    assert metrics['latency_p50_ms'] is not None and metrics['latency_p99_ms'] >= metrics['latency_p50_ms']
+
+
+def test_time_limited_requests_bypass_the_cache(service):
+    request = ("knapsack", {'capacity': 10, 'values': [5, 4, 3], 'weights': [5, 4, 6], 'mode': "anytime",
+                            'time_limit': 5.0})
+    run(service, [request])
+    _, counters, _ = run(service, [request])
+    assert counters['cache_hits'] == 0 and counters['solves'] == 1
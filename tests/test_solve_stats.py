@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from multi_period_planning import solve_multi_period_planning
+
+
+def test_lp_stats_record_size_objective_and_bound():
+    plan, stats = solve_multi_period_planning(np.array([[1.0, 2.0]]), [10.0], [3.0, 5.0], periods=2,
+                                              return_stats=True)
+    assert stats.num_vars == 12
+    assert stats.objective == pytest.approx(plan['total_profit'])
+    assert stats.bound == pytest.approx(plan['total_profit'])
+    assert stats.node_count is None and stats.mip_gap is None
@@ -0,0 +1,31 @@
+import io
+import json
+
+import pytest
+
+import solver_backends
+from optimization_cli import run
+
+KNAPSACK = {'capacity': 10, 'values': [5, 4, 3], 'weights': [5, 4, 6]}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_cli_gurobi_backend_solves_knapsacks_with_gurobi(jobs):
+    pytest.importorskip("gurobipy")
+    out = io.StringIO()
+    run([json.dumps(dict(KNAPSACK, problem="knapsack"))] * 2, out, jobs=jobs, backend="gurobi", stats=True)
+    for line in out.getvalue().splitlines():
+        record = json.loads(line)
+        assert record['stats']['backend'] == "gurobi"
+        assert record['result']['total_value'] == 9
+
+
+def test_auto_sends_solver_options_to_optimization_solver():
+    selected, value, _ = solver_backends.solve("knapsack", **KNAPSACK, mode="heuristic")
+    assert value == 9
+
+
+@pytest.mark.parametrize("backend", ["native", "highs"])
+def test_backends_reject_options_they_do_not_take(backend):
+    with pytest.raises(ValueError, match="does not support mode"):
+        solver_backends.solve("knapsack", **KNAPSACK, backend=backend, mode="heuristic")
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+import solver_pool
+from solver_pool import SolverPool
+
+
+def _sleep(seconds, env=None):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with SolverPool(processes=1, backend="native") as pool:
+        yield pool
+
+
+@pytest.fixture
+def sleeping_pool(monkeypatch):
+    # Forked workers inherit the extra problem
+    monkeypatch.setitem(solver_pool.SOLVERS, "sleep", _sleep)
+    with SolverPool(processes=1) as pool:
+        yield pool
+
+
+def test_timeout_is_enforced_on_non_gurobi_engines(pool):
+    future = pool.submit("knapsack", 500.5, list(range(1, 3001)), [1.5 + k % 7 for k in range(3000)], timeout=0.001)
+    with pytest.raises(TimeoutError):
+        future.result()
+
+
+def test_solver_time_limit_reaches_the_task():
+    with SolverPool(processes=1) as pool:
+        selected, value, _ = pool.submit("knapsack", 10, [5, 4, 3], [5, 4, 6], mode="anytime",
+                                         time_limit=5.0, timeout=60).result()
+    assert value == 9
+
+
+def test_map_with_a_task_timeout(pool):
+    results = list(pool.map("knapsack", [(10, [5, 4, 3], [5, 4, 6])] * 2, task_timeout=60))
+    assert [value for _, value, _ in results] == [9, 9]
+
+
+def test_queued_tasks_get_their_full_timeout(sleeping_pool):
+    first = sleeping_pool.submit("sleep", 0.4, timeout=0.1)
+    queued = [sleeping_pool.submit("sleep", 0.05, timeout=0.2) for _ in range(4)]
+    with pytest.raises(TimeoutError):
+        first.result()
+    assert [future.result() for future in queued] == [0.05] * 4
+
+
+def test_tasks_timing_out_after_waiting_in_the_queue_raise_timeout_error(sleeping_pool):
+    futures = [sleeping_pool.submit("sleep", 0.2, timeout=0.05) for _ in range(4)]
+    for future in futures:
+        with pytest.raises(TimeoutError):
+            future.result()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import optimization_solver
+
+PRODUCTS = [
+    {'name': "A", 'profit': 3, 'labor': 1, 'materials': 2, 'min_production': 0},
+    {'name': "B", 'profit': 5, 'labor': 2, 'materials': 1, 'min_production': 1},
+]
+
+
+@pytest.fixture
+def no_gurobi(monkeypatch):
+    monkeypatch.setattr(optimization_solver, "Model", None)
+
+
+def test_diet_falls_back_to_another_backend(no_gurobi):
+    (amounts, cost), stats = optimization_solver.solve_diet(
+        2000, 50, 70, [200, 400, 300], [10, 5, 20], [5, 20, 10], [2, 3, 4], return_stats=True)
+    assert cost == pytest.approx(17)
+    assert stats.backend in ("highs", "native")
+
+
+def test_production_planning_falls_back_to_another_backend(no_gurobi):
+    result = optimization_solver.solve_production_planning(10, 10, PRODUCTS, callback=lambda model, where: None)
+    assert result['total_profit'] == pytest.approx(26)
+    assert result['production_levels'] == {'prod_A': 2.0, 'prod_B': 4.0}
+
+
+def test_diet_too_large_for_the_license_falls_back():
+    pytest.importorskip("gurobipy")
+    import highs_solver
+
+    rng = np.random.default_rng(0)
+    foods = 2500  # Above the 2000 variables of the size-limited license
+    args = (2000, 50, 70, *(rng.integers(1, 300, (3, foods)).tolist()), rng.integers(1, 10, foods).tolist())
+    (amounts, cost), stats = optimization_solver.solve_diet(*args, return_stats=True)
+    assert cost == pytest.approx(highs_solver.solve_diet(*args)[1])
+    assert stats.backend in ("gurobi", "highs")